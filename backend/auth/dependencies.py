@@ -1,13 +1,13 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
 from ..crud import users as user_crud
 from .. import models
 from ..schemas import users as user_schemas
 from ..database import get_db
-from .security import SECRET_KEY, ALGORITHM
+from .security import decode_access_token
+from .principal_cache import principal_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token")
 
@@ -19,18 +19,19 @@ def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        token_data = user_schemas.TokenData(email=email)
-    except JWTError:
+    payload = decode_access_token(token)
+    if payload is None or payload.get("sub") is None:
         raise credentials_exception
+    token_data = user_schemas.TokenData(email=payload["sub"])
     
+    user = principal_cache.get(db, token_data.email)
+    if user is not None:
+        return user
+
     user = user_crud.get_user_by_email(db, email=token_data.email)
     if user is None:
         raise credentials_exception
+    principal_cache.put(user)
     return user
 
 def get_current_admin_user(
@@ -0,0 +1,81 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from .. import models
+from ..cache_sync import cache_sync
+
+# --- Configuration ---
+PRINCIPAL_CACHE_TTL_SECONDS = 60
+PRINCIPAL_CACHE_MAX_SIZE = 10000
+
+
+class PrincipalCache:
+    """TTL + LRU cache of authenticated customers, keyed by token subject (email).
+
+    Only column values are stored. On a hit they are turned back into a
+    ``Customer`` attached to the request's session without running any SQL.
+    """
+
+    def __init__(self, ttl_seconds: float = PRINCIPAL_CACHE_TTL_SECONDS, max_size: int = PRINCIPAL_CACHE_MAX_SIZE, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._clock = clock
+        self._lock = Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db: Session, email: str) -> Optional[models.Customer]:
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._entries[email]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(email)
+            self.hits += 1
+            values = entry[1]
+
+        # The session may already hold this customer, reuse it if so
+        existing = db.identity_map.get(db.identity_key(models.Customer, (values["id"],)))
+        if existing is not None:
+            return existing
+        user = models.Customer(**values)
+        make_transient_to_detached(user)
+        db.add(user)
+        return user
+
+    def put(self, user: models.Customer):
+        values = {key: getattr(user, key) for key in models.Customer.__table__.columns.keys()}
+        with self._lock:
+            self._entries[user.email] = (self._clock() + self.ttl_seconds, values)
+            self._entries.move_to_end(user.email)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, email: str):
+        self._invalidate(email)
+        cache_sync.publish("principal_cache", email)
+
+    def _invalidate(self, email: str):
+        with self._lock:
+            self._entries.pop(email, None)
+
+    def apply_remote(self, email: str):
+        self._invalidate(email)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+principal_cache = PrincipalCache()
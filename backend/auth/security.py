@@ -1,24 +1,93 @@
-from passlib.context import CryptContext
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-from jose import JWTError, jwt
 
 # --- Configuration ---
 SECRET_KEY = "a_very_secret_key_that_should_be_in_env_vars"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# bcrypt runs in a process pool so logins use every core without tying up
+# the request threadpool; beyond the admission limit callers get a 503.
+# Every app worker process has its own pool, so by default the cores are
+# split between the WEB_CONCURRENCY workers (which uvicorn and gunicorn
+# also read); when the worker count is given with --workers / -w instead,
+# set HASH_WORKERS.
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", 1)))
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)))
+MAX_PENDING_HASHES = int(os.getenv("MAX_PENDING_HASHES", HASH_WORKERS * 4))
+HASH_RETRY_AFTER_SECONDS = 1
+
 # --- Password Hashing ---
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib and jose are imported on first use rather than at import time, so
+# loading the app (and every hashing worker process) doesn't pay for them
+_pwd_context = None
+
+def get_pwd_context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+class HashingOverloadedError(RuntimeError):
+    pass
+
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_pending_hashes = 0
+_pending_lock = Lock()
+
+def get_hash_executor(max_workers: int = HASH_WORKERS) -> ProcessPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        # The pool starts on the first login, when the cache sync thread, the
+        # request threadpool and the connection pools are already running.
+        # A forked child could inherit one of their locks held, so the
+        # hashing processes are started from a clean forkserver (or spawned).
+        # Like spawned ones, they import the running script, so a script that
+        # logs users in must keep its work under `if __name__ == "__main__":`.
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _hash_executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(start_method))
+    return _hash_executor
+
+def shutdown_hash_executor():
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+async def _run_hashing(func, *args):
+    global _pending_hashes
+    with _pending_lock:
+        if _pending_hashes >= MAX_PENDING_HASHES:
+            raise HashingOverloadedError("Too many password hashing requests in progress")
+        _pending_hashes += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_hash_executor(), func, *args)
+    finally:
+        with _pending_lock:
+            _pending_hashes -= 1
+
+async def verify_password_async(plain_password, hashed_password):
+    return await _run_hashing(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    return await _run_hashing(get_password_hash, password)
 
 # --- JWT Handling ---
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    from jose import jwt
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -27,3 +96,11 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+def decode_access_token(token: str) -> Optional[dict]:
+    """The token's claims, or None if it is malformed, tampered with or expired."""
+    from jose import JWTError, jwt
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
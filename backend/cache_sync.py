@@ -0,0 +1,199 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+# Relay cache invalidations between the app processes sharing a database
+# (gunicorn/uvicorn workers). Turn off when only one process serves it.
+CACHE_SYNC = os.getenv("CACHE_SYNC", "1") == "1"
+# How often each process looks for other processes' invalidations; this is
+# how long another worker can keep serving what it had cached
+CACHE_SYNC_INTERVAL_MS = int(os.getenv("CACHE_SYNC_INTERVAL_MS", 10))
+# Events older than this are pruned; a process stalled for longer drops all its caches
+CACHE_SYNC_RETENTION_SECONDS = int(os.getenv("CACHE_SYNC_RETENTION_SECONDS", 300))
+CACHE_SYNC_BATCH_SIZE = 1000
+PRUNE_EVERY_SECONDS = 30
+
+
+class CacheSync:
+    """Cross-process invalidation bus for the in-process caches.
+
+    Caches ``publish`` a JSON payload whenever they change their own state
+    because of a write, and ``subscribe`` a callback that applies the same
+    change when another process publishes it. Events go through the
+    ``cache_events`` table of the shared database, so no broker is needed:
+    a background thread writes this process's events in batches and reads
+    everyone else's, only querying the table when ``PRAGMA data_version``
+    says another connection has committed. Callbacks run on that thread.
+
+    ``on_reset`` callbacks drop a whole cache; they run when this process
+    fell so far behind that some events were pruned before it read them.
+    """
+
+    def __init__(self, interval_ms: int = CACHE_SYNC_INTERVAL_MS, retention_seconds: int = CACHE_SYNC_RETENTION_SECONDS):
+        self.interval = interval_ms / 1000
+        self.retention = timedelta(seconds=retention_seconds)
+        self.origin = uuid.uuid4().hex
+        self._subscribers: Dict[str, List[Callable]] = defaultdict(list)
+        self._reset_callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._pending: List[dict] = []
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._engine = None
+        self._last_id = 0
+        self.published = 0
+        self.received = 0
+        self.resets = 0
+        self.errors = 0
+
+    # --- Subscribers ---
+    def subscribe(self, topic: str, callback: Callable):
+        self._subscribers[topic].append(callback)
+
+    def on_reset(self, callback: Callable[[], None]):
+        self._reset_callbacks.append(callback)
+
+    def publish(self, topic: str, payload):
+        # Nothing to tell anyone when no other process is listening through us
+        if self._thread is None:
+            return
+        event = {"origin": self.origin, "topic": topic, "payload": json.dumps(payload, separators=(",", ":")),
+                 "created_at": datetime.utcnow()}
+        with self._lock:
+            self._pending.append(event)
+        self._wakeup.set()
+
+    # --- Lifecycle ---
+    def start(self, url: Optional[str] = None):
+        if self._thread is not None:
+            return
+        from sqlalchemy import func, select
+        from .database import DATABASE_URL, create_db_engine
+        from .models import CacheEvent
+
+        self._engine = create_db_engine(url or DATABASE_URL, pool_size=1)
+        # Start after everything already published: this process's caches are empty
+        with self._engine.connect() as conn:
+            self._last_id = conn.execute(select(func.coalesce(func.max(CacheEvent.id), 0))).scalar_one()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        self._thread.join()
+        self._thread = None
+        self._engine.dispose()
+        self._engine = None
+
+    # --- Sync thread ---
+    def _run(self):
+        sqlite = self._engine.dialect.name == "sqlite"
+        data_version = None
+        last_prune = 0.0
+        with self._engine.connect() as conn:
+            while True:
+                stopping = self._stopping.is_set()
+                try:
+                    self._flush(conn)
+                    if stopping:
+                        break
+                    # data_version only moves when another connection commits,
+                    # so an idle database costs one pragma per interval
+                    version = conn.exec_driver_sql("PRAGMA data_version").scalar() if sqlite else None
+                    if version is None or version != data_version:
+                        data_version = version
+                        self._receive(conn)
+                    if time.monotonic() - last_prune > PRUNE_EVERY_SECONDS:
+                        self._prune(conn)
+                        last_prune = time.monotonic()
+                except Exception:
+                    self.errors += 1
+                    logger.exception("cache sync failed")
+                    conn.rollback()
+                    if stopping:
+                        break
+                self._wakeup.wait(self.interval)
+                self._wakeup.clear()
+
+    def _flush(self, conn):
+        from sqlalchemy import insert
+        from .models import CacheEvent
+
+        with self._lock:
+            events, self._pending = self._pending, []
+        if not events:
+            return
+        try:
+            conn.execute(insert(CacheEvent), events)
+            conn.commit()
+        except Exception:
+            with self._lock:
+                self._pending[:0] = events
+            raise
+        self.published += len(events)
+
+    def _receive(self, conn):
+        from sqlalchemy import select
+        from .models import CacheEvent
+
+        while True:
+            rows = conn.execute(
+                select(CacheEvent.id, CacheEvent.origin, CacheEvent.topic, CacheEvent.payload)
+                .where(CacheEvent.id > self._last_id).order_by(CacheEvent.id).limit(CACHE_SYNC_BATCH_SIZE)
+            ).all()
+            conn.rollback()
+            if not rows:
+                return
+            # Ids are handed out in commit order, a hole means pruned events
+            if rows[0].id != self._last_id + 1:
+                self._reset()
+            for row in rows:
+                if row.origin != self.origin:
+                    self._apply(row.topic, json.loads(row.payload))
+            self._last_id = rows[-1].id
+            if len(rows) < CACHE_SYNC_BATCH_SIZE:
+                return
+
+    def _apply(self, topic: str, payload):
+        self.received += 1
+        for callback in self._subscribers.get(topic, ()):
+            try:
+                callback(payload)
+            except Exception:
+                self.errors += 1
+                logger.exception("cache sync subscriber for %r failed", topic)
+
+    def _reset(self):
+        self.resets += 1
+        for callback in self._reset_callbacks:
+            callback()
+
+    def _prune(self, conn):
+        from sqlalchemy import delete
+        from .models import CacheEvent
+
+        conn.execute(delete(CacheEvent).where(CacheEvent.created_at < datetime.utcnow() - self.retention))
+        conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = len(self._pending)
+        return {"published": self.published, "received": self.received, "pending": pending,
+                "resets": self.resets, "errors": self.errors}
+
+
+cache_sync = CacheSync()
@@ -0,0 +1,20 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ... import models
+from ..plays import PLAY_CURSOR_COLUMNS
+from typing import Optional, Tuple
+from ...pagination import keyset_after
+
+# Read All
+async def get_all_plays(db: AsyncSession, skip: int = 0, limit: int = 100, after: Optional[Tuple] = None):
+    query = select(models.Play).order_by(*PLAY_CURSOR_COLUMNS)
+    if after is not None:
+        query = query.filter(keyset_after(PLAY_CURSOR_COLUMNS, after))
+    else:
+        query = query.offset(skip)
+    result = await db.scalars(query.limit(limit))
+    return result.all()
+
+# Read by ID
+async def get_play(db: AsyncSession, play_id: int):
+    return await db.get(models.Play, play_id)
@@ -0,0 +1,34 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from ... import models
+from ..showtimes import SHOWTIME_CURSOR_COLUMNS, total_seats_query, booked_counts_query, set_available_seats
+from typing import Optional, Tuple
+from ...pagination import keyset_after
+
+# ShowTimeResponse nests the play, and an AsyncSession cannot lazy-load it
+# during serialisation, so every query loads it up front
+def _showtimes_query():
+    return select(models.ShowTime).options(selectinload(models.ShowTime.play))
+
+async def with_available_seats(db: AsyncSession, showtimes):
+    if not showtimes:
+        return showtimes
+    total_seats = (await db.execute(total_seats_query())).scalar()
+    booked_rows = (await db.execute(booked_counts_query(showtimes))).all()
+    return set_available_seats(showtimes, total_seats, booked_rows)
+
+async def get_all_showtimes(db: AsyncSession, skip: int = 0, limit: int = 100, after: Optional[Tuple] = None, filters=()):
+    query = _showtimes_query().filter(*filters).order_by(*SHOWTIME_CURSOR_COLUMNS)
+    if after is not None:
+        query = query.filter(keyset_after(SHOWTIME_CURSOR_COLUMNS, after))
+    else:
+        query = query.offset(skip)
+    result = await db.scalars(query.limit(limit))
+    return await with_available_seats(db, result.all())
+
+async def get_showtimes_for_play(db: AsyncSession, play_id: int, skip: int = 0, limit: int = 100, filters=()):
+    result = await db.scalars(
+        _showtimes_query().filter(models.ShowTime.play_id == play_id, *filters).order_by(models.ShowTime.date_and_time).offset(skip).limit(limit)
+    )
+    return await with_available_seats(db, result.all())
@@ -0,0 +1,15 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ... import models
+from ..tickets import TICKET_CURSOR_COLUMNS
+from typing import Optional, Tuple
+from ...pagination import keyset_after
+
+async def get_tickets_by_customer(db: AsyncSession, customer_id: int, skip: int = 0, limit: int = 100, after: Optional[Tuple] = None):
+    query = select(models.Ticket).filter(models.Ticket.customer_id == customer_id).order_by(*TICKET_CURSOR_COLUMNS)
+    if after is not None:
+        query = query.filter(keyset_after(TICKET_CURSOR_COLUMNS, after))
+    else:
+        query = query.offset(skip)
+    result = await db.scalars(query.limit(limit))
+    return result.all()
@@ -0,0 +1,155 @@
+from sqlalchemy import and_, delete, func, insert, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from datetime import datetime
+from decimal import Decimal
+from .. import models
+
+# showtime_sales holds tickets sold and revenue per showtime. Ticket writes
+# apply a delta in the same transaction as the tickets themselves, so reports
+# read one row per showtime instead of aggregating every ticket. A seat's
+# revenue is its current showtime price, falling back to the play's base
+# price, so price changes refresh the summary rows of the showtimes they touch.
+
+# --- Incremental maintenance ---
+def seat_prices_query(play_id: int, date_and_time: datetime, seats):
+    price = models.ShowTimePrice
+    return select(
+        func.count(price.price),
+        func.coalesce(func.sum(price.price), 0),
+        select(models.Play.price).filter(models.Play.id == play_id).scalar_subquery(),
+    ).filter(
+        price.showtime_play_id == play_id,
+        price.showtime_date_and_time == date_and_time,
+        tuple_(price.row_no, price.seat_no).in_(seats)
+    )
+
+def sales_delta_statement(play_id: int, date_and_time: datetime, seats, seat_prices, sign: int = 1):
+    priced_count, priced_total, base_price = seat_prices
+    revenue = Decimal(priced_total or 0) + (len(seats) - priced_count) * Decimal(base_price or 0)
+    table = models.ShowTimeSales.__table__
+    statement = sqlite_insert(table).values(
+        showtime_play_id=play_id,
+        showtime_date_and_time=date_and_time,
+        tickets_sold=sign * len(seats),
+        revenue=sign * revenue,
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.showtime_play_id, table.c.showtime_date_and_time],
+        set_={
+            "tickets_sold": table.c.tickets_sold + statement.excluded.tickets_sold,
+            "revenue": table.c.revenue + statement.excluded.revenue,
+        },
+    )
+
+def record_sales(db: Session, play_id: int, date_and_time: datetime, seats, sign: int = 1):
+    """Add (sign=1) or remove (sign=-1) the given seats' sales; the caller commits."""
+    seat_prices = db.execute(seat_prices_query(play_id, date_and_time, seats)).one()
+    db.execute(sales_delta_statement(play_id, date_and_time, seats, seat_prices, sign))
+
+# --- Recomputing from tickets ---
+def sales_totals_query(*filters):
+    ticket, price = models.Ticket, models.ShowTimePrice
+    return select(
+        ticket.showtime_play_id,
+        ticket.showtime_date_and_time,
+        func.count(),
+        func.coalesce(func.sum(func.coalesce(price.price, models.Play.price)), 0),
+    ).join(models.Play, models.Play.id == ticket.showtime_play_id
+    ).outerjoin(price, and_(
+        price.showtime_play_id == ticket.showtime_play_id,
+        price.showtime_date_and_time == ticket.showtime_date_and_time,
+        price.row_no == ticket.row_no,
+        price.seat_no == ticket.seat_no,
+    )).filter(*filters).group_by(ticket.showtime_play_id, ticket.showtime_date_and_time)
+
+def refresh_sales_statements(*filters_by_column):
+    """Statements replacing the summary rows matching ``(column name, value)`` pairs."""
+    sales, ticket = models.ShowTimeSales, models.Ticket
+    sales_filters = [getattr(sales, column) == value for column, value in filters_by_column]
+    ticket_filters = [getattr(ticket, column) == value for column, value in filters_by_column]
+    columns = ["showtime_play_id", "showtime_date_and_time", "tickets_sold", "revenue"]
+    return (
+        delete(sales).filter(*sales_filters),
+        insert(sales.__table__).from_select(columns, sales_totals_query(*ticket_filters)),
+    )
+
+def refresh_showtime_sales(db: Session, play_id: int, date_and_time: datetime):
+    # Used when a showtime is moved or deleted; the caller commits
+    for statement in refresh_sales_statements(("showtime_play_id", play_id), ("showtime_date_and_time", date_and_time)):
+        db.execute(statement)
+
+def refresh_play_sales(db: Session, play_id: int):
+    for statement in refresh_sales_statements(("showtime_play_id", play_id)):
+        db.execute(statement)
+
+def rebuild_sales(db: Session):
+    """Recompute the whole summary from the tickets table."""
+    for statement in refresh_sales_statements():
+        db.execute(statement)
+    db.commit()
+    return db.query(func.count()).select_from(models.ShowTimeSales).scalar()
+
+# --- Reports ---
+def _sales_join(query):
+    sales = models.ShowTimeSales
+    return query.outerjoin(sales, and_(
+        sales.showtime_play_id == models.ShowTime.play_id,
+        sales.showtime_date_and_time == models.ShowTime.date_and_time,
+    ))
+
+def _total_seats(db: Session) -> int:
+    # Every showtime is sold against the whole seat layout
+    return db.query(func.count()).select_from(models.Seat).scalar()
+
+def _occupancy(tickets_sold: int, capacity: int):
+    return round(tickets_sold / capacity, 4) if capacity else 0.0
+
+def showtime_report(db: Session, filters=(), skip: int = 0, limit: int = 100):
+    sales = models.ShowTimeSales
+    total_seats = _total_seats(db)
+    query = _sales_join(select(
+        models.ShowTime.play_id,
+        models.Play.title.label("play_title"),
+        models.ShowTime.date_and_time,
+        func.coalesce(sales.tickets_sold, 0).label("tickets_sold"),
+        func.coalesce(sales.revenue, 0).label("revenue"),
+    ).join(models.Play, models.Play.id == models.ShowTime.play_id)
+    ).filter(*filters).order_by(models.ShowTime.date_and_time, models.ShowTime.play_id).offset(skip).limit(limit)
+    return [
+        {**row, "capacity": total_seats, "occupancy": _occupancy(row["tickets_sold"], total_seats)}
+        for row in db.execute(query).mappings()
+    ]
+
+def play_report(db: Session, filters=(), skip: int = 0, limit: int = 100):
+    sales = models.ShowTimeSales
+    total_seats = _total_seats(db)
+    query = _sales_join(select(
+        models.ShowTime.play_id,
+        models.Play.title.label("play_title"),
+        func.count().label("showtimes"),
+        func.coalesce(func.sum(sales.tickets_sold), 0).label("tickets_sold"),
+        func.coalesce(func.sum(sales.revenue), 0).label("revenue"),
+    ).join(models.Play, models.Play.id == models.ShowTime.play_id)
+    ).filter(*filters).group_by(models.ShowTime.play_id).order_by(models.ShowTime.play_id).offset(skip).limit(limit)
+    report = []
+    for row in db.execute(query).mappings():
+        capacity = row["showtimes"] * total_seats
+        report.append({**row, "capacity": capacity, "occupancy": _occupancy(row["tickets_sold"], capacity)})
+    return report
+
+def day_report(db: Session, filters=(), skip: int = 0, limit: int = 100):
+    sales = models.ShowTimeSales
+    total_seats = _total_seats(db)
+    day = func.date(models.ShowTime.date_and_time)
+    query = _sales_join(select(
+        day.label("day"),
+        func.count().label("showtimes"),
+        func.coalesce(func.sum(sales.tickets_sold), 0).label("tickets_sold"),
+        func.coalesce(func.sum(sales.revenue), 0).label("revenue"),
+    )).filter(*filters).group_by(day).order_by(day).offset(skip).limit(limit)
+    report = []
+    for row in db.execute(query).mappings():
+        capacity = row["showtimes"] * total_seats
+        report.append({**row, "capacity": capacity, "occupancy": _occupancy(row["tickets_sold"], capacity)})
+    return report
@@ -5,6 +5,7 @@ from datetime import datetime
 
 from ..models import Customer
 from ..schemas.customers import CustomerCreate, CustomerResponse
+from ..auth.principal_cache import principal_cache
 
 
 def get_customer(db: Session, customer_id: int) -> Optional[Customer]:
@@ -34,12 +35,15 @@ def update_customer(db: Session, customer_id: int, customer: CustomerCreate) ->
     if db_customer is None:
         return None
     
+    previous_email = db_customer.email
     db_customer.name = customer.name
     db_customer.email = customer.email
     db_customer.hashed_password = customer.hashed_password
     db_customer.telephone_no = customer.telephone_no
     db.commit()
     db.refresh(db_customer)
+    principal_cache.invalidate(previous_email)
+    principal_cache.invalidate(db_customer.email)
     return db_customer
 
 def delete_customer(db: Session, customer_id: int) -> bool:
@@ -49,4 +53,16 @@ def delete_customer(db: Session, customer_id: int) -> bool:
     
     db.delete(db_customer)
     db.commit()
+    principal_cache.invalidate(db_customer.email)
     return True
+
+def update_customer_role(db: Session, customer_id: int, role: str) -> Optional[Customer]:
+    db_customer = get_customer(db, customer_id)
+    if db_customer is None:
+        return None
+
+    db_customer.role = role
+    db.commit()
+    db.refresh(db_customer)
+    principal_cache.invalidate(db_customer.email)
+    return db_customer
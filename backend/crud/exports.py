@@ -0,0 +1,52 @@
+from sqlalchemy import and_, case, func, select
+from typing import Optional
+from .. import models
+
+# Export queries select plain columns rather than ORM entities, so streamed
+# rows never accumulate in a session's identity map
+
+def tickets_export_query(play_id: Optional[int] = None):
+    ticket = models.Ticket
+    query = select(
+        ticket.ticket_no,
+        ticket.showtime_play_id.label("play_id"),
+        models.Play.title.label("play_title"),
+        ticket.showtime_date_and_time.label("date_and_time"),
+        ticket.row_no,
+        ticket.seat_no,
+        ticket.customer_id,
+        models.Customer.email.label("customer_email"),
+    ).join(models.Play, models.Play.id == ticket.showtime_play_id
+    ).join(models.Customer, models.Customer.id == ticket.customer_id)
+    if play_id is not None:
+        query = query.filter(ticket.showtime_play_id == play_id)
+    # Same order as the unique seat index, so SQLite reads it without sorting
+    return query.order_by(ticket.showtime_play_id, ticket.showtime_date_and_time, ticket.row_no, ticket.seat_no)
+
+def customers_export_query():
+    customer = models.Customer
+    return select(
+        customer.id, customer.name, customer.email, customer.telephone_no, customer.role
+    ).order_by(customer.id)
+
+def sales_export_query(filters=()):
+    showtime, ticket, price = models.ShowTime, models.Ticket, models.ShowTimePrice
+    # Seats without a showtime-specific price sell at the play's base price
+    # (showtimes with no tickets still get a row, with nothing to add up)
+    ticket_price = case((ticket.row_no.isnot(None), func.coalesce(price.price, models.Play.price)))
+    return select(
+        showtime.play_id,
+        models.Play.title.label("play_title"),
+        showtime.date_and_time,
+        func.count(ticket.ticket_no).label("tickets_sold"),
+        func.coalesce(func.sum(ticket_price), 0).label("revenue"),
+    ).join(models.Play, models.Play.id == showtime.play_id
+    ).outerjoin(ticket, and_(
+        ticket.showtime_play_id == showtime.play_id,
+        ticket.showtime_date_and_time == showtime.date_and_time,
+    )).outerjoin(price, and_(
+        price.showtime_play_id == ticket.showtime_play_id,
+        price.showtime_date_and_time == ticket.showtime_date_and_time,
+        price.row_no == ticket.row_no,
+        price.seat_no == ticket.seat_no,
+    )).filter(*filters).group_by(showtime.play_id, showtime.date_and_time).order_by(showtime.date_and_time, showtime.play_id)
@@ -0,0 +1,111 @@
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..schemas import imports as import_schemas
+from ..response_cache import table_versions
+
+IMPORT_CHUNK_SIZE = 1000
+
+@dataclass(frozen=True)
+class ImportSpec:
+    table: object
+    row_schema: Type[BaseModel]
+    # column -> model whose id it must reference
+    references: Dict[str, object]
+    # Link rows that already exist are skipped rather than reported
+    ignore_duplicates: bool = False
+    versioned_tables: Tuple[str, ...] = ()
+
+IMPORT_SPECS = {
+    "plays": ImportSpec(models.Play.__table__, import_schemas.PlayImportRow, {}, versioned_tables=("plays",)),
+    "actors": ImportSpec(models.Actor.__table__, import_schemas.ActorImportRow, {}),
+    "directors": ImportSpec(models.Director.__table__, import_schemas.DirectorImportRow, {}),
+    "cast": ImportSpec(models.Actor_Play, import_schemas.CastImportRow, {"actor_id": models.Actor, "play_id": models.Play}, ignore_duplicates=True),
+    "crew": ImportSpec(models.Director_Play, import_schemas.CrewImportRow, {"director_id": models.Director, "play_id": models.Play}, ignore_duplicates=True),
+}
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in exc.errors())
+
+def _existing_ids(db: Session, model, ids) -> set:
+    if not ids:
+        return set()
+    return set(db.execute(select(model.id).filter(model.id.in_(ids))).scalars())
+
+def _validate_chunk(db: Session, spec: ImportSpec, chunk, result: import_schemas.ImportResult):
+    valid = []
+    for line, raw in chunk:
+        try:
+            # Every row carries every column (a missing id is NULL and gets assigned)
+            row = spec.row_schema.model_validate(raw).model_dump()
+        except ValidationError as exc:
+            result.errors.append(import_schemas.ImportRowError(line=line, error=_format_validation_error(exc)))
+            continue
+        valid.append((line, row))
+
+    # Referenced ids are checked with one IN query per column for the whole chunk
+    for column, model in spec.references.items():
+        found = _existing_ids(db, model, {row[column] for _, row in valid})
+        kept = []
+        for line, row in valid:
+            if row[column] in found:
+                kept.append((line, row))
+            else:
+                result.errors.append(import_schemas.ImportRowError(line=line, error=f"{column} {row[column]} does not exist"))
+        valid = kept
+    return valid
+
+def _insert_statement(spec: ImportSpec):
+    if spec.ignore_duplicates:
+        return sqlite_insert(spec.table).on_conflict_do_nothing()
+    return insert(spec.table)
+
+def _insert_chunk(db: Session, spec: ImportSpec, rows, result: import_schemas.ImportResult):
+    statement = _insert_statement(spec)
+    failed = 0
+    try:
+        inserted = db.execute(statement, [row for _, row in rows]).rowcount
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        # Fall back to one savepoint per row to find the offending ones
+        inserted = 0
+        for line, row in rows:
+            try:
+                with db.begin_nested():
+                    inserted += db.execute(statement, row).rowcount
+            except IntegrityError as exc:
+                result.errors.append(import_schemas.ImportRowError(line=line, error=str(exc.orig)))
+                failed += 1
+        db.commit()
+    result.inserted += inserted
+    result.skipped += len(rows) - inserted - failed
+
+def import_rows(db: Session, entity: str, rows: Iterable[Tuple[int, dict]], chunk_size: Optional[int] = None):
+    """Validate and insert ``(line number, raw row)`` pairs, one transaction per chunk.
+
+    Rows that fail validation are reported in the result and the rest of
+    their chunk is still imported.
+    """
+    spec = IMPORT_SPECS[entity]
+    result = import_schemas.ImportResult(entity=entity)
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size or IMPORT_CHUNK_SIZE))
+        if not chunk:
+            break
+        valid = _validate_chunk(db, spec, chunk, result)
+        if valid:
+            _insert_chunk(db, spec, valid, result)
+    result.errors.sort(key=lambda error: error.line)
+    if spec.versioned_tables and result.inserted:
+        table_versions.bump(*spec.versioned_tables)
+    return result
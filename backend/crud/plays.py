@@ -1,18 +1,35 @@
 from sqlalchemy.orm import Session
+from typing import Optional, Tuple
 from .. import models
 from ..schemas import plays as play_schemas
+from ..seat_availability import seat_index
+from ..seat_events import seat_events
+from ..pagination import keyset_after
+from ..response_cache import table_versions
+from . import analytics
 
 # Create
 def create_play(db: Session, play: play_schemas.PlayCreate):
     db_play = models.Play(**play.model_dump())
     db.add(db_play)
     db.commit()
+    table_versions.bump("plays")
     db.refresh(db_play)
     return db_play
 
+# Keyset pagination: plays are ordered by id, the cursor is the last id seen
+PLAY_CURSOR_COLUMNS = (models.Play.id,)
+PLAY_CURSOR_TYPES = (int,)
+
+def play_cursor_key(play):
+    return (play.id,)
+
 # Read All
-def get_all_plays(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Play).offset(skip).limit(limit).all()
+def get_all_plays(db: Session, skip: int = 0, limit: int = 100, after: Optional[Tuple] = None):
+    query = db.query(models.Play).order_by(*PLAY_CURSOR_COLUMNS)
+    if after is not None:
+        return query.filter(keyset_after(PLAY_CURSOR_COLUMNS, after)).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
 
 # Read by ID
 def get_play(db: Session, play_id: int):
@@ -27,8 +44,13 @@ def update_play(db: Session, play_id: int, play_data: play_schemas.PlayUpdate):
     update_data = play_data.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_play, key, value)
-        
+
+    # Seats without a showtime price sell at the play's price
+    if "price" in update_data:
+        db.flush()
+        analytics.refresh_play_sales(db, play_id)
     db.commit()
+    table_versions.bump("plays")
     db.refresh(db_play)
     return db_play
 
@@ -37,5 +59,10 @@ def delete_play(db: Session, play_id: int):
     db_play = get_play(db, play_id)
     if db_play:
         db.delete(db_play)
+        db.flush()
+        analytics.refresh_play_sales(db, play_id)
         db.commit()
+        table_versions.bump("plays", "showtimes", "tickets", "showtime_prices")
+        seat_index.invalidate_play(play_id)
+        seat_events.resync(play_id)
     return db_play
@@ -0,0 +1,35 @@
+import re
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import Optional
+from ..search_index import SEARCH_TABLE
+
+# Higher scores are better matches; name matches weigh more than genre/synopsis matches
+# (bm25 weights follow column order: kind, ref_id, name, details)
+_RANK = f"-bm25({SEARCH_TABLE}, 0.0, 0.0, 10.0, 1.0)"
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+def build_match_query(q: str, prefix: bool = True) -> Optional[str]:
+    # Quote every term so user input never reaches the FTS5 query syntax;
+    # the last term is a prefix so partially typed words still match
+    terms = _TOKEN.findall(q)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    if prefix:
+        quoted[-1] += "*"
+    return " ".join(quoted)
+
+def search(db: Session, q: str, kind: Optional[str] = None, skip: int = 0, limit: int = 20, prefix: bool = True):
+    match = build_match_query(q, prefix)
+    if match is None:
+        return []
+    kind_filter = "AND kind = :kind" if kind else ""
+    statement = text(
+        f"SELECT kind, ref_id AS id, name, "
+        f"nullif(snippet({SEARCH_TABLE}, 3, '[', ']', '…', 12), '') AS snippet, {_RANK} AS score "
+        f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match {kind_filter} "
+        f"ORDER BY score DESC LIMIT :limit OFFSET :skip"
+    )
+    params = {"match": match, "kind": kind, "limit": limit, "skip": skip}
+    return [dict(row) for row in db.execute(statement, params).mappings()]
@@ -1,6 +1,12 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Optional, Tuple
 from .. import models
 from ..schemas import seats as seat_schemas
+from ..seat_availability import seat_index
+from ..seat_events import seat_events
+from ..pagination import keyset_after
+from ..response_cache import table_versions
 
 def get_seat(db: Session, row_no: int, seat_no: int):
     return db.query(models.Seat).filter(
@@ -8,14 +14,26 @@ def get_seat(db: Session, row_no: int, seat_no: int):
         models.Seat.seat_no == seat_no
     ).first()
 
-def get_seats(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Seat).offset(skip).limit(limit).all()
+SEAT_CURSOR_COLUMNS = (models.Seat.row_no, models.Seat.seat_no)
+SEAT_CURSOR_TYPES = (int, int)
+
+def seat_cursor_key(seat):
+    return (seat.row_no, seat.seat_no)
+
+def get_seats(db: Session, skip: int = 0, limit: int = 100, after: Optional[Tuple] = None):
+    query = db.query(models.Seat).order_by(*SEAT_CURSOR_COLUMNS)
+    if after is not None:
+        return query.filter(keyset_after(SEAT_CURSOR_COLUMNS, after)).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
 
 def create_seat(db: Session, seat: seat_schemas.SeatCreate):
     db_seat = models.Seat(**seat.model_dump())
     db.add(db_seat)
     db.commit()
+    table_versions.bump("seats")
     db.refresh(db_seat)
+    seat_index.invalidate_layout()
+    seat_events.resync()
     return db_seat
 
 def update_seat(db: Session, row_no: int, seat_no: int, seat_update: seat_schemas.SeatCreate):
@@ -28,7 +46,10 @@ def update_seat(db: Session, row_no: int, seat_no: int, seat_update: seat_schema
         setattr(db_seat, field, value)
     
     db.commit()
+    table_versions.bump("seats")
     db.refresh(db_seat)
+    seat_index.invalidate_layout()
+    seat_events.resync()
     return db_seat
 
 def delete_seat(db: Session, row_no: int, seat_no: int):
@@ -36,10 +57,40 @@ def delete_seat(db: Session, row_no: int, seat_no: int):
     if db_seat:
         db.delete(db_seat)
         db.commit()
+        table_versions.bump("seats")
+        seat_index.invalidate_layout()
+        seat_events.resync()
     return db_seat
 
 def delete_all_seats(db: Session):
     deleted_count = db.query(models.Seat).count()
     db.query(models.Seat).delete()
     db.commit()
+    table_versions.bump("seats")
+    seat_index.invalidate_layout()
+    seat_events.resync()
     return deleted_count
+
+def expand_seat_layout(layout: seat_schemas.SeatBulkCreate):
+    seats = {(seat.row_no, seat.seat_no) for seat in layout.seats}
+    for row_range in layout.row_ranges:
+        for row_no in range(row_range.start_row, row_range.end_row + 1):
+            for offset in range(row_range.seats_per_row):
+                seats.add((row_no, row_range.first_seat_no + offset))
+    return seats
+
+def create_seats_bulk(db: Session, layout: seat_schemas.SeatBulkCreate):
+    requested = expand_seat_layout(layout)
+    existing = set(db.query(models.Seat.row_no, models.Seat.seat_no).all())
+    new_seats = [
+        {"row_no": row_no, "seat_no": seat_no}
+        for row_no, seat_no in sorted(requested - existing)
+    ]
+    if new_seats:
+        # Single executemany in one transaction; OR IGNORE covers concurrent inserts
+        db.execute(sqlite_insert(models.Seat).on_conflict_do_nothing(), new_seats)
+        db.commit()
+        table_versions.bump("seats")
+        seat_index.invalidate_layout()
+        seat_events.resync()
+    return {"created": len(new_seats), "skipped": len(requested) - len(new_seats)}
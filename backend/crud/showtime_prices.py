@@ -1,7 +1,10 @@
+from sqlalchemy import and_, case, insert, literal, or_
 from sqlalchemy.orm import Session
 from .. import models
 from ..schemas import showtime_prices as stp_schemas
 from datetime import datetime
+from ..response_cache import table_versions
+from . import analytics
 
 def get_showtime_price(db: Session, row_no: int, seat_no: int, showtime_date_and_time: datetime, showtime_play_id: int):
     return db.query(models.ShowTimePrice).filter(
@@ -20,7 +23,10 @@ def get_prices_for_showtime(db: Session, showtime_date_and_time: datetime, showt
 def create_showtime_price(db: Session, price: stp_schemas.ShowTimePriceCreate):
     db_price = models.ShowTimePrice(**price.model_dump())
     db.add(db_price)
+    db.flush()
+    analytics.refresh_showtime_sales(db, price.showtime_play_id, price.showtime_date_and_time)
     db.commit()
+    table_versions.bump("showtime_prices")
     db.refresh(db_price)
     return db_price
 
@@ -28,7 +34,10 @@ def update_showtime_price(db: Session, row_no: int, seat_no: int, showtime_date_
     db_price = get_showtime_price(db, row_no, seat_no, showtime_date_and_time, showtime_play_id)
     if db_price:
         db_price.price = price_update.price
+        db.flush()
+        analytics.refresh_showtime_sales(db, showtime_play_id, showtime_date_and_time)
         db.commit()
+        table_versions.bump("showtime_prices")
         db.refresh(db_price)
     return db_price
 
@@ -36,5 +45,74 @@ def delete_showtime_price(db: Session, row_no: int, seat_no: int, showtime_date_
     db_price = get_showtime_price(db, row_no, seat_no, showtime_date_and_time, showtime_play_id)
     if db_price:
         db.delete(db_price)
+        db.flush()
+        analytics.refresh_showtime_sales(db, showtime_play_id, showtime_date_and_time)
         db.commit()
+        table_versions.bump("showtime_prices")
     return db_price
+
+def _insert_prices(select_stmt, overwrite: bool):
+    columns = ["row_no", "seat_no", "showtime_date_and_time", "showtime_play_id", "price"]
+    stmt = insert(models.ShowTimePrice).from_select(columns, select_stmt)
+    return stmt.prefix_with("OR REPLACE" if overwrite else "OR IGNORE")
+
+def _tier_condition(tier: stp_schemas.PriceTier):
+    conditions = [models.Seat.row_no.between(tier.start_row, tier.end_row)]
+    if tier.first_seat_no is not None:
+        conditions.append(models.Seat.seat_no >= tier.first_seat_no)
+    if tier.last_seat_no is not None:
+        conditions.append(models.Seat.seat_no <= tier.last_seat_no)
+    return and_(*conditions)
+
+def create_tiered_prices(db: Session, tiers: stp_schemas.ShowTimePriceTiersCreate):
+    price_type = models.ShowTimePrice.price.type
+    conditions = [_tier_condition(tier) for tier in tiers.tiers]
+    default = literal(tiers.default_price, price_type) if tiers.default_price is not None else None
+    if not conditions and default is None:
+        return 0
+
+    if conditions:
+        price = case(
+            *[(condition, literal(tier.price, price_type)) for condition, tier in zip(conditions, tiers.tiers)],
+            else_=default
+        )
+    else:
+        price = default
+
+    select_stmt = db.query(
+        models.Seat.row_no,
+        models.Seat.seat_no,
+        literal(tiers.showtime_date_and_time, models.ShowTimePrice.showtime_date_and_time.type),
+        literal(tiers.showtime_play_id),
+        price
+    )
+    if default is None:
+        select_stmt = select_stmt.filter(or_(*conditions))
+
+    # INSERT ... SELECT over the seats table: the whole price map in one statement
+    result = db.execute(_insert_prices(select_stmt.statement, tiers.overwrite))
+    analytics.refresh_showtime_sales(db, tiers.showtime_play_id, tiers.showtime_date_and_time)
+    db.commit()
+    table_versions.bump("showtime_prices")
+    return result.rowcount
+
+def copy_prices(db: Session, copy: stp_schemas.ShowTimePriceCopy):
+    source = models.ShowTimePrice
+    priced = 0
+    for target in copy.targets:
+        select_stmt = db.query(
+            source.row_no,
+            source.seat_no,
+            literal(target.showtime_date_and_time, source.showtime_date_and_time.type),
+            literal(target.showtime_play_id),
+            source.price
+        ).filter(
+            source.showtime_date_and_time == copy.source.showtime_date_and_time,
+            source.showtime_play_id == copy.source.showtime_play_id
+        )
+        priced += db.execute(_insert_prices(select_stmt.statement, copy.overwrite)).rowcount
+        analytics.refresh_showtime_sales(db, target.showtime_play_id, target.showtime_date_and_time)
+    # All targets are written in a single transaction
+    db.commit()
+    table_versions.bump("showtime_prices")
+    return priced
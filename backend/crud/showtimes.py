@@ -1,7 +1,14 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session, selectinload
+from typing import Optional, Tuple
 from .. import models
 from ..schemas import showtimes as showtime_schemas
+from ..seat_availability import seat_index
+from ..seat_events import seat_events
+from ..pagination import keyset_after
 from datetime import datetime
+from ..response_cache import table_versions
+from . import analytics
 
 def get_showtime(db: Session, play_id: int, date_and_time: datetime):
     return db.query(models.ShowTime).filter(
@@ -9,16 +16,71 @@ def get_showtime(db: Session, play_id: int, date_and_time: datetime):
         models.ShowTime.date_and_time == date_and_time
     ).first()
 
-def get_all_showtimes(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.ShowTime).offset(skip).limit(limit).all()
+# Keyset pagination follows the primary key, i.e. chronological order
+SHOWTIME_CURSOR_COLUMNS = (models.ShowTime.date_and_time, models.ShowTime.play_id)
+SHOWTIME_CURSOR_TYPES = (datetime, int)
 
-def get_showtimes_for_play(db: Session, play_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.ShowTime).filter(models.ShowTime.play_id == play_id).offset(skip).limit(limit).all()
+def showtime_cursor_key(showtime):
+    return (showtime.date_and_time, showtime.play_id)
+
+# --- Listing: plays are batch-loaded and available seats computed per page ---
+def total_seats_query():
+    return select(func.count()).select_from(models.Seat)
+
+def booked_counts_query(showtimes):
+    # Read from the sales summary, which the ticket CRUD functions keep in
+    # step with the tickets, instead of counting a page's worth of tickets.
+    # The pairs are OR'd rather than a row-value IN, which SQLite can only
+    # answer by scanning the whole table.
+    sales = models.ShowTimeSales
+    return select(
+        sales.showtime_play_id, sales.showtime_date_and_time, sales.tickets_sold
+    ).filter(or_(*(
+        and_(sales.showtime_play_id == s.play_id, sales.showtime_date_and_time == s.date_and_time)
+        for s in showtimes
+    )))
+
+def set_available_seats(showtimes, total_seats: int, booked_rows):
+    booked = {(play_id, date_and_time): count for play_id, date_and_time, count in booked_rows}
+    for showtime in showtimes:
+        showtime.available_seats = total_seats - booked.get((showtime.play_id, showtime.date_and_time), 0)
+    return showtimes
+
+def with_available_seats(db: Session, showtimes):
+    if not showtimes:
+        return showtimes
+    total_seats = db.execute(total_seats_query()).scalar()
+    return set_available_seats(showtimes, total_seats, db.execute(booked_counts_query(showtimes)).all())
+
+def showtime_filters(play_id: Optional[int] = None, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None, upcoming: bool = False):
+    filters = []
+    if play_id is not None:
+        filters.append(models.ShowTime.play_id == play_id)
+    if date_from is not None:
+        filters.append(models.ShowTime.date_and_time >= date_from)
+    if date_to is not None:
+        filters.append(models.ShowTime.date_and_time <= date_to)
+    if upcoming:
+        filters.append(models.ShowTime.date_and_time >= datetime.now())
+    return filters
+
+def get_all_showtimes(db: Session, skip: int = 0, limit: int = 100, after: Optional[Tuple] = None, filters=()):
+    query = db.query(models.ShowTime).options(selectinload(models.ShowTime.play)).filter(*filters).order_by(*SHOWTIME_CURSOR_COLUMNS)
+    if after is not None:
+        return with_available_seats(db, query.filter(keyset_after(SHOWTIME_CURSOR_COLUMNS, after)).limit(limit).all())
+    return with_available_seats(db, query.offset(skip).limit(limit).all())
+
+def get_showtimes_for_play(db: Session, play_id: int, skip: int = 0, limit: int = 100, filters=()):
+    showtimes = db.query(models.ShowTime).options(selectinload(models.ShowTime.play)).filter(
+        models.ShowTime.play_id == play_id, *filters
+    ).order_by(models.ShowTime.date_and_time).offset(skip).limit(limit).all()
+    return with_available_seats(db, showtimes)
 
 def create_showtime(db: Session, showtime: showtime_schemas.ShowTimeCreate):
     db_showtime = models.ShowTime(**showtime.model_dump())
     db.add(db_showtime)
     db.commit()
+    table_versions.bump("showtimes")
     db.refresh(db_showtime)
     return db_showtime
 
@@ -26,7 +88,12 @@ def delete_showtime(db: Session, play_id: int, date_and_time: datetime):
     db_showtime = get_showtime(db, play_id=play_id, date_and_time=date_and_time)
     if db_showtime:
         db.delete(db_showtime)
+        db.flush()
+        analytics.refresh_showtime_sales(db, play_id, date_and_time)
         db.commit()
+        table_versions.bump("showtimes", "tickets", "showtime_prices")
+        seat_index.invalidate_showtime(play_id, date_and_time)
+        seat_events.resync(play_id, date_and_time)
     return db_showtime
 
 def update_showtime(
@@ -43,7 +110,16 @@ def update_showtime(
     # Update the fields
     for field, value in showtime_update.items():
         setattr(db_showtime, field, value)
-    
+
+    # The summary rows follow the showtime's tickets
+    db.flush()
+    analytics.refresh_showtime_sales(db, play_id, original_date_time)
+    analytics.refresh_showtime_sales(db, db_showtime.play_id, db_showtime.date_and_time)
     db.commit()
+    table_versions.bump("showtimes", "tickets", "showtime_prices")
     db.refresh(db_showtime)
+    seat_index.invalidate_showtime(play_id, original_date_time)
+    seat_events.resync(play_id, original_date_time)
+    seat_index.invalidate_showtime(db_showtime.play_id, db_showtime.date_and_time)
+    seat_events.resync(db_showtime.play_id, db_showtime.date_and_time)
     return db_showtime
@@ -1,8 +1,24 @@
+from sqlalchemy import insert, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from typing import Optional, Tuple
 from .. import models
 from ..schemas import tickets as ticket_schemas
+from ..seat_availability import seat_index
+from ..seat_events import seat_events
+from ..pagination import keyset_after
 from datetime import datetime
 import uuid
+from ..response_cache import table_versions
+from .analytics import record_sales
+
+class SeatsUnavailableError(ValueError):
+    def __init__(self, seats):
+        self.seats = sorted(seats)
+        super().__init__("The following seats are already booked for this showtime: " + ", ".join(f"Row {r} Seat {s}" for r, s in self.seats))
+
+def generate_ticket_no():
+    return str(uuid.uuid4().hex)[:10].upper()
 
 def get_ticket(db: Session, row_no: int, seat_no: int, showtime_date_and_time: datetime, showtime_play_id: int, customer_id: int):
     return db.query(models.Ticket).filter(
@@ -13,24 +29,80 @@ def get_ticket(db: Session, row_no: int, seat_no: int, showtime_date_and_time: d
         models.Ticket.customer_id == customer_id
     ).first()
 
-def get_tickets_by_customer(db: Session, customer_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.Ticket).filter(models.Ticket.customer_id == customer_id).offset(skip).limit(limit).all()
+# (showtime, row, seat) is unique per ticket, so it works as a keyset cursor
+TICKET_CURSOR_COLUMNS = (models.Ticket.showtime_play_id, models.Ticket.showtime_date_and_time, models.Ticket.row_no, models.Ticket.seat_no)
+TICKET_CURSOR_TYPES = (int, datetime, int, int)
+
+def ticket_cursor_key(ticket):
+    return (ticket.showtime_play_id, ticket.showtime_date_and_time, ticket.row_no, ticket.seat_no)
+
+def get_tickets_by_customer(db: Session, customer_id: int, skip: int = 0, limit: int = 100, after: Optional[Tuple] = None):
+    query = db.query(models.Ticket).filter(models.Ticket.customer_id == customer_id).order_by(*TICKET_CURSOR_COLUMNS)
+    if after is not None:
+        return query.filter(keyset_after(TICKET_CURSOR_COLUMNS, after)).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
 
 def create_ticket(db: Session, ticket: ticket_schemas.TicketCreate, customer_id: int):
-    ticket_no = str(uuid.uuid4().hex)[:10].upper()
+    ticket_no = generate_ticket_no()
     db_ticket = models.Ticket(
         **ticket.model_dump(), 
         customer_id=customer_id, 
         ticket_no=ticket_no
     )
     db.add(db_ticket)
-    db.commit()
+    record_sales(db, ticket.showtime_play_id, ticket.showtime_date_and_time, [(ticket.row_no, ticket.seat_no)])
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise SeatsUnavailableError([(ticket.row_no, ticket.seat_no)])
+    table_versions.bump("tickets")
     db.refresh(db_ticket)
+    seat_index.mark_booked(db_ticket.showtime_play_id, db_ticket.showtime_date_and_time, db_ticket.row_no, db_ticket.seat_no)
+    seat_events.publish(db_ticket.showtime_play_id, db_ticket.showtime_date_and_time, "booked", [(db_ticket.row_no, db_ticket.seat_no)])
     return db_ticket
 
+def create_tickets(db: Session, booking: ticket_schemas.TicketBatchCreate, customer_id: int):
+    seats = sorted({(seat.row_no, seat.seat_no) for seat in booking.seats})
+    rows = [
+        {
+            "row_no": row_no,
+            "seat_no": seat_no,
+            "showtime_date_and_time": booking.showtime_date_and_time,
+            "showtime_play_id": booking.showtime_play_id,
+            "customer_id": customer_id,
+            "ticket_no": generate_ticket_no(),
+        }
+        for row_no, seat_no in seats
+    ]
+    # One executemany in one transaction; the unique index on
+    # (showtime, row, seat) rejects the whole batch if any seat is taken
+    try:
+        db.execute(insert(models.Ticket), rows)
+        record_sales(db, booking.showtime_play_id, booking.showtime_date_and_time, seats)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        taken = db.query(models.Ticket.row_no, models.Ticket.seat_no).filter(
+            models.Ticket.showtime_play_id == booking.showtime_play_id,
+            models.Ticket.showtime_date_and_time == booking.showtime_date_and_time,
+            tuple_(models.Ticket.row_no, models.Ticket.seat_no).in_(seats)
+        ).all()
+        raise SeatsUnavailableError([(r, s) for r, s in taken] or seats)
+    table_versions.bump("tickets")
+
+    for row_no, seat_no in seats:
+        seat_index.mark_booked(booking.showtime_play_id, booking.showtime_date_and_time, row_no, seat_no)
+    seat_events.publish(booking.showtime_play_id, booking.showtime_date_and_time, "booked", seats)
+    return rows
+
 def delete_ticket(db: Session, row_no: int, seat_no: int, showtime_date_and_time: datetime, showtime_play_id: int, customer_id: int):
     db_ticket = get_ticket(db, row_no, seat_no, showtime_date_and_time, showtime_play_id, customer_id)
     if db_ticket:
         db.delete(db_ticket)
+        record_sales(db, showtime_play_id, showtime_date_and_time, [(row_no, seat_no)], sign=-1)
         db.commit()
+        table_versions.bump("tickets")
+        seat_index.mark_released(showtime_play_id, showtime_date_and_time, row_no, seat_no)
+        seat_events.publish(showtime_play_id, showtime_date_and_time, "released", [(row_no, seat_no)])
     return db_ticket
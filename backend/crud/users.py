@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from typing import Optional
 from .. import models
 from ..schemas import users as user_schemas
 from ..auth.security import get_password_hash
@@ -8,8 +9,9 @@ def get_user_by_email(db: Session, email: str):
 
 
 
-def create_user(db: Session, user: user_schemas.UserCreate):
-    hashed_password = get_password_hash(user.password)
+def create_user(db: Session, user: user_schemas.UserCreate, hashed_password: Optional[str] = None):
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
     db_user = models.Customer(
         name=user.name,
         email=user.email, 
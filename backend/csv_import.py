@@ -0,0 +1,34 @@
+import argparse
+import csv
+import json
+from typing import IO, Iterator, Tuple
+
+from .crud.imports import IMPORT_SPECS, import_rows
+from .database import SessionLocal
+
+
+def read_csv_rows(stream: IO[str]) -> Iterator[Tuple[int, dict]]:
+    """Yield ``(line number, row)`` with empty cells treated as missing values."""
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, {key.strip(): value for key, value in row.items() if key and value not in (None, "")}
+
+
+def import_csv(db, entity: str, stream: IO[str], chunk_size: int = None):
+    return import_rows(db, entity, read_csv_rows(stream), chunk_size=chunk_size)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import plays, actors, directors or cast/crew links from CSV files.")
+    parser.add_argument("entity", choices=sorted(IMPORT_SPECS))
+    parser.add_argument("path")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        with open(args.path, newline="", encoding="utf-8-sig") as stream:
+            result = import_csv(db, args.entity, stream, chunk_size=args.chunk_size)
+    finally:
+        db.close()
+    print(json.dumps(result.model_dump(), indent=2))
@@ -1,13 +1,80 @@
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-DATABASE_URL = "sqlite:///./concert_association.db"
+# --- Configuration ---
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./concert_association.db")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1))
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+
+# Read-only sessions get their own pool so they never queue behind writers
+DB_SEPARATE_READ_POOL = os.getenv("DB_SEPARATE_READ_POOL", "1") == "1"
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", 10))
+
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", 64 * 1024))
+
+
+def _is_sqlite(url) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+def _is_memory_db(url) -> bool:
+    database = make_url(url).database
+    return not database or database == ":memory:"
+
+def apply_sqlite_pragmas(dbapi_connection, read_only: bool = False):
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers run concurrently with the single writer
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    if read_only:
+        cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+def _engine_options(url, pool_size: int, poolclass, connect_args: dict = None):
+    options = {"connect_args": connect_args or {}}
+    # In-memory databases live in a single connection and cannot be pooled
+    if not (_is_sqlite(url) and _is_memory_db(url)):
+        options.update(poolclass=poolclass, pool_size=pool_size, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    return options
+
+def create_db_engine(url: str = DATABASE_URL, pool_size: int = DB_POOL_SIZE, read_only: bool = False):
+    connect_args = {"check_same_thread": False} if _is_sqlite(url) else {}
+    db_engine = create_engine(url, **_engine_options(url, pool_size, QueuePool, connect_args))
+    if _is_sqlite(url):
+        event.listen(db_engine, "connect", lambda conn, record: apply_sqlite_pragmas(conn, read_only))
+    return db_engine
+
+def create_async_db_engine(url: str = ASYNC_DATABASE_URL, pool_size: int = DB_POOL_SIZE):
+    db_engine = create_async_engine(url, **_engine_options(url, pool_size, AsyncAdaptedQueuePool))
+    if _is_sqlite(url):
+        event.listen(db_engine.sync_engine, "connect", lambda conn, record: apply_sqlite_pragmas(conn))
+    return db_engine
 
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
-)
+
+engine = create_db_engine()
+read_engine = create_db_engine(pool_size=DB_READ_POOL_SIZE, read_only=True) if DB_SEPARATE_READ_POOL else engine
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Async engine over the same database, used by the async CRUD functions
+async_engine = create_async_db_engine()
+
+# expire_on_commit=False: expired attributes would need lazy IO on access,
+# which an AsyncSession cannot do implicitly
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
@@ -18,3 +85,16 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get a read-only DB session from the read pool
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,63 @@
+import argparse
+
+from sqlalchemy import inspect, text
+
+from .crud.analytics import rebuild_sales
+from .database import SessionLocal
+
+# Seats sold more than once, which only happens in databases from before the
+# unique seat index existed. Revision 0005 won't add the index until they are
+# resolved: python -m backend.duplicate_tickets [--keep-earliest]
+DUPLICATE_TICKETS = text(
+    """
+    SELECT t.rowid, t.showtime_play_id, t.showtime_date_and_time, t.row_no, t.seat_no, t.customer_id, t.ticket_no
+    FROM tickets t
+    JOIN (
+        SELECT showtime_play_id, showtime_date_and_time, row_no, seat_no, min(rowid) AS first_sold
+        FROM tickets
+        GROUP BY showtime_play_id, showtime_date_and_time, row_no, seat_no
+        HAVING count(*) > 1
+    ) d USING (showtime_play_id, showtime_date_and_time, row_no, seat_no)
+    ORDER BY t.showtime_play_id, t.showtime_date_and_time, t.row_no, t.seat_no, t.rowid
+    """
+)
+
+
+def duplicate_tickets(db):
+    """Every ticket for a seat that was sold more than once, earliest sale first."""
+    return db.execute(DUPLICATE_TICKETS).all()
+
+
+def remove_later_sales(db) -> int:
+    """Keep the earliest ticket for each seat sold more than once and delete the rest."""
+    removed = db.execute(text(
+        """
+        DELETE FROM tickets WHERE rowid NOT IN (
+            SELECT min(rowid) FROM tickets
+            GROUP BY showtime_play_id, showtime_date_and_time, row_no, seat_no
+        )
+        """
+    )).rowcount
+    db.commit()
+    # The sales summary counted the removed tickets
+    if removed and "showtime_sales" in inspect(db.get_bind()).get_table_names():
+        rebuild_sales(db)
+    return removed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List tickets for seats sold more than once, optionally removing all but the earliest sale.")
+    parser.add_argument("--keep-earliest", action="store_true", help="delete every ticket for such a seat except the one sold first")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        tickets = duplicate_tickets(db)
+        for _, play_id, date_and_time, row_no, seat_no, customer_id, ticket_no in tickets:
+            print(f"play {play_id}, {date_and_time}, row {row_no} seat {seat_no}: ticket {ticket_no} (customer {customer_id})")
+        if args.keep_earliest:
+            print(f"Removed {remove_later_sales(db)} tickets")
+        elif not tickets:
+            print("No seat was sold more than once")
+    finally:
+        db.close()
@@ -0,0 +1,315 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import create_engine, event, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from . import models
+from .auth.security import get_password_hash
+from .crud.analytics import rebuild_sales
+from .database import DATABASE_URL, create_db_engine
+from .migrate import upgrade_database
+
+# Generates a production-sized dataset for scale testing into an empty
+# database: python -m backend.generate_dataset --tickets 3000000 --workers 4
+#
+# Every chunk of rows is generated from its own seed, so the same arguments
+# always produce the same data, whatever the number of workers. With several
+# workers each one writes its chunks into a scratch SQLite file and the files
+# are merged with INSERT ... SELECT, since SQLite only has one writer.
+
+INSERT_BATCH_ROWS = 20_000
+SHOW_SLOTS = ("19:30", "14:00", "21:00", "11:00")
+GENRES = ("Drama", "Comedy", "Tragedy", "Musical", "Opera", "Dance", "Folk", "Children")
+FIRST_NAMES = ("Aminata", "Mohamed", "Fatmata", "Ibrahim", "Isatu", "Abu", "Mariama", "Alhaji", "Hawa", "Sorie",
+               "Kadiatu", "Sahr", "Adama", "Foday", "Zainab", "Osman", "Jeneba", "Musa", "Salamatu", "Tamba")
+LAST_NAMES = ("Kamara", "Sesay", "Conteh", "Koroma", "Bangura", "Turay", "Kargbo", "Mansaray", "Jalloh", "Fofanah",
+              "Kanu", "Barrie", "Bah", "Cole", "Williams", "Johnson", "Thomas", "Macauley", "Kallon", "Sankoh")
+TITLE_WORDS = ("Night", "River", "King", "Market", "Rain", "Harmattan", "Lion", "Drum", "Bride", "Freetown",
+               "Song", "Ghost", "Palm", "Harbour", "Moon", "Thief", "Feast", "Storm", "Mask", "Letter")
+
+ShowTimeKey = Tuple[int, datetime]
+
+
+def chunk_rng(seed: int, entity: str, chunk: int) -> random.Random:
+    return random.Random(f"{seed}:{entity}:{chunk}")
+
+
+def _person_name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+# --- Catalogue: small enough to generate in the parent process ---
+def generate_plays(seed: int, count: int):
+    rng = chunk_rng(seed, "plays", 0)
+    for play_id in range(1, count + 1):
+        words = rng.sample(TITLE_WORDS, rng.randint(1, 3))
+        yield {
+            "id": play_id,
+            "title": f"The {' '.join(words)} {play_id}",
+            "duration": rng.choice((60, 75, 90, 120, 150, 180)),
+            "price": Decimal(rng.randrange(50, 400, 25)) / 10,
+            "genre": rng.choice(GENRES),
+            "synopsis": " ".join(rng.choices(TITLE_WORDS, k=rng.randint(10, 40))).lower(),
+        }
+
+
+def generate_people(seed: int, entity: str, count: int):
+    rng = chunk_rng(seed, entity, 0)
+    for person_id in range(1, count + 1):
+        row = {"id": person_id, "name": _person_name(rng), "date_of_birth": rng.randint(1940, 2005)}
+        if entity == "actors":
+            row["gender"] = rng.choice("MF")
+        else:
+            row["citizenship"] = rng.choice(("Sierra Leone", "Sierra Leone", "Ghana", "Nigeria", "Liberia", "UK"))
+        yield row
+
+
+def generate_links(seed: int, plays: int, actors: int, directors: int):
+    rng = chunk_rng(seed, "links", 0)
+    cast, crew = [], []
+    for play_id in range(1, plays + 1):
+        cast.extend({"actor_id": actor_id, "play_id": play_id} for actor_id in rng.sample(range(1, actors + 1), min(actors, rng.randint(5, 20))))
+        crew.extend({"director_id": director_id, "play_id": play_id} for director_id in rng.sample(range(1, directors + 1), min(directors, rng.randint(1, 2))))
+    return cast, crew
+
+
+def generate_showtimes(seed: int, plays: int, start: datetime, days: int, shows_per_day: int) -> List[ShowTimeKey]:
+    """A play runs for a few weeks at a time, with ``shows_per_day`` performances a day."""
+    rng = chunk_rng(seed, "showtimes", 0)
+    slots = [tuple(int(part) for part in slot.split(":")) for slot in SHOW_SLOTS[:shows_per_day]]
+    showtimes = []
+    day = 0
+    while day < days:
+        play_id = rng.randint(1, plays)
+        run_days = rng.randint(7, 28)
+        for offset in range(day, min(day + run_days, days)):
+            date = start + timedelta(days=offset)
+            showtimes.extend((play_id, date.replace(hour=hour, minute=minute)) for hour, minute in slots)
+        day += run_days
+    return showtimes
+
+
+# --- Bulk rows: generated in chunks, possibly by worker processes ---
+def customer_rows(seed: int, chunk: int, first_id: int, last_id: int, hashed_password: str):
+    rng = chunk_rng(seed, "customers", chunk)
+    for customer_id in range(first_id, last_id):
+        yield {
+            "id": customer_id,
+            "name": _person_name(rng),
+            "email": f"customer{customer_id}@example.com",
+            "hashed_password": hashed_password,
+            "telephone_no": f"+232 {rng.randint(70, 99)} {rng.randint(100000, 999999)}",
+            "role": "customer",
+        }
+
+
+def ticket_rows(seed: int, chunk: int, showtimes: List[ShowTimeKey], seats: int, seats_per_row: int, tickets_per_showtime: float, customers: int):
+    rng = chunk_rng(seed, "tickets", chunk)
+    for play_id, date_and_time in showtimes:
+        sold = min(seats, max(0, round(tickets_per_showtime * rng.uniform(0.4, 1.6))))
+        for position in rng.sample(range(seats), sold):
+            yield {
+                "row_no": position // seats_per_row + 1,
+                "seat_no": position % seats_per_row + 1,
+                "showtime_date_and_time": date_and_time,
+                "showtime_play_id": play_id,
+                "customer_id": rng.randint(1, customers),
+                "ticket_no": f"{rng.getrandbits(40):010X}",
+            }
+
+
+def price_rows(seed: int, chunk: int, showtimes: List[ShowTimeKey], rows: int, seats_per_row: int, priced_fraction: float):
+    """Per-seat price maps: front rows cost more, and some showtimes are premium."""
+    rng = chunk_rng(seed, "prices", chunk)
+    for play_id, date_and_time in showtimes:
+        if rng.random() >= priced_fraction:
+            continue
+        base = Decimal(rng.randrange(50, 300, 25)) / 10
+        for row_no in range(1, rows + 1):
+            price = base * (2 if row_no <= rows // 5 else 1)
+            for seat_no in range(1, seats_per_row + 1):
+                yield {"row_no": row_no, "seat_no": seat_no, "showtime_date_and_time": date_and_time,
+                       "showtime_play_id": play_id, "price": price}
+
+
+def _bulk_engine(url: str):
+    bulk_engine = create_engine(url)
+
+    @event.listens_for(bulk_engine, "connect")
+    def _fast_writes(dbapi_connection, record):
+        # Generated data can be regenerated, so durability is not worth paying for
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA cache_size=-262144")
+        cursor.close()
+
+    return bulk_engine
+
+
+def insert_rows(conn, table, rows: Iterable[dict]) -> int:
+    written, batch = 0, []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == INSERT_BATCH_ROWS:
+            conn.execute(insert(table), batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        conn.execute(insert(table), batch)
+        written += len(batch)
+    return written
+
+
+CHUNK_TABLES = {
+    "customers": (models.Customer.__table__, customer_rows),
+    "tickets": (models.Ticket.__table__, ticket_rows),
+    "prices": (models.ShowTimePrice.__table__, price_rows),
+}
+
+
+def write_chunk(url: str, entity: str, chunk: int, args: tuple, create_table: bool = False) -> Tuple[str, int]:
+    """Generate one chunk of ``entity`` rows and write them to ``url``."""
+    table, generate = CHUNK_TABLES[entity]
+    bulk_engine = _bulk_engine(url)
+    try:
+        if create_table:
+            # A scratch file: only the bare table, its rows get merged into the real one
+            table.metadata.create_all(bulk_engine, tables=[table])
+            for index in table.indexes:
+                index.drop(bulk_engine)
+        with bulk_engine.begin() as conn:
+            return url, insert_rows(conn, table, generate(*args))
+    finally:
+        bulk_engine.dispose()
+
+
+def merge_chunk(conn, shard_path: str, table):
+    columns = ", ".join(column.name for column in table.columns)
+    conn.exec_driver_sql("ATTACH DATABASE ? AS shard", (shard_path,))
+    try:
+        conn.exec_driver_sql(f"INSERT INTO main.{table.name} ({columns}) SELECT {columns} FROM shard.{table.name}")
+        conn.commit()
+    finally:
+        conn.exec_driver_sql("DETACH DATABASE shard")
+
+
+def run_chunks(url: str, tasks: List[Tuple[str, int, tuple]], workers: int) -> int:
+    """Write every (entity, chunk, args) task into the database at ``url``."""
+    if workers <= 1:
+        return sum(write_chunk(url, entity, chunk, args)[1] for entity, chunk, args in tasks)
+
+    written = 0
+    with tempfile.TemporaryDirectory(prefix="dataset-") as workdir, ProcessPoolExecutor(workers) as pool:
+        futures = [
+            (entity, pool.submit(write_chunk, f"sqlite:///{os.path.join(workdir, f'{entity}-{chunk}.db')}", entity, chunk, args, True))
+            for entity, chunk, args in tasks
+        ]
+        merge_engine = _bulk_engine(url)
+        try:
+            with merge_engine.connect() as conn:
+                # Merge in task order as chunks finish, so the row order is the same as with one worker
+                for entity, future in futures:
+                    shard_url, count = future.result()
+                    merge_chunk(conn, shard_url[len("sqlite:///"):], CHUNK_TABLES[entity][0])
+                    os.remove(shard_url[len("sqlite:///"):])
+                    written += count
+        finally:
+            merge_engine.dispose()
+    return written
+
+
+# --- Orchestration ---
+def generate_dataset(url: str, seed: int = 42, plays: int = 300, actors: int = 3000, directors: int = 400,
+                     rows: int = 60, seats_per_row: int = 50, start: datetime = datetime(2023, 1, 1),
+                     days: int = 3 * 365, shows_per_day: int = 2, customers: int = 300_000,
+                     tickets: int = 3_000_000, priced_fraction: float = 0.25, password: str = "password",
+                     workers: int = 1, showtimes_per_chunk: int = 100, customers_per_chunk: int = 50_000, log=print):
+    started = time.perf_counter()
+
+    def step(message: str):
+        log(f"[{time.perf_counter() - started:7.1f}s] {message}")
+
+    db_engine = create_db_engine(url)
+    upgrade_database(db_engine)
+    with db_engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(models.Play)).scalar():
+            raise SystemExit("The database already has plays; generate into an empty database")
+
+    showtimes = generate_showtimes(seed, plays, start, days, shows_per_day)
+    seats = rows * seats_per_row
+    with db_engine.begin() as conn:
+        conn.execute(text("PRAGMA synchronous=OFF"))
+        insert_rows(conn, models.Play.__table__, generate_plays(seed, plays))
+        insert_rows(conn, models.Actor.__table__, generate_people(seed, "actors", actors))
+        insert_rows(conn, models.Director.__table__, generate_people(seed, "directors", directors))
+        cast, crew = generate_links(seed, plays, actors, directors)
+        insert_rows(conn, models.Actor_Play, cast)
+        insert_rows(conn, models.Director_Play, crew)
+        insert_rows(conn, models.Seat.__table__, (
+            {"row_no": row_no, "seat_no": seat_no} for row_no in range(1, rows + 1) for seat_no in range(1, seats_per_row + 1)
+        ))
+        insert_rows(conn, models.ShowTime.__table__, ({"play_id": play_id, "date_and_time": dt} for play_id, dt in showtimes))
+    step(f"{plays} plays, {actors} actors, {directors} directors, {len(cast) + len(crew)} cast/crew links, "
+         f"{seats} seats, {len(showtimes)} showtimes")
+
+    # One bcrypt hash shared by every customer; hashing each would take hours
+    hashed_password = get_password_hash(password)
+    customer_chunks = [
+        ("customers", chunk, (seed, chunk, first_id, min(first_id + customers_per_chunk, customers + 1), hashed_password))
+        for chunk, first_id in enumerate(range(1, customers + 1, customers_per_chunk))
+    ]
+    step(f"{run_chunks(url, customer_chunks, workers)} customers")
+
+    showtime_chunks = [showtimes[i:i + showtimes_per_chunk] for i in range(0, len(showtimes), showtimes_per_chunk)]
+    tickets_per_showtime = tickets / len(showtimes) if showtimes else 0
+    price_tasks = [("prices", chunk, (seed, chunk, group, rows, seats_per_row, priced_fraction)) for chunk, group in enumerate(showtime_chunks)]
+    step(f"{run_chunks(url, price_tasks, workers)} showtime prices")
+    ticket_tasks = [
+        ("tickets", chunk, (seed, chunk, group, seats, seats_per_row, tickets_per_showtime, customers))
+        for chunk, group in enumerate(showtime_chunks)
+    ]
+    step(f"{run_chunks(url, ticket_tasks, workers)} tickets")
+
+    with Session(db_engine) as db:
+        step(f"sales summary for {rebuild_sales(db)} showtimes")
+    with db_engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    db_engine.dispose()
+    step("done")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill an empty database with a large synthetic dataset for scale testing.")
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--plays", type=int, default=300)
+    parser.add_argument("--actors", type=int, default=3000)
+    parser.add_argument("--directors", type=int, default=400)
+    parser.add_argument("--rows", type=int, default=60)
+    parser.add_argument("--seats-per-row", type=int, default=50)
+    parser.add_argument("--start", type=datetime.fromisoformat, default=datetime(2023, 1, 1), help="first showtime date")
+    parser.add_argument("--days", type=int, default=3 * 365, help="days of showtimes")
+    parser.add_argument("--shows-per-day", type=int, choices=range(1, len(SHOW_SLOTS) + 1), default=2)
+    parser.add_argument("--customers", type=int, default=300_000)
+    parser.add_argument("--tickets", type=int, default=3_000_000, help="approximate number of tickets sold")
+    parser.add_argument("--priced-fraction", type=float, default=0.25, help="share of showtimes with a per-seat price map")
+    parser.add_argument("--password", default="password", help="password of every generated customer")
+    parser.add_argument("--workers", type=int, default=1, help="processes generating chunks in parallel")
+    args = parser.parse_args()
+    if not args.database_url.startswith("sqlite:///"):
+        parser.error("the generator writes SQLite databases only")
+
+    generate_dataset(
+        args.database_url, seed=args.seed, plays=args.plays, actors=args.actors, directors=args.directors,
+        rows=args.rows, seats_per_row=args.seats_per_row, start=args.start, days=args.days,
+        shows_per_day=args.shows_per_day, customers=args.customers, tickets=args.tickets,
+        priced_fraction=args.priced_fraction, password=args.password, workers=args.workers,
+    )
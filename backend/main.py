@@ -1,17 +1,70 @@
+import logging
+import os
+from contextlib import asynccontextmanager
+
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
-from .database import Base, engine
-from .routes import plays, auth, actors, tickets, directors, showtimes, seats, showtime_prices
+from .auth.principal_cache import principal_cache
+from .cache_sync import CACHE_SYNC, cache_sync
+from .metrics import MetricsMiddleware, registry, stats_collector
+from .pagination import NEXT_CURSOR_HEADER
+from .response_cache import response_cache, table_versions
+from .seat_availability import seat_index
+from .seat_events import seat_events
+from .seat_holds import seat_holds
+from .routes import plays, auth, actors, tickets, directors, showtimes, seats, showtime_prices, holds, search, exports, imports, reports, metrics
+
+# --- Configuration ---
+# Bring the schema up to date when the app starts. Deployments running
+# several workers should turn this off and run `python -m backend.migrate`
+# once before starting them.
+MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "1") == "1"
+
+# Importing this module builds the app and mounts the routers but doesn't
+# touch the database: the migration, the engine instrumentation and the
+# cache sync thread wait for the app to start serving.
+_engines_instrumented = False
+
+
+def instrument_engines():
+    """Time every SQL statement for /metrics; runs once per process."""
+    global _engines_instrumented
+    if _engines_instrumented:
+        return
+    from .database import async_engine, engine, read_engine
+    from .metrics import instrument_engine
+
+    instrument_engine(engine, "write")
+    if read_engine is not engine:
+        instrument_engine(read_engine, "read")
+    instrument_engine(async_engine.sync_engine, "async")
+    _engines_instrumented = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if MIGRATE_ON_STARTUP:
+        from .migrate import prepare_database
+        prepare_database()
+    instrument_engines()
+    if CACHE_SYNC:
+        cache_sync.start()
+    yield
+    from .auth import security
+    from .database import async_engine
+    cache_sync.stop()
+    security.shutdown_hash_executor()
+    await async_engine.dispose()
+
 
 app = FastAPI(
     title="Sierra Leone Concert Association API",
     description="REST API for managing concerts, plays, actors, tickets, and more.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # ✅ Add CORS settings
-import logging
-
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Allow all origins for local development
@@ -19,17 +72,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
+# Per-route latency, status and SQL counts, exported on /metrics
+app.add_middleware(MetricsMiddleware)
+registry.add_collector(stats_collector("app_component_stats", "component", {
+    "response_cache": response_cache.stats,
+    "principal_cache": principal_cache.stats,
+    "seat_events": seat_events.stats,
+    "cache_sync": cache_sync.stats,
+}))
+
+# Writes made through another worker reach this one's caches
+cache_sync.subscribe("table_versions", table_versions.apply_remote)
+cache_sync.subscribe("seat_index", seat_index.apply_remote)
+cache_sync.subscribe("principal_cache", principal_cache.apply_remote)
+cache_sync.subscribe("seat_events", seat_events.apply_remote)
+cache_sync.subscribe("seat_holds", seat_holds.apply_remote)
+cache_sync.on_reset(table_versions.bump_all)
+cache_sync.on_reset(seat_index.clear)
+cache_sync.on_reset(principal_cache.clear)
+cache_sync.on_reset(seat_events.reset)
+cache_sync.on_reset(seat_holds.drop_remote)
+
+# Seat holds are pushed to live seat maps alongside bookings
+seat_holds.add_listener(seat_events.hold_changed)
+
 @app.options("/{rest_of_path:path}")
 async def preflight_handler(rest_of_path: str):
     logging.info(f"CORS preflight for: {rest_of_path}")
     return {"message": "CORS preflight OK"}
 
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 # Mount the routers
 app.include_router(auth.router)
 app.include_router(plays.router)
@@ -39,6 +113,12 @@ app.include_router(directors.router)
 app.include_router(showtimes.router)
 app.include_router(seats.router)
 app.include_router(showtime_prices.router)
+app.include_router(holds.router)
+app.include_router(search.router)
+app.include_router(exports.router)
+app.include_router(imports.router)
+app.include_router(reports.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,247 @@
+import bisect
+import logging
+import os
+import time
+from contextvars import ContextVar
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 100))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _format_labels(names: Sequence[str], values: Sequence) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, labels: Tuple = (), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self._header() + [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(v)}" for labels, v in values]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: Tuple = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._values: Dict[Tuple, list] = {}
+
+    def observe(self, labels: Tuple, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._values.items())
+        lines = self._header()
+        for labels, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames + ('le',), labels + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]):
+        """Register a callback producing extra exposition lines at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.register(Histogram("http_request_duration_seconds", "HTTP request latency by route.", ("method", "route")))
+REQUESTS = registry.register(Counter("http_requests_total", "HTTP requests by route and status code.", ("method", "route", "status")))
+IN_FLIGHT = registry.register(Gauge("http_requests_in_flight", "HTTP requests currently being served.", ("method",)))
+REQUEST_QUERIES = registry.register(Histogram("http_request_db_queries", "SQL statements executed per HTTP request.", ("method", "route"), QUERY_COUNT_BUCKETS))
+REQUEST_DB_TIME = registry.register(Histogram("http_request_db_duration_seconds", "Time spent in SQL statements per HTTP request.", ("method", "route")))
+QUERY_LATENCY = registry.register(Histogram("db_query_duration_seconds", "Latency of individual SQL statements.", ("engine",)))
+# Under contention a SQLite write statement mostly waits for the write lock
+WRITE_LATENCY = registry.register(Histogram("db_write_duration_seconds", "Latency of INSERT/UPDATE/DELETE statements.", ("engine",)))
+LOCK_ERRORS = registry.register(Counter("db_lock_errors_total", "Statements that failed with 'database is locked'.", ("engine",)))
+
+_WRITE_VERBS = ("INSERT", "UPDATE", "DELETE")
+
+
+def stats_collector(name: str, label: str, sources: Dict[str, Callable[[], dict]]) -> Callable[[], List[str]]:
+    """Expose components' ``stats()`` dicts as one gauge, labelled by source and stat."""
+    def collect():
+        lines = [f"# HELP {name} In-process component statistics.", f"# TYPE {name} gauge"]
+        for source, stats in sources.items():
+            for stat, value in stats().items():
+                lines.append(f"{name}{_format_labels((label, 'stat'), (source, stat))} {_format_value(value)}")
+        return lines
+    return collect
+
+
+# --- Per-request SQL accounting ---
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# The middleware sets a fresh RequestStats per request. Threadpool workers and
+# the async engine's greenlets run with a copy of the request's context, so
+# they add to the same object.
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+def instrument_engine(engine, name: str):
+    """Count every statement run on ``engine`` and time it."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        QUERY_LATENCY.observe((name,), elapsed)
+        if statement.lstrip()[:6].upper() in _WRITE_VERBS:
+            WRITE_LATENCY.observe((name,), elapsed)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, statement)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        # after_cursor_execute doesn't fire for failed statements
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
+        if "database is locked" in str(exception_context.original_exception):
+            LOCK_ERRORS.inc((name,))
+
+
+# --- Middleware ---
+def _route_template(scope) -> str:
+    # FastAPI stores the matched route in the scope; unmatched paths share one
+    # label so random URLs can't blow up the series count
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Records latency, status and SQL usage per route, and reports the
+    request's SQL usage in a ``Server-Timing`` header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.queries} queries", app;dur={elapsed_ms:.2f}',
+                )
+            await send(message)
+
+        IN_FLIGHT.inc((method,))
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec((method,))
+            route = _route_template(scope)
+            REQUEST_LATENCY.observe((method, route), elapsed)
+            REQUESTS.inc((method, route, str(status)))
+            REQUEST_QUERIES.observe((method, route), stats.queries)
+            REQUEST_DB_TIME.observe((method, route), stats.db_seconds)
+            current_request_stats.reset(token)
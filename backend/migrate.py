@@ -0,0 +1,55 @@
+import argparse
+import os
+
+from alembic import command
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from .database import engine
+from .search_index import ensure_search_index
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALEMBIC_INI = os.path.join(PROJECT_ROOT, "alembic.ini")
+INITIAL_REVISION = "0001"
+
+
+def alembic_config(connection=None) -> Config:
+    config = Config(ALEMBIC_INI)
+    # Resolve the scripts relative to the project, not the working directory
+    config.set_main_option("script_location", os.path.join(PROJECT_ROOT, "migrations"))
+    config.attributes["configure_logging"] = False
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def upgrade_database(db_engine: Engine = engine, revision: str = "head"):
+    with db_engine.begin() as connection:
+        config = alembic_config(connection)
+        tables = inspect(connection).get_table_names()
+        # Databases created with create_all before migrations existed are
+        # adopted at the initial revision, which matches what create_all built.
+        # SQLite keeps the empty version table from an adoption whose upgrade
+        # failed, so it's the missing revision that counts, not the table.
+        if "plays" in tables and MigrationContext.configure(connection).get_current_revision() is None:
+            command.stamp(config, INITIAL_REVISION)
+        command.upgrade(config, revision)
+
+
+def prepare_database(db_engine: Engine = engine):
+    """Everything the app needs from the database before serving: the latest
+    schema, plus the full-text search table and its sync triggers."""
+    upgrade_database(db_engine)
+    ensure_search_index(db_engine)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Upgrade the database schema to the given revision.")
+    parser.add_argument("revision", nargs="?", default="head")
+    args = parser.parse_args()
+    if args.revision == "head":
+        prepare_database()
+    else:
+        upgrade_database(revision=args.revision)
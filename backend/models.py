@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, DECIMAL, Table, CHAR, ForeignKeyConstraint
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, DECIMAL, Table, CHAR, ForeignKeyConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy import and_
 from .database import Base
@@ -7,13 +7,16 @@ from .database import Base
 Director_Play = Table(
     'director_play', Base.metadata,
     Column('director_id', Integer, ForeignKey('directors.id'), primary_key=True),
-    Column('play_id', Integer, ForeignKey('plays.id'), primary_key=True)
+    Column('play_id', Integer, ForeignKey('plays.id'), primary_key=True),
+    # The primary key leads with director_id; loading a play's directors filters on play_id
+    Index('ix_director_play_play_id', 'play_id')
 )
 
 Actor_Play = Table(
     'actor_play', Base.metadata,
     Column('actor_id', Integer, ForeignKey('actors.id'), primary_key=True),
-    Column('play_id', Integer, ForeignKey('plays.id'), primary_key=True)
+    Column('play_id', Integer, ForeignKey('plays.id'), primary_key=True),
+    Index('ix_actor_play_play_id', 'play_id')
 )
 
 class Play(Base):
@@ -67,6 +70,12 @@ class ShowTime(Base):
 
     play = relationship("Play", back_populates="showtimes")
 
+    # Per-play date range filters; plain date ranges use the primary key,
+    # which already leads with date_and_time
+    __table_args__ = (
+        Index('ix_showtimes_play_id_date_and_time', 'play_id', 'date_and_time'),
+    )
+
     prices = relationship("ShowTimePrice", back_populates="showtime", cascade="all, delete-orphan")
     tickets = relationship("Ticket", back_populates="showtime", cascade="all, delete-orphan")
 
@@ -84,6 +93,8 @@ class ShowTimePrice(Base):
             ['showtime_date_and_time', 'showtime_play_id'],
             ['showtimes.date_and_time', 'showtimes.play_id']
         ),
+        # The primary key leads with the seat, prices are looked up per showtime
+        Index('ix_showtime_prices_showtime', 'showtime_play_id', 'showtime_date_and_time'),
     )
 
     showtime = relationship("ShowTime", back_populates="prices")
@@ -103,7 +114,41 @@ class Ticket(Base):
             ['showtime_date_and_time', 'showtime_play_id'],
             ['showtimes.date_and_time', 'showtimes.play_id']
         ),
+        # A seat can only be sold once per showtime, whoever the customer is
+        Index('ux_tickets_showtime_seat', 'showtime_play_id', 'showtime_date_and_time', 'row_no', 'seat_no', unique=True),
+        # A customer's tickets in the order they are paginated
+        Index('ix_tickets_customer_id', 'customer_id', 'showtime_play_id', 'showtime_date_and_time', 'row_no', 'seat_no'),
     )
 
     customer = relationship("Customer", back_populates="tickets")
     showtime = relationship("ShowTime", back_populates="tickets")
+
+
+class ShowTimeSales(Base):
+    """Tickets sold and revenue per showtime, kept up to date by the ticket CRUD functions."""
+    __tablename__ = 'showtime_sales'
+    showtime_play_id = Column(Integer, primary_key=True)
+    showtime_date_and_time = Column(DateTime, primary_key=True)
+    tickets_sold = Column(Integer, nullable=False, default=0)
+    revenue = Column(DECIMAL(10, 2), nullable=False, default=0)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ['showtime_date_and_time', 'showtime_play_id'],
+            ['showtimes.date_and_time', 'showtimes.play_id']
+        ),
+    )
+
+
+class CacheEvent(Base):
+    """Cache invalidations one app process publishes for the others, see backend/cache_sync.py."""
+    __tablename__ = 'cache_events'
+    id = Column(Integer, primary_key=True)
+    origin = Column(String(32), nullable=False)
+    topic = Column(String(32), nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+    # AUTOINCREMENT: ids are never reused after old events are pruned, so a
+    # reader that fell behind the pruning can tell it missed some
+    __table_args__ = {'sqlite_autoincrement': True}
@@ -0,0 +1,50 @@
+import base64
+import json
+from datetime import datetime
+from typing import Callable, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import literal, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Encode the sort key of the last row on a page into an opaque token."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, types: Sequence[type]) -> Tuple:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for v, t in zip(payload, types)
+        )
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def parse_cursor(token: Optional[str], types: Sequence[type]) -> Optional[Tuple]:
+    return decode_cursor(token, types) if token else None
+
+
+def keyset_after(columns: Sequence, after: Sequence):
+    """Row-value comparison ``(col1, col2, ...) > (v1, v2, ...)`` bound with the columns' types."""
+    return tuple_(*columns) > tuple_(*[literal(value, column.type) for column, value in zip(columns, after)])
+
+
+def next_cursor_headers(rows: list, limit: int, key: Callable) -> dict:
+    # A short page means there is nothing left to fetch
+    if rows and len(rows) >= limit:
+        return {NEXT_CURSOR_HEADER: encode_cursor(key(rows[-1]))}
+    return {}
+
+
+def set_next_cursor(response: Response, rows: list, limit: int, key: Callable):
+    response.headers.update(next_cursor_headers(rows, limit, key))
@@ -0,0 +1,11 @@
+from .crud.analytics import rebuild_sales
+from .database import SessionLocal
+
+# Recomputes the showtime_sales summary from the tickets table, e.g. after
+# tickets were changed outside the API: python -m backend.rebuild_sales
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        print(f"Rebuilt sales for {rebuild_sales(db)} showtimes")
+    finally:
+        db.close()
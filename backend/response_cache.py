@@ -0,0 +1,151 @@
+import hashlib
+import uuid
+from collections import OrderedDict, defaultdict
+from threading import Lock
+from typing import Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from .cache_sync import cache_sync
+
+# --- Configuration ---
+RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+class TableVersions:
+    """Per-table write counters, bumped by the CRUD write functions.
+
+    A cached response is valid for as long as the versions of the tables it
+    was built from have not moved.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._versions: Dict[str, int] = defaultdict(int)
+        # Counters restart at zero with the process, the epoch keeps ETags
+        # from one process lifetime from matching another's
+        self.epoch = uuid.uuid4().hex
+
+    def bump(self, *tables: str):
+        self._bump(tables)
+        cache_sync.publish("table_versions", list(tables))
+
+    def _bump(self, tables: Iterable[str]):
+        with self._lock:
+            for table in tables:
+                self._versions[table] += 1
+
+    def apply_remote(self, tables):
+        self._bump(tables)
+
+    def bump_all(self):
+        with self._lock:
+            tables = list(self._versions)
+        self._bump(tables)
+
+    def snapshot(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._versions[table] for table in tables)
+
+
+table_versions = TableVersions()
+
+
+def serialize(adapter: TypeAdapter, value) -> bytes:
+    """Render ORM objects to JSON through the route's response schema."""
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class CacheLookup:
+    def __init__(self, cache: "ResponseCache", request: Request, key: str, versions: Tuple[int, ...]):
+        self._cache = cache
+        self._key = key
+        self._versions = versions
+        self.etag = '"' + hashlib.sha1(repr((cache.versions.epoch, key, versions)).encode()).hexdigest() + '"'
+        self.response: Optional[Response] = None
+
+        # The ETag only depends on the table versions, so a matching
+        # If-None-Match is answered before anything else is looked at
+        if _etag_matches(request, self.etag):
+            self.response = Response(status_code=304, headers={"ETag": self.etag})
+            cache.not_modified += 1
+            return
+
+        entry = cache._get(key, versions)
+        if entry is not None:
+            body, headers = entry
+            self.response = Response(content=body, media_type="application/json", headers={**headers, "ETag": self.etag})
+
+    def store(self, body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+        headers = dict(headers or {})
+        self._cache._put(self._key, self._versions, body, headers)
+        return Response(content=body, media_type="application/json", headers={**headers, "ETag": self.etag})
+
+
+class ResponseCache:
+    """LRU cache of serialised JSON responses, bounded by total body size."""
+
+    def __init__(self, versions: TableVersions, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.versions = versions
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def lookup(self, request: Request, tables: Tuple[str, ...]) -> CacheLookup:
+        query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+        key = f"{request.url.path}?{query}"
+        return CacheLookup(self, request, key, self.versions.snapshot(tables))
+
+    def _get(self, key: str, versions: Tuple[int, ...]):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != versions:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def _put(self, key: str, versions: Tuple[int, ...], body: bytes, headers: Dict[str, str]):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._entries[key] = (versions, body, headers)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, (_, evicted, _) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
+
+
+response_cache = ResponseCache(table_versions)
@@ -5,7 +5,7 @@ from typing import List
 from .. import models
 from ..schemas import actors as actor_schemas
 from ..crud import actors as actor_crud
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..auth.dependencies import get_current_admin_user
 
 router = APIRouter(
@@ -18,12 +18,12 @@ def create_actor(actor: actor_schemas.ActorCreate, db: Session = Depends(get_db)
     return actor_crud.create_actor(db=db, actor=actor)
 
 @router.get("/", response_model=List[actor_schemas.ActorResponse])
-def read_actors(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_actors(skip: int = 0, limit: int = 100, db: Session = Depends(get_read_db)):
     actors = actor_crud.get_actors(db, skip=skip, limit=limit)
     return actors
 
 @router.get("/{actor_id}", response_model=actor_schemas.ActorResponse)
-def read_actor(actor_id: int, db: Session = Depends(get_db)):
+def read_actor(actor_id: int, db: Session = Depends(get_read_db)):
     db_actor = actor_crud.get_actor(db, actor_id=actor_id)
     if db_actor is None:
         raise HTTPException(status_code=404, detail="Actor not found")
@@ -1,21 +1,38 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
 from ..database import get_db
 from ..schemas import users as user_schemas
 from ..crud import users as user_crud
+from ..crud import customers as customer_crud
 from ..auth import security
+from ..auth.dependencies import get_current_admin_user
+from ..auth.principal_cache import principal_cache
 
 router = APIRouter(tags=["Authentication"])
 
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+def _hashing_overloaded():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="The server is busy, please try again shortly",
+        headers={"Retry-After": str(security.HASH_RETRY_AFTER_SECONDS)},
+    )
+
+# The auth routes are async so bcrypt runs on the hashing process pool
+# instead of holding a request thread; DB calls go to the threadpool
 @router.post("/token", response_model=user_schemas.Token)
-def login_for_access_token(db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()):
-    user = user_crud.get_user_by_email(db, email=form_data.username)
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+async def login_for_access_token(db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()):
+    user = await run_in_threadpool(user_crud.get_user_by_email, db, email=form_data.username)
+    try:
+        valid = user is not None and await security.verify_password_async(form_data.password, user.hashed_password)
+    except security.HashingOverloadedError:
+        raise _hashing_overloaded()
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -29,9 +46,24 @@ def login_for_access_token(db: Session = Depends(get_db), form_data: OAuth2Passw
 
 
 @router.post("/users/register", response_model=user_schemas.UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(user: user_schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = user_crud.get_user_by_email(db, email=user.email)
+async def register_user(user: user_schemas.UserCreate, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(user_crud.get_user_by_email, db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    return user_crud.create_user(db=db, user=user)
+    try:
+        hashed_password = await security.get_password_hash_async(user.password)
+    except security.HashingOverloadedError:
+        raise _hashing_overloaded()
+    return await run_in_threadpool(user_crud.create_user, db=db, user=user, hashed_password=hashed_password)
+
+@router.put("/users/{user_id}/role", response_model=user_schemas.UserResponse, dependencies=[Depends(get_current_admin_user)])
+def update_user_role(user_id: int, update: user_schemas.UserRoleUpdate, db: Session = Depends(get_db)):
+    # Evicts the user's cached principal, so the new role applies on their next request
+    user = customer_crud.update_customer_role(db, customer_id=user_id, role=update.role)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
 
+@router.get("/auth/principal-cache", dependencies=[Depends(get_current_admin_user)])
+def read_principal_cache_stats():
+    return principal_cache.stats()
@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterator, Literal, Optional
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from ..crud import exports as export_crud
+from ..crud.showtimes import showtime_filters
+from ..database import read_engine
+from ..auth.dependencies import get_current_admin_user
+
+router = APIRouter(
+    prefix="/exports",
+    tags=["exports"],
+    dependencies=[Depends(get_current_admin_user)],
+)
+
+EXPORT_CHUNK_ROWS = 1000
+
+ExportFormat = Literal["csv", "ndjson"]
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _stream_rows(statement, fmt: str) -> Iterator[str]:
+    # The generator owns its connection: request-scoped sessions may be
+    # closed before a long export has finished streaming
+    with read_engine.connect() as connection:
+        result = connection.execution_options(yield_per=EXPORT_CHUNK_ROWS).execute(statement)
+        columns = list(result.keys())
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            writer.writerow(columns)
+            yield buffer.getvalue()
+
+        # One chunk of output per partition of rows fetched from the cursor
+        for rows in result.partitions():
+            buffer.seek(0)
+            buffer.truncate()
+            if fmt == "csv":
+                writer.writerows(rows)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps({c: _json_value(v) for c, v in zip(columns, row)}))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+
+
+def _export(statement, name: str, fmt: str) -> StreamingResponse:
+    return StreamingResponse(
+        _stream_rows(statement, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+@router.get("/tickets")
+def export_tickets(format: ExportFormat = "csv", play_id: Optional[int] = None):
+    return _export(export_crud.tickets_export_query(play_id), "tickets", format)
+
+
+@router.get("/customers")
+def export_customers(format: ExportFormat = "csv"):
+    return _export(export_crud.customers_export_query(), "customers", format)
+
+
+@router.get("/sales")
+def export_sales(
+    format: ExportFormat = "csv",
+    play_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    filters = showtime_filters(play_id=play_id, date_from=date_from, date_to=date_to)
+    return _export(export_crud.sales_export_query(filters), "sales", format)
@@ -0,0 +1,107 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+from typing import List
+
+from .. import models
+from ..schemas import holds as hold_schemas
+from ..schemas import tickets as ticket_schemas
+from ..crud import tickets as ticket_crud
+from ..database import get_db
+from ..auth.dependencies import get_current_user
+from ..seat_availability import seat_index
+from ..seat_holds import seat_holds, SeatsHeldError, HOLD_TTL_SECONDS
+from .tickets import MAX_SEATS_PER_BOOKING
+
+router = APIRouter(
+    prefix="/holds",
+    tags=["holds"],
+    dependencies=[Depends(get_current_user)]  # Protect all hold routes
+)
+
+def _hold_response(hold):
+    return {
+        "hold_id": hold.hold_id,
+        "showtime_date_and_time": hold.date_and_time,
+        "showtime_play_id": hold.play_id,
+        "seats": [{"row_no": r, "seat_no": s} for r, s in sorted(hold.seats)],
+        "expires_in": seat_holds.seconds_left(hold),
+    }
+
+def _get_own_hold(hold_id: str, current_user: models.Customer):
+    hold = seat_holds.get_hold(hold_id)
+    if hold is None or hold.customer_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Hold not found or it has expired")
+    return hold
+
+@router.post("/", response_model=hold_schemas.SeatHoldResponse, status_code=status.HTTP_201_CREATED)
+def create_hold(hold: hold_schemas.SeatHoldCreate, db: Session = Depends(get_db), current_user: models.Customer = Depends(get_current_user)):
+    if not hold.seats:
+        raise HTTPException(status_code=400, detail="At least one seat is required")
+    if len(hold.seats) > MAX_SEATS_PER_BOOKING:
+        raise HTTPException(status_code=400, detail=f"A hold may not exceed {MAX_SEATS_PER_BOOKING} seats")
+
+    # Validate that the showtime exists
+    db_showtime = db.query(models.ShowTime).filter(
+        models.ShowTime.play_id == hold.showtime_play_id,
+        models.ShowTime.date_and_time == hold.showtime_date_and_time
+    ).first()
+    if not db_showtime:
+        raise HTTPException(status_code=404, detail="Showtime does not exist")
+
+    # Validate that every seat exists, in one query
+    requested = {(seat.row_no, seat.seat_no) for seat in hold.seats}
+    found = db.query(models.Seat.row_no, models.Seat.seat_no).filter(
+        tuple_(models.Seat.row_no, models.Seat.seat_no).in_(list(requested))
+    ).all()
+    missing = requested - {(row_no, seat_no) for row_no, seat_no in found}
+    if missing:
+        seats = ", ".join(f"Row {r}, Seat {s}" for r, s in sorted(missing))
+        raise HTTPException(status_code=404, detail=f"The following seats do not exist: {seats}")
+
+    # Booked seats come from the in-memory index, no ticket query needed
+    booked = {
+        (r, s) for r, s in requested
+        if seat_index.is_booked(db, hold.showtime_play_id, hold.showtime_date_and_time, r, s)
+    }
+    if booked:
+        seats = ", ".join(f"Row {r} Seat {s}" for r, s in sorted(booked))
+        raise HTTPException(status_code=409, detail=f"The following seats are already booked for this showtime: {seats}")
+
+    try:
+        db_hold = seat_holds.create_hold(
+            customer_id=current_user.id,
+            play_id=hold.showtime_play_id,
+            date_and_time=hold.showtime_date_and_time,
+            seats=requested,
+            ttl_seconds=HOLD_TTL_SECONDS if hold.ttl_seconds is None else hold.ttl_seconds
+        )
+    except SeatsHeldError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return _hold_response(db_hold)
+
+@router.get("/", response_model=List[hold_schemas.SeatHoldResponse])
+def read_user_holds(current_user: models.Customer = Depends(get_current_user)):
+    return [_hold_response(hold) for hold in seat_holds.holds_for_customer(current_user.id)]
+
+@router.post("/{hold_id}/confirm", response_model=List[ticket_schemas.TicketResponse], status_code=status.HTTP_201_CREATED)
+def confirm_hold(hold_id: str, db: Session = Depends(get_db), current_user: models.Customer = Depends(get_current_user)):
+    hold = _get_own_hold(hold_id, current_user)
+    booking = ticket_schemas.TicketBatchCreate(
+        showtime_date_and_time=hold.date_and_time,
+        showtime_play_id=hold.play_id,
+        seats=[{"row_no": r, "seat_no": s} for r, s in sorted(hold.seats)]
+    )
+    try:
+        tickets = ticket_crud.create_tickets(db=db, booking=booking, customer_id=current_user.id)
+    except ticket_crud.SeatsUnavailableError as e:
+        seat_holds.release_hold(hold_id)
+        raise HTTPException(status_code=409, detail=str(e))
+    seat_holds.release_hold(hold_id)
+    return tickets
+
+@router.delete("/{hold_id}", status_code=status.HTTP_204_NO_CONTENT)
+def release_hold(hold_id: str, current_user: models.Customer = Depends(get_current_user)):
+    _get_own_hold(hold_id, current_user)
+    seat_holds.release_hold(hold_id)
+    return
@@ -0,0 +1,48 @@
+import codecs
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from sqlalchemy.orm import Session
+from typing import Literal, Optional
+
+from ..schemas import imports as import_schemas
+from ..csv_import import import_csv
+from ..database import get_db
+from ..auth.dependencies import get_current_admin_user
+
+router = APIRouter(
+    prefix="/imports",
+    tags=["imports"],
+    dependencies=[Depends(get_current_admin_user)],
+)
+
+ImportEntity = Literal["plays", "actors", "directors", "cast", "crew"]
+
+DECODE_CHECK_BLOCK_SIZE = 64 * 1024
+
+def _is_utf8(binary) -> bool:
+    # Chunks are committed as they are imported, so a bad byte has to be
+    # found before the first one rather than partway through the import
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    try:
+        for block in iter(lambda: binary.read(DECODE_CHECK_BLOCK_SIZE), b""):
+            decoder.decode(block)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    finally:
+        binary.seek(0)
+    return True
+
+@router.post("/{entity}", response_model=import_schemas.ImportResult)
+def import_entity(
+    entity: ImportEntity,
+    file: UploadFile = File(...),
+    chunk_size: Optional[int] = Query(None, ge=1, le=10000),
+    db: Session = Depends(get_db),
+):
+    # The upload is spooled to disk by Starlette, checked in one pass and
+    # then decoded as it is read
+    if not _is_utf8(file.file):
+        raise HTTPException(status_code=400, detail="The file must be UTF-8 encoded CSV")
+    stream = codecs.getreader("utf-8-sig")(file.file)
+    return import_csv(db, entity, stream, chunk_size=chunk_size)
@@ -0,0 +1,33 @@
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from ..metrics import registry
+
+# --- Configuration ---
+# /metrics exposes per-route traffic, SQL timings and cache internals, so it
+# is off unless a token is configured; scrapers send it as a bearer token
+# (Prometheus: authorization.credentials in the scrape config)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# PlainTextResponse appends the charset
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+def require_metrics_token(authorization: Optional[str] = Header(None)):
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not secrets.compare_digest((authorization or "").encode(), f"Bearer {METRICS_TOKEN}".encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+router = APIRouter(tags=["metrics"], dependencies=[Depends(require_metrics_token)])
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics():
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,29 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from ..schemas import plays as play_schemas
 from ..crud import plays as play_crud
-from ..database import get_db
+from ..crud.aio import plays as async_play_crud
+from ..database import get_db, get_async_db
+from ..pagination import parse_cursor, next_cursor_headers
+from ..response_cache import response_cache, serialize
 from ..auth.dependencies import get_current_admin_user
 from .. import models
 
 router = APIRouter(prefix="/plays", tags=["Plays"])
 
+play_adapter = TypeAdapter(play_schemas.PlayResponse)
+play_list_adapter = TypeAdapter(List[play_schemas.PlayResponse])
+
 @router.post("/", response_model=play_schemas.PlayResponse, status_code=status.HTTP_201_CREATED)
 def create_play(play: play_schemas.PlayCreate, db: Session = Depends(get_db), current_user: models.Customer = Depends(get_current_admin_user)):
     return play_crud.create_play(db, play)
 
 @router.get("/", response_model=List[play_schemas.PlayResponse])
-def read_plays(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return play_crud.get_all_plays(db, skip, limit)
+async def read_plays(request: Request, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    cached = response_cache.lookup(request, ("plays",))
+    if cached.response is not None:
+        return cached.response
+
+    after = parse_cursor(cursor, play_crud.PLAY_CURSOR_TYPES)
+    plays = await async_play_crud.get_all_plays(db, skip, limit, after=after)
+    return cached.store(serialize(play_list_adapter, plays), next_cursor_headers(plays, limit, play_crud.play_cursor_key))
 
 @router.get("/{play_id}", response_model=play_schemas.PlayResponse)
-def read_play(play_id: int, db: Session = Depends(get_db)):
-    db_play = play_crud.get_play(db, play_id)
+async def read_play(play_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    cached = response_cache.lookup(request, ("plays",))
+    if cached.response is not None:
+        return cached.response
+
+    db_play = await async_play_crud.get_play(db, play_id)
     if db_play is None:
         raise HTTPException(status_code=404, detail="Play not found")
-    return db_play
+    return cached.store(serialize(play_adapter, db_play))
 
 @router.put("/{play_id}", response_model=play_schemas.PlayResponse)
 def update_play(play_id: int, play: play_schemas.PlayUpdate, db: Session = Depends(get_db), current_user: models.Customer = Depends(get_current_admin_user)):
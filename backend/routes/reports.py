@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import datetime
+
+from ..schemas import reports as report_schemas
+from ..crud import analytics as analytics_crud
+from ..crud.showtimes import showtime_filters
+from ..database import get_db, get_read_db
+from ..auth.dependencies import get_current_admin_user
+
+router = APIRouter(
+    prefix="/reports",
+    tags=["reports"],
+    dependencies=[Depends(get_current_admin_user)],
+)
+
+# All reports read the per-showtime sales summary, never the tickets table
+
+@router.get("/showtimes", response_model=List[report_schemas.ShowTimeReport])
+def showtime_sales_report(
+    play_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+):
+    filters = showtime_filters(play_id=play_id, date_from=date_from, date_to=date_to)
+    return analytics_crud.showtime_report(db, filters, skip=skip, limit=limit)
+
+@router.get("/plays", response_model=List[report_schemas.PlayReport])
+def play_sales_report(
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+):
+    filters = showtime_filters(date_from=date_from, date_to=date_to)
+    return analytics_crud.play_report(db, filters, skip=skip, limit=limit)
+
+@router.get("/days", response_model=List[report_schemas.DayReport])
+def daily_sales_report(
+    play_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+):
+    filters = showtime_filters(play_id=play_id, date_from=date_from, date_to=date_to)
+    return analytics_crud.day_report(db, filters, skip=skip, limit=limit)
+
+@router.post("/rebuild", response_model=report_schemas.SalesRebuildResult)
+def rebuild_sales_summary(db: Session = Depends(get_db)):
+    return {"showtimes": analytics_crud.rebuild_sales(db)}
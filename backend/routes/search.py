@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from ..schemas import search as search_schemas
+from ..crud import search as search_crud
+from ..database import get_read_db
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+@router.get("/", response_model=List[search_schemas.SearchResult])
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: Optional[search_schemas.SearchKind] = None,
+    prefix: bool = True,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+):
+    # Results are ordered by relevance (bm25), best match first
+    return search_crud.search(db, q, kind=kind, skip=skip, limit=limit, prefix=prefix)
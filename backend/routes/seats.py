@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from .. import models
 from ..schemas import seats as seat_schemas
 from ..crud import seats as seat_crud
-from ..database import get_db
+from ..database import get_db, get_read_db
+from ..pagination import parse_cursor, next_cursor_headers
+from ..response_cache import response_cache, serialize
 from ..auth.dependencies import get_current_admin_user
 
 router = APIRouter(
@@ -13,6 +16,10 @@ router = APIRouter(
     tags=["seats"],
 )
 
+MAX_BULK_SEATS = 50000
+
+seat_list_adapter = TypeAdapter(List[seat_schemas.SeatResponse])
+
 @router.post("/", response_model=seat_schemas.SeatResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(get_current_admin_user)])
 def create_seat(seat: seat_schemas.SeatCreate, db: Session = Depends(get_db)):
     db_seat = seat_crud.get_seat(db, row_no=seat.row_no, seat_no=seat.seat_no)
@@ -21,10 +28,27 @@ def create_seat(seat: seat_schemas.SeatCreate, db: Session = Depends(get_db)):
         return db_seat
     return seat_crud.create_seat(db=db, seat=seat)
 
+@router.post("/bulk", response_model=seat_schemas.SeatBulkResult, status_code=status.HTTP_201_CREATED, dependencies=[Depends(get_current_admin_user)])
+def create_seats_bulk(layout: seat_schemas.SeatBulkCreate, db: Session = Depends(get_db)):
+    for row_range in layout.row_ranges:
+        if row_range.start_row > row_range.end_row or row_range.seats_per_row < 1:
+            raise HTTPException(status_code=400, detail="Invalid row range: start_row must not exceed end_row and seats_per_row must be positive")
+    total = len(layout.seats) + sum(
+        (r.end_row - r.start_row + 1) * r.seats_per_row for r in layout.row_ranges
+    )
+    if total > MAX_BULK_SEATS:
+        raise HTTPException(status_code=400, detail=f"A single layout may not exceed {MAX_BULK_SEATS} seats")
+    return seat_crud.create_seats_bulk(db, layout)
+
 @router.get("/", response_model=List[seat_schemas.SeatResponse])
-def read_seats(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    seats = seat_crud.get_seats(db, skip=skip, limit=limit)
-    return seats
+def read_seats(request: Request, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_read_db)):
+    cached = response_cache.lookup(request, ("seats",))
+    if cached.response is not None:
+        return cached.response
+
+    after = parse_cursor(cursor, seat_crud.SEAT_CURSOR_TYPES)
+    seats = seat_crud.get_seats(db, skip=skip, limit=limit, after=after)
+    return cached.store(serialize(seat_list_adapter, seats), next_cursor_headers(seats, limit, seat_crud.seat_cursor_key))
 
 @router.put("/{row_no}/{seat_no}", response_model=seat_schemas.SeatResponse, dependencies=[Depends(get_current_admin_user)])
 def update_seat(row_no: int, seat_no: int, seat_update: seat_schemas.SeatCreate, db: Session = Depends(get_db)):
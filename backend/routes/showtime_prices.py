@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime
@@ -6,7 +7,7 @@ from datetime import datetime
 from .. import models
 from ..schemas import showtime_prices as stp_schemas
 from ..crud import showtime_prices as stp_crud
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..auth.dependencies import get_current_admin_user
 
 router = APIRouter(
@@ -30,8 +31,36 @@ def create_showtime_price(price: stp_schemas.ShowTimePriceCreate, db: Session =
 
     return stp_crud.create_showtime_price(db=db, price=price)
 
+@router.post("/tiers", response_model=stp_schemas.ShowTimePriceBulkResult, status_code=status.HTTP_201_CREATED, dependencies=[Depends(get_current_admin_user)])
+def create_tiered_prices(tiers: stp_schemas.ShowTimePriceTiersCreate, db: Session = Depends(get_db)):
+    db_showtime = db.query(models.ShowTime).filter(models.ShowTime.play_id == tiers.showtime_play_id, models.ShowTime.date_and_time == tiers.showtime_date_and_time).first()
+    if not db_showtime:
+        raise HTTPException(status_code=404, detail="Showtime not found")
+    for tier in tiers.tiers:
+        if tier.start_row > tier.end_row:
+            raise HTTPException(status_code=400, detail="Invalid tier: start_row must not exceed end_row")
+    if not tiers.tiers and tiers.default_price is None:
+        raise HTTPException(status_code=400, detail="Provide at least one tier or a default_price")
+
+    priced = stp_crud.create_tiered_prices(db, tiers)
+    return {"priced": priced}
+
+@router.post("/copy", response_model=stp_schemas.ShowTimePriceBulkResult, status_code=status.HTTP_201_CREATED, dependencies=[Depends(get_current_admin_user)])
+def copy_prices(copy: stp_schemas.ShowTimePriceCopy, db: Session = Depends(get_db)):
+    keys = {(t.showtime_play_id, t.showtime_date_and_time) for t in copy.targets}
+    keys.add((copy.source.showtime_play_id, copy.source.showtime_date_and_time))
+    found = db.query(models.ShowTime.play_id, models.ShowTime.date_and_time).filter(
+        tuple_(models.ShowTime.play_id, models.ShowTime.date_and_time).in_(list(keys))
+    ).all()
+    missing = keys - {(play_id, date_and_time) for play_id, date_and_time in found}
+    if missing:
+        raise HTTPException(status_code=404, detail=f"{len(missing)} of the given showtimes were not found")
+
+    priced = stp_crud.copy_prices(db, copy)
+    return {"priced": priced}
+
 @router.get("/{play_id}/{date_and_time}", response_model=List[stp_schemas.ShowTimePriceResponse])
-def read_prices_for_showtime(play_id: int, date_and_time: datetime, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_prices_for_showtime(play_id: int, date_and_time: datetime, skip: int = 0, limit: int = 100, db: Session = Depends(get_read_db)):
     prices = stp_crud.get_prices_for_showtime(db, showtime_play_id=play_id, showtime_date_and_time=date_and_time, skip=skip, limit=limit)
     return prices
 
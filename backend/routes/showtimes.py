@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 
 from .. import models
 from ..schemas import showtimes as showtime_schemas
 from ..schemas.showtimes import ShowTimeUpdate
 from ..crud import showtimes as showtime_crud
-from ..database import get_db
+from ..crud.aio import showtimes as async_showtime_crud
+from ..database import get_db, get_async_db, get_read_db, ReadSessionLocal
+from ..pagination import parse_cursor, next_cursor_headers
+from ..response_cache import response_cache, serialize
+from ..seat_availability import seat_index
+from ..seat_holds import seat_holds
+from ..seat_events import seat_events, format_sse, KEEPALIVE_SECONDS
 from ..auth.dependencies import get_current_admin_user
 
 router = APIRouter(
@@ -15,6 +25,8 @@ router = APIRouter(
     tags=["showtimes"],
 )
 
+showtime_list_adapter = TypeAdapter(List[showtime_schemas.ShowTimeResponse])
+
 @router.post("/", response_model=showtime_schemas.ShowTimeResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(get_current_admin_user)])
 def create_showtime(showtime: showtime_schemas.ShowTimeCreate, db: Session = Depends(get_db)):
     db_play = db.query(models.Play).filter(models.Play.id == showtime.play_id).first()
@@ -28,13 +40,45 @@ def create_showtime(showtime: showtime_schemas.ShowTimeCreate, db: Session = Dep
     return showtime_crud.create_showtime(db=db, showtime=showtime)
 
 @router.get("/", response_model=List[showtime_schemas.ShowTimeResponse])
-def read_all_showtimes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    showtimes = showtime_crud.get_all_showtimes(db, skip=skip, limit=limit)
-    return showtimes
+async def read_all_showtimes(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    play_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    upcoming: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    # available_seats depends on tickets and seats as well as the showtimes.
+    # upcoming=true also depends on the clock, which no table version tracks,
+    # so those pages aren't cached
+    cached = None if upcoming else response_cache.lookup(request, ("showtimes", "plays", "tickets", "seats"))
+    if cached is not None and cached.response is not None:
+        return cached.response
+
+    after = parse_cursor(cursor, showtime_crud.SHOWTIME_CURSOR_TYPES)
+    filters = showtime_crud.showtime_filters(play_id=play_id, date_from=date_from, date_to=date_to, upcoming=upcoming)
+    showtimes = await async_showtime_crud.get_all_showtimes(db, skip=skip, limit=limit, after=after, filters=filters)
+    body = serialize(showtime_list_adapter, showtimes)
+    headers = next_cursor_headers(showtimes, limit, showtime_crud.showtime_cursor_key)
+    if cached is None:
+        return Response(content=body, media_type="application/json", headers=headers)
+    return cached.store(body, headers)
 
 @router.get("/{play_id}", response_model=List[showtime_schemas.ShowTimeResponse])
-def read_showtimes_for_play(play_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    showtimes = showtime_crud.get_showtimes_for_play(db, play_id=play_id, skip=skip, limit=limit)
+async def read_showtimes_for_play(
+    play_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    upcoming: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    filters = showtime_crud.showtime_filters(date_from=date_from, date_to=date_to, upcoming=upcoming)
+    showtimes = await async_showtime_crud.get_showtimes_for_play(db, play_id=play_id, skip=skip, limit=limit, filters=filters)
     return showtimes
 
 @router.put("/update", response_model=showtime_schemas.ShowTimeResponse, dependencies=[Depends(get_current_admin_user)])
@@ -80,32 +124,69 @@ def delete_showtime(showtime_to_delete: showtime_schemas.ShowTimeDelete, db: Ses
         raise HTTPException(status_code=404, detail="Showtime not found")
     return
 
-@router.get("/{play_id}/{date_and_time}/available-seats")
-def get_available_seats(play_id: int, date_and_time: str, db: Session = Depends(get_db)):
-    # Parse date_and_time
+def _parse_showtime_datetime(date_and_time: str) -> datetime:
     try:
-        dt = datetime.fromisoformat(date_and_time)
+        return datetime.fromisoformat(date_and_time)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid date format. Use ISO format.")
-    
-    # Get all seats from the seats table
-    all_seats = db.query(models.Seat).all()
-    
-    # Get booked seats for this showtime
-    booked = db.query(models.Ticket).filter(
-        models.Ticket.showtime_play_id == play_id,
-        models.Ticket.showtime_date_and_time == dt
-    ).all()
-    booked_set = {(t.row_no, t.seat_no) for t in booked}
-    
-    # Return all seats with booking status
-    seats_with_status = []
-    for seat in all_seats:
-        is_booked = (seat.row_no, seat.seat_no) in booked_set
-        seats_with_status.append({
-            "row_no": seat.row_no,
-            "seat_no": seat.seat_no,
-            "is_booked": is_booked
-        })
-    
+
+def _seat_map_with_holds(db: Session, play_id: int, dt: datetime):
+    # Served from the in-memory bitset index, only hits the DB on a cache miss
+    seats_with_status = seat_index.seat_map(db, play_id=play_id, date_and_time=dt)
+    held = seat_holds.held_seats(play_id, dt)
+    for seat in seats_with_status:
+        seat["is_held"] = (seat["row_no"], seat["seat_no"]) in held
     return seats_with_status
+
+def _showtime_exists(play_id: int, dt: datetime) -> bool:
+    db = ReadSessionLocal()
+    try:
+        return showtime_crud.get_showtime(db, play_id=play_id, date_and_time=dt) is not None
+    finally:
+        db.close()
+
+def _seat_map_snapshot(play_id: int, dt: datetime):
+    db = ReadSessionLocal()
+    try:
+        return _seat_map_with_holds(db, play_id, dt)
+    finally:
+        db.close()
+
+@router.get("/{play_id}/{date_and_time}/available-seats")
+def get_available_seats(play_id: int, date_and_time: str, db: Session = Depends(get_read_db)):
+    return _seat_map_with_holds(db, play_id, _parse_showtime_datetime(date_and_time))
+
+@router.get("/{play_id}/{date_and_time}/seat-events")
+async def stream_seat_events(play_id: int, date_and_time: str, request: Request):
+    """Server-Sent Events: a ``snapshot`` of the seat map, then ``booked``,
+    ``released``, ``held`` and ``unheld`` deltas as they happen. ``resync``
+    means the client should start over from a fresh snapshot."""
+    dt = _parse_showtime_datetime(date_and_time)
+    # A stream stays open until the client leaves, so don't start one for nothing
+    if not await run_in_threadpool(_showtime_exists, play_id, dt):
+        raise HTTPException(status_code=404, detail="Showtime not found")
+    # Subscribe before reading the snapshot so no change can fall in between
+    subscription = seat_events.subscribe(play_id, dt)
+
+    async def events():
+        try:
+            snapshot = await run_in_threadpool(_seat_map_snapshot, play_id, dt)
+            yield format_sse("snapshot", {"seats": snapshot})
+            while True:
+                message = await subscription.get(KEEPALIVE_SECONDS)
+                if message is not None:
+                    yield message
+                    continue
+                if await request.is_disconnected():
+                    break
+                # Holds expire lazily; this pushes out "unheld" for lapsed ones
+                seat_holds.expire_due()
+                yield ": keepalive\n\n"
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from .. import models
 from ..schemas import tickets as ticket_schemas
 from ..crud import tickets as ticket_crud
-from ..database import get_db
+from ..crud.aio import tickets as async_ticket_crud
+from ..database import get_db, get_async_db
+from ..pagination import parse_cursor, set_next_cursor
 from ..auth.dependencies import get_current_user
+from ..seat_holds import seat_holds
 
 router = APIRouter(
     prefix="/tickets",
@@ -14,6 +19,8 @@ router = APIRouter(
     dependencies=[Depends(get_current_user)]  # Protect all ticket routes
 )
 
+MAX_SEATS_PER_BOOKING = 50
+
 @router.post("/", response_model=ticket_schemas.TicketResponse, status_code=status.HTTP_201_CREATED)
 def create_ticket(ticket: ticket_schemas.TicketCreate, db: Session = Depends(get_db), current_user: models.Customer = Depends(get_current_user)):
     # Validate that the seat exists
@@ -41,12 +48,58 @@ def create_ticket(ticket: ticket_schemas.TicketCreate, db: Session = Depends(get
     ).first()
     if existing_ticket:
         raise HTTPException(status_code=400, detail="This seat is already booked for this showtime")
+
+    # Check that nobody else is holding the seat
+    if seat_holds.conflicts(ticket.showtime_play_id, ticket.showtime_date_and_time, [(ticket.row_no, ticket.seat_no)], current_user.id):
+        raise HTTPException(status_code=409, detail="This seat is currently held by another customer")
     
-    return ticket_crud.create_ticket(db=db, ticket=ticket, customer_id=current_user.id)
+    try:
+        return ticket_crud.create_ticket(db=db, ticket=ticket, customer_id=current_user.id)
+    except ticket_crud.SeatsUnavailableError:
+        # Lost a race with a concurrent buyer
+        raise HTTPException(status_code=400, detail="This seat is already booked for this showtime")
+
+@router.post("/batch", response_model=List[ticket_schemas.TicketResponse], status_code=status.HTTP_201_CREATED)
+def create_tickets(booking: ticket_schemas.TicketBatchCreate, db: Session = Depends(get_db), current_user: models.Customer = Depends(get_current_user)):
+    if not booking.seats:
+        raise HTTPException(status_code=400, detail="At least one seat is required")
+    if len(booking.seats) > MAX_SEATS_PER_BOOKING:
+        raise HTTPException(status_code=400, detail=f"A booking may not exceed {MAX_SEATS_PER_BOOKING} seats")
+
+    # Validate that the showtime exists
+    db_showtime = db.query(models.ShowTime).filter(
+        models.ShowTime.play_id == booking.showtime_play_id,
+        models.ShowTime.date_and_time == booking.showtime_date_and_time
+    ).first()
+    if not db_showtime:
+        raise HTTPException(status_code=404, detail="Showtime does not exist")
+
+    # Validate that every seat exists, in one query
+    requested = {(seat.row_no, seat.seat_no) for seat in booking.seats}
+    found = db.query(models.Seat.row_no, models.Seat.seat_no).filter(
+        tuple_(models.Seat.row_no, models.Seat.seat_no).in_(list(requested))
+    ).all()
+    missing = requested - {(row_no, seat_no) for row_no, seat_no in found}
+    if missing:
+        seats = ", ".join(f"Row {r}, Seat {s}" for r, s in sorted(missing))
+        raise HTTPException(status_code=404, detail=f"The following seats do not exist: {seats}")
+
+    held = seat_holds.conflicts(booking.showtime_play_id, booking.showtime_date_and_time, requested, current_user.id)
+    if held:
+        seats = ", ".join(f"Row {r} Seat {s}" for r, s in sorted(held))
+        raise HTTPException(status_code=409, detail=f"The following seats are currently held by another customer: {seats}")
+
+    # All-or-nothing: either every seat is booked or none is
+    try:
+        return ticket_crud.create_tickets(db=db, booking=booking, customer_id=current_user.id)
+    except ticket_crud.SeatsUnavailableError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 @router.get("/", response_model=List[ticket_schemas.TicketResponse])
-def read_user_tickets(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: models.Customer = Depends(get_current_user)):
-    tickets = ticket_crud.get_tickets_by_customer(db, customer_id=current_user.id, skip=skip, limit=limit)
+async def read_user_tickets(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db), current_user: models.Customer = Depends(get_current_user)):
+    after = parse_cursor(cursor, ticket_crud.TICKET_CURSOR_TYPES)
+    tickets = await async_ticket_crud.get_tickets_by_customer(db, customer_id=current_user.id, skip=skip, limit=limit, after=after)
+    set_next_cursor(response, tickets, limit, ticket_crud.ticket_cursor_key)
     return tickets
 
 @router.delete("/", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import List, Optional
+from .seats import SeatBase
+
+class SeatHoldCreate(BaseModel):
+    showtime_date_and_time: datetime
+    showtime_play_id: int
+    seats: List[SeatBase]
+    # Capped at MAX_HOLD_TTL_SECONDS; omit it for the default
+    ttl_seconds: Optional[int] = Field(None, gt=0)
+
+class SeatHoldResponse(BaseModel):
+    hold_id: str
+    showtime_date_and_time: datetime
+    showtime_play_id: int
+    seats: List[SeatBase]
+    expires_in: int
@@ -0,0 +1,35 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from .plays import PlayBase
+from .actors import ActorBase
+from .directors import DirectorBase
+
+# Entity rows may carry an explicit id so that cast/crew files imported
+# alongside them can refer to it
+
+class PlayImportRow(PlayBase):
+    id: Optional[int] = None
+
+class ActorImportRow(ActorBase):
+    id: Optional[int] = None
+
+class DirectorImportRow(DirectorBase):
+    id: Optional[int] = None
+
+class CastImportRow(BaseModel):
+    actor_id: int
+    play_id: int
+
+class CrewImportRow(BaseModel):
+    director_id: int
+    play_id: int
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+class ImportResult(BaseModel):
+    entity: str
+    inserted: int = 0
+    skipped: int = 0
+    errors: List[ImportRowError] = []
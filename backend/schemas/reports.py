@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+class SalesFigures(BaseModel):
+    tickets_sold: int
+    revenue: Decimal
+    capacity: int
+    occupancy: float
+
+class ShowTimeReport(SalesFigures):
+    play_id: int
+    play_title: Optional[str]
+    date_and_time: datetime
+
+class PlayReport(SalesFigures):
+    play_id: int
+    play_title: Optional[str]
+    showtimes: int
+
+class DayReport(SalesFigures):
+    day: date
+    showtimes: int
+
+class SalesRebuildResult(BaseModel):
+    showtimes: int
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+
+SearchKind = Literal["play", "actor", "director"]
+
+class SearchResult(BaseModel):
+    kind: SearchKind
+    id: int
+    name: str
+    snippet: Optional[str] = None
+    score: float
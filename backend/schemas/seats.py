@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import List
 
 class SeatBase(BaseModel):
     row_no: int
@@ -14,3 +15,17 @@ class SeatResponse(SeatBase):
 class SeatDelete(BaseModel):
     row_no: int
     seat_no: int
+
+class SeatRowRange(BaseModel):
+    start_row: int
+    end_row: int
+    seats_per_row: int
+    first_seat_no: int = 1
+
+class SeatBulkCreate(BaseModel):
+    seats: List[SeatBase] = []
+    row_ranges: List[SeatRowRange] = []
+
+class SeatBulkResult(BaseModel):
+    created: int
+    skipped: int
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
 from decimal import Decimal
+from typing import List, Optional
 
 class ShowTimePriceBase(BaseModel):
     row_no: int
@@ -18,3 +19,28 @@ class ShowTimePriceResponse(ShowTimePriceBase):
 
 class ShowTimePriceUpdate(BaseModel):
     price: Decimal
+
+class PriceTier(BaseModel):
+    start_row: int
+    end_row: int
+    first_seat_no: Optional[int] = None
+    last_seat_no: Optional[int] = None
+    price: Decimal
+
+class ShowTimeKey(BaseModel):
+    showtime_play_id: int
+    showtime_date_and_time: datetime
+
+class ShowTimePriceTiersCreate(ShowTimeKey):
+    # Tiers are matched in order, the first tier covering a seat sets its price
+    tiers: List[PriceTier] = []
+    default_price: Optional[Decimal] = None
+    overwrite: bool = False
+
+class ShowTimePriceCopy(BaseModel):
+    source: ShowTimeKey
+    targets: List[ShowTimeKey]
+    overwrite: bool = False
+
+class ShowTimePriceBulkResult(BaseModel):
+    priced: int
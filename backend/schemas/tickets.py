@@ -1,6 +1,7 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
+from .seats import SeatBase
 
 # Base schema with all identifying fields for a ticket
 class TicketBase(BaseModel):
@@ -24,3 +25,9 @@ class TicketResponse(TicketBase):
 # Schema for deleting a ticket. User provides the identifying info.
 class TicketDelete(TicketBase):
     pass
+
+# Schema for booking several seats of one showtime in a single request
+class TicketBatchCreate(BaseModel):
+    showtime_date_and_time: datetime
+    showtime_play_id: int
+    seats: List[SeatBase]
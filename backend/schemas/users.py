@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import Literal, Optional
 
 # Shared properties
 class UserBase(BaseModel):
@@ -19,6 +19,10 @@ class UserResponse(UserBase):
     class Config:
         from_attributes = True
 
+# Role change by an admin
+class UserRoleUpdate(BaseModel):
+    role: Literal["customer", "admin"]
+
 # Token Schemas
 class Token(BaseModel):
     access_token: str
@@ -0,0 +1,86 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+# One FTS5 table indexes plays, actors and directors. Each document's rowid is
+# derived from the source row (id * 4 + kind code), so the sync triggers
+# update and delete by rowid instead of scanning the index.
+SEARCH_TABLE = "search_index"
+KIND_CODES = {"play": 1, "actor": 2, "director": 3}
+
+# (source table, kind, name expression, details expression)
+_SOURCES = (
+    ("plays", "play", "{row}.title", "coalesce({row}.genre, '') || ' ' || coalesce({row}.synopsis, '')"),
+    ("actors", "actor", "{row}.name", "''"),
+    ("directors", "director", "{row}.name", "''"),
+)
+
+CREATE_SEARCH_TABLE = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+    kind UNINDEXED,
+    ref_id UNINDEXED,
+    name,
+    details,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+
+def _insert_sql(kind: str, name: str, details: str, row: str, source: str = "") -> str:
+    code = KIND_CODES[kind]
+    return (
+        f"INSERT INTO {SEARCH_TABLE} (rowid, kind, ref_id, name, details) "
+        f"SELECT {row}.id * 4 + {code}, '{kind}', {row}.id, "
+        f"coalesce({name.format(row=row)}, ''), {details.format(row=row)}{source}"
+    )
+
+
+def _trigger_statements():
+    for table, kind, name, details in _SOURCES:
+        code = KIND_CODES[kind]
+        insert_new = _insert_sql(kind, name, details, "new")
+        delete_old = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 4 + {code}"
+        yield f"CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} BEGIN {insert_new}; END"
+        yield f"CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} BEGIN {delete_old}; END"
+        yield f"CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE ON {table} BEGIN {delete_old}; {insert_new}; END"
+
+
+def _populate_statements():
+    for table, kind, name, details in _SOURCES:
+        yield _insert_sql(kind, name, details, table, f" FROM {table}")
+
+
+def ensure_search_index(engine: Engine):
+    """Create the search table and its sync triggers, indexing existing rows on first run."""
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": SEARCH_TABLE}
+        ).first()
+        conn.execute(text(CREATE_SEARCH_TABLE))
+        for statement in _trigger_statements():
+            conn.execute(text(statement))
+        if not exists:
+            for statement in _populate_statements():
+                conn.execute(text(statement))
+
+
+def rebuild_search_index(engine: Engine):
+    """Re-index every play, actor and director from scratch."""
+    with engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+        for statement in _populate_statements():
+            conn.execute(text(statement))
+        conn.execute(text(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')"))
+
+
+if __name__ == "__main__":
+    import argparse
+    from .database import engine
+
+    parser = argparse.ArgumentParser(description="Maintain the full-text search index.")
+    parser.add_argument("--rebuild", action="store_true", help="re-index every play, actor and director, e.g. after rows were changed with the triggers missing")
+    args = parser.parse_args()
+    ensure_search_index(engine)
+    if args.rebuild:
+        rebuild_search_index(engine)
+        print("Rebuilt the search index")
@@ -0,0 +1,160 @@
+from collections import OrderedDict
+from datetime import datetime
+from threading import RLock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from . import models
+from .cache_sync import cache_sync
+
+ShowTimeKey = Tuple[int, datetime]
+SeatKey = Tuple[int, int]
+
+# Upper bound on the number of showtimes kept in memory at once
+MAX_CACHED_SHOWTIMES = 4096
+
+
+class SeatLayout:
+    """Fixed ordering of the hall's seats, mapping each (row, seat) to a bit position."""
+
+    def __init__(self, seats: Iterable[SeatKey]):
+        self.seats: List[SeatKey] = sorted(seats)
+        self.positions: Dict[SeatKey, int] = {seat: i for i, seat in enumerate(self.seats)}
+
+    def new_bitset(self) -> bytearray:
+        return bytearray((len(self.seats) + 7) // 8)
+
+
+class SeatAvailabilityIndex:
+    """In-process index holding one booked-seat bitset per showtime.
+
+    Bitsets are built lazily from the database on first access and then kept
+    current by the ticket CRUD functions, so reading a seat map does not need
+    to load any ORM objects.
+    """
+
+    def __init__(self, max_showtimes: int = MAX_CACHED_SHOWTIMES):
+        self.max_showtimes = max_showtimes
+        self._lock = RLock()
+        self._layout: Optional[SeatLayout] = None
+        self._bitsets: "OrderedDict[ShowTimeKey, bytearray]" = OrderedDict()
+
+    # --- Loading ---
+    def _get_layout(self, db: Session) -> SeatLayout:
+        if self._layout is None:
+            rows = db.query(models.Seat.row_no, models.Seat.seat_no).all()
+            self._layout = SeatLayout((row_no, seat_no) for row_no, seat_no in rows)
+        return self._layout
+
+    def _load_bitset(self, db: Session, layout: SeatLayout, key: ShowTimeKey) -> bytearray:
+        play_id, date_and_time = key
+        booked = db.query(models.Ticket.row_no, models.Ticket.seat_no).filter(
+            models.Ticket.showtime_play_id == play_id,
+            models.Ticket.showtime_date_and_time == date_and_time
+        ).all()
+        bits = layout.new_bitset()
+        for row_no, seat_no in booked:
+            pos = layout.positions.get((row_no, seat_no))
+            if pos is not None:
+                bits[pos >> 3] |= 1 << (pos & 7)
+        return bits
+
+    def _get_bitset(self, db: Session, key: ShowTimeKey) -> Tuple[SeatLayout, bytearray]:
+        layout = self._get_layout(db)
+        bits = self._bitsets.get(key)
+        if bits is None:
+            bits = self._load_bitset(db, layout, key)
+            self._bitsets[key] = bits
+            if len(self._bitsets) > self.max_showtimes:
+                self._bitsets.popitem(last=False)
+        else:
+            self._bitsets.move_to_end(key)
+        return layout, bits
+
+    # --- Queries ---
+    def seat_map(self, db: Session, play_id: int, date_and_time: datetime) -> List[dict]:
+        with self._lock:
+            layout, bits = self._get_bitset(db, (play_id, date_and_time))
+            return [
+                {
+                    "row_no": row_no,
+                    "seat_no": seat_no,
+                    "is_booked": bool(bits[pos >> 3] & (1 << (pos & 7)))
+                }
+                for pos, (row_no, seat_no) in enumerate(layout.seats)
+            ]
+
+    def is_booked(self, db: Session, play_id: int, date_and_time: datetime, row_no: int, seat_no: int) -> bool:
+        with self._lock:
+            layout, bits = self._get_bitset(db, (play_id, date_and_time))
+            pos = layout.positions.get((row_no, seat_no))
+            if pos is None:
+                return False
+            return bool(bits[pos >> 3] & (1 << (pos & 7)))
+
+    # --- Incremental updates ---
+    def _set(self, play_id: int, date_and_time: datetime, row_no: int, seat_no: int, booked: bool):
+        with self._lock:
+            bits = self._bitsets.get((play_id, date_and_time))
+            if bits is None or self._layout is None:
+                # Not loaded yet, the next read will build it from the database
+                return
+            pos = self._layout.positions.get((row_no, seat_no))
+            if pos is None:
+                return
+            if booked:
+                bits[pos >> 3] |= 1 << (pos & 7)
+            else:
+                bits[pos >> 3] &= ~(1 << (pos & 7)) & 0xFF
+
+    def mark_booked(self, play_id: int, date_and_time: datetime, row_no: int, seat_no: int):
+        self._set(play_id, date_and_time, row_no, seat_no, True)
+        cache_sync.publish("seat_index", ["booked", play_id, date_and_time.isoformat(), row_no, seat_no])
+
+    def mark_released(self, play_id: int, date_and_time: datetime, row_no: int, seat_no: int):
+        self._set(play_id, date_and_time, row_no, seat_no, False)
+        cache_sync.publish("seat_index", ["released", play_id, date_and_time.isoformat(), row_no, seat_no])
+
+    # --- Invalidation ---
+    def invalidate_showtime(self, play_id: int, date_and_time: datetime):
+        self._drop_showtime(play_id, date_and_time)
+        cache_sync.publish("seat_index", ["showtime", play_id, date_and_time.isoformat()])
+
+    def invalidate_play(self, play_id: int):
+        self._drop_play(play_id)
+        cache_sync.publish("seat_index", ["play", play_id])
+
+    def invalidate_layout(self):
+        self.clear()
+        cache_sync.publish("seat_index", ["layout"])
+
+    def _drop_showtime(self, play_id: int, date_and_time: datetime):
+        with self._lock:
+            self._bitsets.pop((play_id, date_and_time), None)
+
+    def _drop_play(self, play_id: int):
+        with self._lock:
+            for key in [k for k in self._bitsets if k[0] == play_id]:
+                del self._bitsets[key]
+
+    def clear(self):
+        with self._lock:
+            self._layout = None
+            self._bitsets.clear()
+
+    # --- Changes made by other processes ---
+    def apply_remote(self, change: list):
+        kind, *args = change
+        if kind in ("booked", "released"):
+            play_id, date_and_time, row_no, seat_no = args
+            self._set(play_id, datetime.fromisoformat(date_and_time), row_no, seat_no, kind == "booked")
+        elif kind == "showtime":
+            self._drop_showtime(args[0], datetime.fromisoformat(args[1]))
+        elif kind == "play":
+            self._drop_play(args[0])
+        else:
+            self.clear()
+
+
+seat_index = SeatAvailabilityIndex()
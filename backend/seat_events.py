@@ -0,0 +1,149 @@
+import asyncio
+import json
+from collections import defaultdict
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from .cache_sync import cache_sync
+
+ShowTimeKey = Tuple[int, datetime]
+
+# --- Configuration ---
+SUBSCRIBER_QUEUE_SIZE = 256
+KEEPALIVE_SECONDS = 15
+
+
+def format_sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class SeatSubscription:
+    def __init__(self, hub: "SeatEventHub", showtime: ShowTimeKey, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.hub = hub
+        self.showtime = showtime
+        self.loop = loop
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=queue_size)
+
+    def deliver(self, message: str):
+        # A subscriber that can't keep up loses its backlog and is told to
+        # refetch the seat map, so a slow client never holds up the others
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(format_sse("resync", {}))
+            self.hub.dropped += 1
+
+    async def get(self, timeout: float) -> Optional[str]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+
+def _deliver_all(subscriptions, message: str):
+    for subscription in subscriptions:
+        subscription.deliver(message)
+
+
+class SeatEventHub:
+    """In-process fan-out of seat state changes to per-showtime subscribers.
+
+    Writers call ``publish`` from any thread. Each event is serialised once
+    and handed to each subscriber event loop in a single callback, however
+    many seat maps are open on it.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self._queue_size = queue_size
+        self._lock = Lock()
+        self._subscriptions: Dict[ShowTimeKey, Set[SeatSubscription]] = {}
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, play_id: int, date_and_time: datetime) -> SeatSubscription:
+        subscription = SeatSubscription(self, (play_id, date_and_time), asyncio.get_running_loop(), self._queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(subscription.showtime, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: SeatSubscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.showtime)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.showtime]
+
+    def _dispatch(self, subscriptions: Iterable[SeatSubscription], message: str):
+        by_loop = defaultdict(list)
+        for subscription in subscriptions:
+            by_loop[subscription.loop].append(subscription)
+        for loop, targets in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_deliver_all, targets, message)
+            except RuntimeError:
+                # The loop has shut down; its subscribers are gone with it
+                pass
+        self.published += 1
+
+    def publish(self, play_id: int, date_and_time: datetime, event: str, seats: Iterable[Tuple[int, int]] = ()):
+        seats = sorted([row_no, seat_no] for row_no, seat_no in seats)
+        self._publish(play_id, date_and_time, event, seats)
+        # Seat maps open on other workers hear about it too
+        cache_sync.publish("seat_events", ["publish", play_id, date_and_time.isoformat(), event, seats])
+
+    def _publish(self, play_id: int, date_and_time: datetime, event: str, seats: list):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get((play_id, date_and_time), ()))
+        if subscriptions:
+            self._dispatch(subscriptions, format_sse(event, {"seats": seats}))
+
+    def resync(self, play_id: Optional[int] = None, date_and_time: Optional[datetime] = None):
+        """Tell subscribers to refetch the whole seat map: of one showtime, every showtime of a play, or everyone."""
+        self._resync(play_id, date_and_time)
+        cache_sync.publish("seat_events", ["resync", play_id, date_and_time.isoformat() if date_and_time else None])
+
+    def apply_remote(self, change: list):
+        if change[0] == "publish":
+            _, play_id, date_and_time, event, seats = change
+            self._publish(play_id, datetime.fromisoformat(date_and_time), event, seats)
+        else:
+            _, play_id, date_and_time = change
+            self._resync(play_id, datetime.fromisoformat(date_and_time) if date_and_time else None)
+
+    def reset(self):
+        """Resync every open seat map without telling the other processes."""
+        self._resync(None, None)
+
+    def _resync(self, play_id: Optional[int], date_and_time: Optional[datetime]):
+        with self._lock:
+            subscriptions = [
+                subscription
+                for (key_play_id, key_date_and_time), group in self._subscriptions.items()
+                if play_id is None or (key_play_id == play_id and date_and_time in (None, key_date_and_time))
+                for subscription in group
+            ]
+        if subscriptions:
+            self._dispatch(subscriptions, format_sse("resync", {}))
+
+    def hold_changed(self, play_id: int, date_and_time: datetime, held: bool, seats):
+        # Every process tracks every hold (see seat_holds) and tells only its own subscribers
+        self._publish(play_id, date_and_time, "held" if held else "unheld", sorted([row_no, seat_no] for row_no, seat_no in seats))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "showtimes": len(self._subscriptions),
+                "subscribers": sum(len(group) for group in self._subscriptions.values()),
+                "published": self.published,
+                "dropped": self.dropped,
+            }
+
+
+seat_events = SeatEventHub()
@@ -0,0 +1,227 @@
+import heapq
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from threading import RLock
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .cache_sync import cache_sync
+
+ShowTimeKey = Tuple[int, datetime]
+SeatKey = Tuple[int, int]
+
+# --- Configuration ---
+HOLD_TTL_SECONDS = 300
+MAX_HOLD_TTL_SECONDS = 900
+
+
+@dataclass
+class SeatHold:
+    hold_id: str
+    customer_id: int
+    play_id: int
+    date_and_time: datetime
+    seats: FrozenSet[SeatKey]
+    expires_at: float
+    # Wall-clock creation time, which decides between overlapping holds
+    # granted by different worker processes
+    created_at: float = 0.0
+    # Made through another worker process and relayed to this one
+    remote: bool = False
+
+    @property
+    def showtime(self) -> ShowTimeKey:
+        return (self.play_id, self.date_and_time)
+
+
+class SeatsHeldError(ValueError):
+    def __init__(self, seats):
+        self.seats = sorted(seats)
+        super().__init__("The following seats are currently held by another customer: " + ", ".join(f"Row {r} Seat {s}" for r, s in self.seats))
+
+
+class SeatHoldManager:
+    """Time-limited seat holds kept entirely in memory.
+
+    Expiry times sit in a min-heap; every call first pops the holds whose
+    deadline has passed, so releasing them never needs a timer thread or a
+    database query.
+
+    Holds made and released here are relayed to the other worker processes
+    over ``cache_sync``, so every process knows every hold. A relayed hold
+    carries its deadline and each process expires it on its own. When two
+    processes grant overlapping holds to different customers before hearing
+    of each other's, every process keeps the one created first.
+
+    Both of those compare wall-clock times taken in different processes, so
+    they assume the workers' clocks agree. Workers on one host share a clock;
+    workers on several hosts need them synchronised (NTP), since a skewed
+    clock shifts relayed deadlines and can make a later hold win an overlap.
+    """
+
+    def __init__(self, clock=time.monotonic, wall_clock=time.time):
+        self._clock = clock
+        # Only for what crosses process boundaries: creation times and deadlines
+        self._wall_clock = wall_clock
+        self._lock = RLock()
+        self._holds: Dict[str, SeatHold] = {}
+        self._held: Dict[ShowTimeKey, Dict[SeatKey, str]] = {}
+        self._expiry: List[Tuple[float, str]] = []
+        self._listeners: List[Callable] = []
+
+    def add_listener(self, callback: Callable):
+        """Register ``callback(play_id, date_and_time, held, seats)`` for seats being held or let go."""
+        self._listeners.append(callback)
+
+    def _notify(self, play_id: int, date_and_time: datetime, held: bool, seats):
+        if seats:
+            for callback in self._listeners:
+                callback(play_id, date_and_time, held, seats)
+
+    def _release(self, hold: SeatHold):
+        self._holds.pop(hold.hold_id, None)
+        held = self._held.get(hold.showtime)
+        released = []
+        if held is not None:
+            for seat in hold.seats:
+                if held.get(seat) == hold.hold_id:
+                    del held[seat]
+                    released.append(seat)
+            if not held:
+                del self._held[hold.showtime]
+        self._notify(hold.play_id, hold.date_and_time, False, released)
+
+    def _add(self, hold: SeatHold):
+        held = self._held.setdefault(hold.showtime, {})
+        # A customer re-holding a seat takes it over from their older hold
+        for seat in hold.seats:
+            previous = self._holds.get(held.get(seat))
+            if previous is not None:
+                previous.seats = previous.seats - {seat}
+                if not previous.seats:
+                    del self._holds[previous.hold_id]
+            held[seat] = hold.hold_id
+        self._holds[hold.hold_id] = hold
+        heapq.heappush(self._expiry, (hold.expires_at, hold.hold_id))
+        self._notify(hold.play_id, hold.date_and_time, True, hold.seats)
+
+    def _expire(self):
+        now = self._clock()
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, hold_id = heapq.heappop(self._expiry)
+            hold = self._holds.get(hold_id)
+            # Skip heap entries left behind by holds that were already released
+            if hold is not None and hold.expires_at == expires_at:
+                self._release(hold)
+
+    # --- Queries ---
+    def get_hold(self, hold_id: str) -> Optional[SeatHold]:
+        with self._lock:
+            self._expire()
+            return self._holds.get(hold_id)
+
+    def holds_for_customer(self, customer_id: int) -> List[SeatHold]:
+        with self._lock:
+            self._expire()
+            return [hold for hold in self._holds.values() if hold.customer_id == customer_id]
+
+    def held_seats(self, play_id: int, date_and_time: datetime) -> Set[SeatKey]:
+        with self._lock:
+            self._expire()
+            return set(self._held.get((play_id, date_and_time), ()))
+
+    def conflicts(self, play_id: int, date_and_time: datetime, seats, customer_id: int) -> Set[SeatKey]:
+        """Seats in ``seats`` held by someone other than ``customer_id``."""
+        with self._lock:
+            self._expire()
+            held = self._held.get((play_id, date_and_time), {})
+            return {
+                seat for seat in seats
+                if seat in held and self._holds[held[seat]].customer_id != customer_id
+            }
+
+    # --- Commands ---
+    def create_hold(self, customer_id: int, play_id: int, date_and_time: datetime, seats, ttl_seconds: int = HOLD_TTL_SECONDS) -> SeatHold:
+        seats = frozenset(seats)
+        ttl_seconds = min(ttl_seconds, MAX_HOLD_TTL_SECONDS)
+        with self._lock:
+            taken = self.conflicts(play_id, date_and_time, seats, customer_id)
+            if taken:
+                raise SeatsHeldError(taken)
+
+            hold = SeatHold(
+                hold_id=uuid.uuid4().hex,
+                customer_id=customer_id,
+                play_id=play_id,
+                date_and_time=date_and_time,
+                seats=seats,
+                expires_at=self._clock() + ttl_seconds,
+                created_at=self._wall_clock(),
+            )
+            self._add(hold)
+        cache_sync.publish("seat_holds", [
+            "hold", hold.hold_id, customer_id, play_id, date_and_time.isoformat(),
+            sorted([row_no, seat_no] for row_no, seat_no in seats), hold.created_at, hold.created_at + ttl_seconds,
+        ])
+        return hold
+
+    def expire_due(self):
+        """Release holds whose deadline has passed without waiting for the next lookup."""
+        with self._lock:
+            self._expire()
+
+    def release_hold(self, hold_id: str) -> Optional[SeatHold]:
+        with self._lock:
+            self._expire()
+            hold = self._holds.get(hold_id)
+            if hold is not None:
+                self._release(hold)
+        if hold is not None:
+            cache_sync.publish("seat_holds", ["release", hold_id])
+        return hold
+
+    # --- Changes made by other processes ---
+    def apply_remote(self, change: list):
+        kind, *args = change
+        with self._lock:
+            self._expire()
+            if kind == "release":
+                hold = self._holds.get(args[0])
+                if hold is not None:
+                    self._release(hold)
+                return
+            hold_id, customer_id, play_id, date_and_time, seats, created_at, deadline = args
+            ttl_seconds = deadline - self._wall_clock()
+            if ttl_seconds <= 0 or hold_id in self._holds:
+                return
+            hold = SeatHold(
+                hold_id=hold_id,
+                customer_id=customer_id,
+                play_id=play_id,
+                date_and_time=datetime.fromisoformat(date_and_time),
+                seats=frozenset((row_no, seat_no) for row_no, seat_no in seats),
+                expires_at=self._clock() + ttl_seconds,
+                created_at=created_at,
+                remote=True,
+            )
+            held = self._held.get(hold.showtime, {})
+            rivals = [self._holds[rival_id] for rival_id in {held[seat] for seat in hold.seats if seat in held}]
+            rivals = [rival for rival in rivals if rival.customer_id != customer_id]
+            if any((rival.created_at, rival.hold_id) < (created_at, hold_id) for rival in rivals):
+                return
+            for rival in rivals:
+                self._release(rival)
+            self._add(hold)
+
+    def drop_remote(self):
+        """Forget the holds relayed from other processes, whose releases this one may have missed."""
+        with self._lock:
+            for hold in [hold for hold in self._holds.values() if hold.remote]:
+                self._release(hold)
+
+    def seconds_left(self, hold: SeatHold) -> int:
+        return max(0, int(hold.expires_at - self._clock()))
+
+
+seat_holds = SeatHoldManager()
@@ -0,0 +1,458 @@
+"""Load-test the booking flow and record latency, throughput and seat contention.
+
+Drives the API either in-process (httpx ASGI transport) or over HTTP against a
+uvicorn/gunicorn server started for the run. Every run gets a fresh SQLite
+database seeded with plays, showtimes and seats; virtual users then register,
+log in and loop over a scenario until the duration is up.
+
+Scenarios:
+    browse        list plays and showtimes, open a play and a seat map
+    book          browse, open a seat map and book a seat with POST /tickets/
+    hold-confirm  browse, hold two adjacent seats and confirm the hold
+
+Usage:
+    python -m benchmarks.load_test --scenario book --users 50 --duration 30
+    python -m benchmarks.load_test --target uvicorn --workers 1 --output results.json
+    python -m benchmarks.load_test --compare benchmarks/results/<earlier run>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import secrets
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+SCENARIOS = ("browse", "book", "hold-confirm")
+TARGETS = ("inprocess", "uvicorn", "gunicorn")
+
+PASSWORD = "load-test-password"
+ADMIN_EMAIL = "load-test-admin@example.com"
+LOGIN_ATTEMPTS = 20
+# Booking responses that mean "someone else got there first"
+CONFLICT_STATUSES = (400, 409)
+
+# Server-side series read from /metrics before and after the run, with a
+# token made up for the run (the endpoint is off without one)
+METRICS_TOKEN = secrets.token_urlsafe(16)
+_METRIC_LINE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})?\s+(\S+)$')
+
+
+# --- Targets ---
+@asynccontextmanager
+async def inprocess_client(database_url: str):
+    # The backend reads its configuration at import time
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ["METRICS_TOKEN"] = METRICS_TOKEN
+    from backend.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=60) as client:
+            yield client
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _server_command(target: str, port: int, workers: int):
+    if target == "uvicorn":
+        return [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1",
+                "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    return [sys.executable, "-m", "gunicorn", "backend.main:app", "-k", "uvicorn.workers.UvicornWorker",
+            "-b", f"127.0.0.1:{port}", "-w", str(workers), "--log-level", "warning"]
+
+
+@asynccontextmanager
+async def server_client(target: str, database_url: str, workers: int):
+    port = _free_port()
+    env = {**os.environ, "DATABASE_URL": database_url, "METRICS_TOKEN": METRICS_TOKEN}
+    env.pop("ASYNC_DATABASE_URL", None)
+    # Migrate once up front, the workers would otherwise race each other to it
+    subprocess.run([sys.executable, "-m", "backend.migrate"], cwd=REPO_ROOT, env=env, check=True)
+    env["MIGRATE_ON_STARTUP"] = "0"
+    process = subprocess.Popen(_server_command(target, port, workers), cwd=REPO_ROOT, env=env)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60, limits=limits) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f"{target} exited with status {process.returncode}")
+                try:
+                    await client.get("/plays/")
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline:
+                        raise RuntimeError(f"{target} did not start listening on port {port}")
+                    await asyncio.sleep(0.2)
+            yield client
+    finally:
+        process.terminate()
+        process.wait(10)
+
+
+# --- Recording ---
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)  # name -> [(seconds, status)]
+        self.booking = {"attempts": 0, "booked": 0, "conflicts": 0, "failed": 0}
+        self.recording = True
+
+    async def request(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            status = response.status_code
+        except httpx.TransportError:
+            response, status = None, 0
+        if self.recording:
+            self.samples[name].append((time.perf_counter() - started, status))
+        return response
+
+    def booking_outcome(self, response, seats: int = 1):
+        if not self.recording:
+            return
+        self.booking["attempts"] += seats
+        if response is not None and response.status_code == 201:
+            self.booking["booked"] += seats
+        elif response is not None and response.status_code in CONFLICT_STATUSES:
+            self.booking["conflicts"] += seats
+        else:
+            self.booking["failed"] += seats
+
+
+def percentile(sorted_values, q: float) -> float:
+    # Nearest-rank percentile
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(q / 100 * len(sorted_values) + 0.5 - 1e-9))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def latency_summary(samples):
+    latencies = sorted(seconds for seconds, _ in samples)
+    statuses = defaultdict(int)
+    for _, status in samples:
+        statuses[str(status)] += 1
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+def parse_metrics(text: str) -> dict:
+    series = {}
+    for line in text.splitlines():
+        match = _METRIC_LINE.match(line)
+        if match:
+            series[match.group(1) + (match.group(2) or "")] = float(match.group(3))
+    return series
+
+
+async def scrape_metrics(client: httpx.AsyncClient) -> dict:
+    try:
+        response = await client.get("/metrics", headers={"Authorization": f"Bearer {METRICS_TOKEN}"})
+    except httpx.TransportError:
+        return {}
+    return parse_metrics(response.text) if response.status_code == 200 else {}
+
+
+def lock_summary(before: dict, after: dict) -> dict:
+    """SQLite lock contention on the write engine, from the server's /metrics.
+
+    Write statements wait on SQLite's busy handler while another connection
+    holds the write lock, so their time is the closest measure of lock waits
+    the server exposes; statements that gave up count as lock errors.
+    """
+    def delta(name):
+        return after.get(name, 0.0) - before.get(name, 0.0)
+
+    writes = delta('db_write_duration_seconds_count{engine="write"}') + delta('db_write_duration_seconds_count{engine="async"}')
+    write_seconds = delta('db_write_duration_seconds_sum{engine="write"}') + delta('db_write_duration_seconds_sum{engine="async"}')
+    slow_writes = sum(
+        delta(f'db_write_duration_seconds_count{{engine="{engine}"}}') - delta(f'db_write_duration_seconds_bucket{{engine="{engine}",le="0.01"}}')
+        for engine in ("write", "async")
+    )
+    return {
+        "write_statements": int(writes),
+        "write_seconds": round(write_seconds, 4),
+        "mean_write_ms": round(write_seconds / writes * 1000, 3) if writes else 0.0,
+        "writes_over_10ms": int(slow_writes),
+        "lock_errors": int(sum(delta(f'db_lock_errors_total{{engine="{engine}"}}') for engine in ("write", "read", "async"))),
+    }
+
+
+# --- Scenario steps ---
+class VirtualUser:
+    def __init__(self, number: int, client: httpx.AsyncClient, recorder: Recorder, catalogue, rng: random.Random):
+        self.email = f"load-test-user-{number}@example.com"
+        self.client = client
+        self.recorder = recorder
+        self.catalogue = catalogue
+        self.rng = rng
+        self.headers = {}
+
+    def request(self, name, method, url, **kwargs):
+        return self.recorder.request(self.client, name, method, url, headers=self.headers, **kwargs)
+
+    async def retrying(self, name, method, url, **kwargs):
+        # Password hashing sheds load with 503 + Retry-After; a real client waits and retries
+        for _ in range(LOGIN_ATTEMPTS):
+            response = await self.request(name, method, url, **kwargs)
+            if response is None or response.status_code != 503:
+                return response
+            await asyncio.sleep(float(response.headers.get("Retry-After", 1)) * (0.5 + self.rng.random()))
+        return response
+
+    async def login(self):
+        await self.retrying("POST /users/register", "POST", "/users/register",
+                            json={"email": self.email, "name": "Load Test", "password": PASSWORD})
+        response = await self.retrying("POST /token", "POST", "/token", data={"username": self.email, "password": PASSWORD})
+        if response is None or response.status_code != 200:
+            raise RuntimeError(f"login failed for {self.email}: {response.status_code if response is not None else 'no response'}")
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def browse(self):
+        play_id, date_and_time = self.rng.choice(self.catalogue)
+        await self.request("GET /plays/", "GET", "/plays/")
+        await self.request("GET /showtimes/", "GET", "/showtimes/")
+        await self.request("GET /plays/{play_id}", "GET", f"/plays/{play_id}")
+        await self.request("GET /showtimes/{play_id}", "GET", f"/showtimes/{play_id}")
+        return play_id, date_and_time
+
+    async def open_seat_map(self, play_id, date_and_time):
+        response = await self.request("GET available-seats", "GET", f"/showtimes/{play_id}/{date_and_time}/available-seats")
+        if response is None or response.status_code != 200:
+            return []
+        return [seat for seat in response.json() if not seat["is_booked"] and not seat["is_held"]]
+
+    def pick_seats(self, free_seats, count: int = 1):
+        # Most buyers go for the front rows, so contention concentrates there
+        ordered = sorted(free_seats, key=lambda seat: (seat["row_no"], seat["seat_no"]))
+        pool = ordered[:max(count, len(ordered) // 4)] if self.rng.random() < 0.7 else ordered
+        start = self.rng.randrange(max(1, len(pool) - count + 1))
+        return [{"row_no": seat["row_no"], "seat_no": seat["seat_no"]} for seat in pool[start:start + count]]
+
+    async def scenario_browse(self):
+        play_id, date_and_time = await self.browse()
+        await self.open_seat_map(play_id, date_and_time)
+
+    async def scenario_book(self):
+        play_id, date_and_time = await self.browse()
+        free_seats = await self.open_seat_map(play_id, date_and_time)
+        if not free_seats:
+            return
+        seat = self.pick_seats(free_seats)[0]
+        response = await self.request("POST /tickets/", "POST", "/tickets/", json={
+            "showtime_play_id": play_id, "showtime_date_and_time": date_and_time, **seat,
+        })
+        self.recorder.booking_outcome(response)
+
+    async def scenario_hold_confirm(self):
+        play_id, date_and_time = await self.browse()
+        free_seats = await self.open_seat_map(play_id, date_and_time)
+        if len(free_seats) < 2:
+            return
+        seats = self.pick_seats(free_seats, 2)
+        response = await self.request("POST /holds/", "POST", "/holds/", json={
+            "showtime_play_id": play_id, "showtime_date_and_time": date_and_time, "seats": seats,
+        })
+        if response is not None and response.status_code == 201:
+            response = await self.request("POST /holds/{hold_id}/confirm", "POST", f"/holds/{response.json()['hold_id']}/confirm")
+        self.recorder.booking_outcome(response, len(seats))
+
+    async def run(self, scenario: str, deadline: float):
+        step = getattr(self, "scenario_" + scenario.replace("-", "_"))
+        while time.monotonic() < deadline:
+            await step()
+
+
+# --- Setup ---
+def promote_admin(database_path: Path):
+    connection = sqlite3.connect(database_path)
+    try:
+        connection.execute("UPDATE customers SET role = 'admin' WHERE email = ?", (ADMIN_EMAIL,))
+        connection.commit()
+    finally:
+        connection.close()
+
+
+async def seed(client: httpx.AsyncClient, database_path: Path, plays: int, showtimes: int, rows: int, seats_per_row: int):
+    """Create the admin account, plays, showtimes and seat layout; returns (play_id, date_and_time) pairs."""
+    await client.post("/users/register", json={"email": ADMIN_EMAIL, "name": "Load Test Admin", "password": PASSWORD})
+    promote_admin(database_path)
+    token = (await client.post("/token", data={"username": ADMIN_EMAIL, "password": PASSWORD})).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.post("/seats/bulk", headers=headers, json={
+        "row_ranges": [{"start_row": 1, "end_row": rows, "seats_per_row": seats_per_row}],
+    })
+    response.raise_for_status()
+
+    catalogue = []
+    first_show = datetime(2030, 1, 1, 19, 0)
+    for number in range(plays):
+        response = await client.post("/plays/", headers=headers, json={
+            "title": f"Load Test Play {number}", "duration": 120, "price": 25, "genre": "Drama",
+        })
+        response.raise_for_status()
+        play_id = response.json()["id"]
+        for day in range(showtimes):
+            date_and_time = (first_show + timedelta(days=day)).isoformat()
+            response = await client.post("/showtimes/", headers=headers, json={"play_id": play_id, "date_and_time": date_and_time})
+            response.raise_for_status()
+            catalogue.append((play_id, date_and_time))
+    return catalogue
+
+
+# --- Running ---
+async def run_load_test(args):
+    workdir = tempfile.TemporaryDirectory(prefix="load-test-")
+    database_path = Path(workdir.name) / "load_test.db"
+    database_url = f"sqlite:///{database_path}"
+    if args.target == "inprocess":
+        client_context = inprocess_client(database_url)
+    else:
+        client_context = server_client(args.target, database_url, args.workers)
+
+    try:
+        async with client_context as client:
+            catalogue = await seed(client, database_path, args.plays, args.showtimes, args.rows, args.seats_per_row)
+            recorder = Recorder()
+            rng = random.Random(args.seed)
+            users = [VirtualUser(number, client, recorder, catalogue, random.Random(rng.random())) for number in range(args.users)]
+
+            # Everyone logs in at once, like the opening minute of an on-sale
+            started = time.perf_counter()
+            await asyncio.gather(*(user.login() for user in users))
+            login_seconds = time.perf_counter() - started
+
+            metrics_before = await scrape_metrics(client)
+            started = time.perf_counter()
+            deadline = time.monotonic() + args.duration
+            await asyncio.gather(*(user.run(args.scenario, deadline) for user in users))
+            elapsed = time.perf_counter() - started
+            recorder.recording = False
+            metrics_after = await scrape_metrics(client)
+    finally:
+        workdir.cleanup()
+
+    login_samples = {name: recorder.samples.pop(name) for name in ("POST /users/register", "POST /token")}
+    all_samples = [sample for samples in recorder.samples.values() for sample in samples]
+    booking = dict(recorder.booking)
+    booking["conflict_rate"] = round(booking["conflicts"] / booking["attempts"], 4) if booking["attempts"] else 0.0
+    return {
+        "run": {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "duration_seconds": round(elapsed, 3),
+        "requests": len(all_samples),
+        "requests_per_second": round(len(all_samples) / elapsed, 2) if elapsed else 0.0,
+        "errors": sum(1 for _, status in all_samples if status == 0 or status >= 500),
+        "overall": latency_summary(all_samples),
+        "endpoints": {name: latency_summary(samples) for name, samples in sorted(recorder.samples.items())},
+        "login": {"seconds": round(login_seconds, 3), **{name: latency_summary(samples) for name, samples in login_samples.items()}},
+        "booking": booking,
+        # With several workers this is whichever process answered /metrics
+        "sqlite_locks": lock_summary(metrics_before, metrics_after) if metrics_after else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# --- Reporting ---
+def print_report(results: dict):
+    print(f"{results['requests']} requests in {results['duration_seconds']:.1f}s "
+          f"({results['requests_per_second']:.1f} req/s), {results['errors']} errors")
+    print(f"{'endpoint':<32} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, summary in [("all", results["overall"]), *results["endpoints"].items()]:
+        print(f"{name:<32} {summary['count']:>7} {summary['p50_ms']:>8.1f} {summary['p95_ms']:>8.1f} {summary['p99_ms']:>8.1f}")
+    booking = results["booking"]
+    if booking["attempts"]:
+        print(f"seats attempted {booking['attempts']}, booked {booking['booked']}, "
+              f"conflicts {booking['conflicts']} ({booking['conflict_rate']:.1%}), failed {booking['failed']}")
+    locks = results["sqlite_locks"]
+    if locks:
+        print(f"write statements {locks['write_statements']}, mean {locks['mean_write_ms']:.2f} ms, "
+              f"over 10 ms {locks['writes_over_10ms']}, lock errors {locks['lock_errors']}")
+
+
+def print_comparison(baseline: dict, results: dict):
+    print(f"compared with {baseline['run'].get('commit')} ({baseline['run'].get('started_at')}):")
+
+    def change(old, new):
+        return f"{(new - old) / old:+.1%}" if old else "n/a"
+
+    print(f"  req/s  {baseline['requests_per_second']:>9.1f} -> {results['requests_per_second']:>9.1f}  "
+          f"{change(baseline['requests_per_second'], results['requests_per_second'])}")
+    for name, summary in results["endpoints"].items():
+        old = baseline["endpoints"].get(name)
+        if old:
+            print(f"  {name:<32} p95 {old['p95_ms']:>8.1f} -> {summary['p95_ms']:>8.1f} ms  {change(old['p95_ms'], summary['p95_ms'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=SCENARIOS, default="book")
+    parser.add_argument("--target", choices=TARGETS, default="inprocess")
+    parser.add_argument("--workers", type=int, default=1, help="server worker processes (uvicorn/gunicorn targets)")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run the scenario for")
+    parser.add_argument("--plays", type=int, default=3)
+    parser.add_argument("--showtimes", type=int, default=2, help="showtimes per play")
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--seats-per-row", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="JSON results file (default: benchmarks/results/<commit>-<scenario>-<target>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load_test(args))
+    print_report(results)
+
+    output = args.output or RESULTS_DIR / f"{results['run']['commit'] or 'local'}-{args.scenario}-{args.target}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"results written to {output}")
+
+    if args.compare:
+        print_comparison(json.loads(args.compare.read_text()), results)
+
+
+if __name__ == "__main__":
+    main()
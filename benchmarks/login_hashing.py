@@ -0,0 +1,52 @@
+"""Measure bcrypt login throughput (verifications/sec) against the number of hashing workers.
+
+Usage:
+    python -m benchmarks.login_hashing --logins 200 --max-workers 8
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from backend.auth import security
+
+
+async def _run_logins(hashed_password: str, logins: int):
+    results = await asyncio.gather(
+        *(security.verify_password_async("benchmark-password", hashed_password) for _ in range(logins)),
+        return_exceptions=True
+    )
+    rejected = sum(isinstance(r, security.HashingOverloadedError) for r in results)
+    return logins - rejected, rejected
+
+
+def run(logins: int, max_workers: int):
+    hashed_password = security.get_password_hash("benchmark-password")
+    rows = []
+    for workers in range(1, max_workers + 1):
+        security.shutdown_hash_executor()
+        security.get_hash_executor(max_workers=workers)
+        # Let every request in, this measures raw throughput
+        security.MAX_PENDING_HASHES = logins
+
+        start = time.perf_counter()
+        completed, rejected = asyncio.run(_run_logins(hashed_password, logins))
+        elapsed = time.perf_counter() - start
+        rows.append((workers, completed, rejected, elapsed, completed / elapsed))
+    security.shutdown_hash_executor()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'logins':>7} {'rejected':>8} {'seconds':>8} {'logins/sec':>10}")
+    for workers, completed, rejected, elapsed, rate in run(args.logins, args.max_workers):
+        print(f"{workers:>7} {completed:>7} {rejected:>8} {elapsed:>8.2f} {rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Microbenchmark the CRUD, auth and serialisation hot paths against datasets of growing size.
+
+For each --tickets size a fresh SQLite database is filled with sold-out
+showtimes (plus a few empty ones for booking into), then each case is timed
+with timeit: calibrated to run for at least --min-time seconds per round,
+best/median/mean over --repeat rounds.
+
+Usage:
+    python -m benchmarks.microbench --tickets 1000 10000 100000
+    python -m benchmarks.microbench --tickets 1000000 --only showtimes
+"""
+import argparse
+import json
+import math
+import platform
+import statistics
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from backend import models
+from backend.auth import security
+from backend.auth.dependencies import get_current_user
+from backend.auth.principal_cache import principal_cache
+from backend.crud.analytics import rebuild_sales
+from backend.crud import showtimes as showtime_crud
+from backend.crud import tickets as ticket_crud
+from backend.database import create_db_engine
+from backend.migrate import upgrade_database
+from backend.routes.showtimes import get_available_seats
+from backend.schemas.showtimes import ShowTimeResponse
+from backend.schemas.tickets import TicketCreate
+from backend.seat_availability import seat_index
+
+from .load_test import RESULTS_DIR, git_commit
+
+INSERT_CHUNK_ROWS = 50_000
+EMPTY_SHOWTIMES = 2
+FIRST_SHOW = datetime(2030, 1, 1, 19, 0)
+# Never verified here, any well-formed bcrypt hash will do
+PLACEHOLDER_HASH = "$2b$12$" + "x" * 53
+
+
+# --- Dataset ---
+class Dataset:
+    def __init__(self, workdir: str, tickets: int, rows: int, seats_per_row: int):
+        self.tickets = tickets
+        self.seats = [(row_no, seat_no) for row_no in range(1, rows + 1) for seat_no in range(1, seats_per_row + 1)]
+        self.sold_showtimes = max(1, math.ceil(tickets / len(self.seats)))
+        self.showtimes = [(FIRST_SHOW + timedelta(hours=number)) for number in range(self.sold_showtimes + EMPTY_SHOWTIMES)]
+        self.plays = max(1, len(self.showtimes) // 10)
+        self.customers = max(1, tickets // 8)
+
+        self.engine = create_db_engine(f"sqlite:///{Path(workdir) / f'microbench-{tickets}.db'}")
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        upgrade_database(self.engine)
+        self._populate()
+
+    def play_id(self, showtime_number: int) -> int:
+        return showtime_number % self.plays + 1
+
+    def _insert(self, conn, table, rows):
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == INSERT_CHUNK_ROWS:
+                conn.execute(insert(table), chunk)
+                chunk = []
+        if chunk:
+            conn.execute(insert(table), chunk)
+
+    def _ticket_rows(self):
+        sold = 0
+        for number, date_and_time in enumerate(self.showtimes[:self.sold_showtimes]):
+            for row_no, seat_no in self.seats:
+                if sold == self.tickets:
+                    return
+                yield {
+                    "row_no": row_no, "seat_no": seat_no, "showtime_date_and_time": date_and_time,
+                    "showtime_play_id": self.play_id(number), "customer_id": sold % self.customers + 1,
+                    "ticket_no": f"{sold:010d}",
+                }
+                sold += 1
+
+    def _populate(self):
+        with self.engine.begin() as conn:
+            self._insert(conn, models.Seat.__table__, ({"row_no": r, "seat_no": s} for r, s in self.seats))
+            self._insert(conn, models.Play.__table__, (
+                {"id": number, "title": f"Play {number}", "duration": 120, "price": 25, "genre": "Drama"}
+                for number in range(1, self.plays + 1)
+            ))
+            self._insert(conn, models.ShowTime.__table__, (
+                {"play_id": self.play_id(number), "date_and_time": date_and_time}
+                for number, date_and_time in enumerate(self.showtimes)
+            ))
+            self._insert(conn, models.Customer.__table__, (
+                {"id": number, "name": f"Customer {number}", "email": f"customer{number}@example.com",
+                 "hashed_password": PLACEHOLDER_HASH, "role": "customer"}
+                for number in range(1, self.customers + 1)
+            ))
+            self._insert(conn, models.Ticket.__table__, self._ticket_rows())
+        # Showtime listings read the sold counts from the sales summary
+        with self.Session() as db:
+            rebuild_sales(db)
+
+    def free_seats(self):
+        """TicketCreate payloads for every seat of the empty showtimes."""
+        for number in range(self.sold_showtimes, len(self.showtimes)):
+            for row_no, seat_no in self.seats:
+                yield TicketCreate(showtime_play_id=self.play_id(number), showtime_date_and_time=self.showtimes[number],
+                                   row_no=row_no, seat_no=seat_no)
+
+    def close(self):
+        self.engine.dispose()
+
+
+# --- Cases ---
+def build_cases(dataset: Dataset, repeat: int):
+    """(name, callable, fixed number of calls per round or None to calibrate)."""
+    Session = dataset.Session
+    cases = []
+
+    # Every call books a new seat, so the number of calls is bounded by the free seats
+    free_seats = dataset.free_seats()
+    booking_calls = min(200, EMPTY_SHOWTIMES * len(dataset.seats) // (repeat + 1))
+
+    def create_ticket():
+        with Session() as db:
+            ticket_crud.create_ticket(db, next(free_seats), customer_id=1)
+    cases.append(("crud.tickets.create_ticket", create_ticket, booking_calls))
+
+    def showtimes_first_page():
+        with Session() as db:
+            showtime_crud.get_all_showtimes(db, limit=100)
+    cases.append(("crud.showtimes.get_all_showtimes (first page)", showtimes_first_page, None))
+
+    middle = dataset.showtimes[len(dataset.showtimes) // 2]
+    after = (middle, dataset.play_id(len(dataset.showtimes) // 2))
+
+    def showtimes_keyset_page():
+        with Session() as db:
+            showtime_crud.get_all_showtimes(db, limit=100, after=after)
+    cases.append(("crud.showtimes.get_all_showtimes (keyset page)", showtimes_keyset_page, None))
+
+    sold_out = (dataset.play_id(0), dataset.showtimes[0])
+
+    def seat_map_warm():
+        with Session() as db:
+            get_available_seats(sold_out[0], sold_out[1].isoformat(), db)
+    cases.append(("available-seats (index warm)", seat_map_warm, None))
+
+    def seat_map_cold():
+        seat_index.invalidate_showtime(*sold_out)
+        with Session() as db:
+            get_available_seats(sold_out[0], sold_out[1].isoformat(), db)
+    cases.append(("available-seats (index cold)", seat_map_cold, None))
+
+    claims = {"sub": "customer1@example.com", "role": "customer"}
+    cases.append(("auth.security.create_access_token", lambda: security.create_access_token(claims), None))
+
+    token = security.create_access_token(claims)
+
+    def current_user():
+        with Session() as db:
+            get_current_user(db, token)
+    cases.append(("auth.dependencies.get_current_user (cached principal)", current_user, None))
+
+    with Session() as db:
+        page = showtime_crud.get_all_showtimes(db, limit=100)
+    # Small datasets have fewer showtimes than a page; repeat them to keep the list size fixed
+    page = (page * math.ceil(100 / len(page)))[:100]
+    adapter = TypeAdapter(List[ShowTimeResponse])
+
+    def serialise_showtimes():
+        adapter.dump_json(adapter.validate_python(page, from_attributes=True))
+    cases.append(("ShowTimeResponse x100 (validate + dump_json)", serialise_showtimes, None))
+
+    return cases
+
+
+def measure(fn, number, repeat: int, min_time: float):
+    timer = timeit.Timer(fn)
+    if number is None:
+        number = 1
+        while timer.timeit(number) < min_time:
+            number *= 2
+    per_call = [elapsed / number for elapsed in timer.repeat(repeat, number)]
+    return {
+        "calls_per_round": number,
+        "rounds": repeat,
+        "min_us": round(min(per_call) * 1e6, 2),
+        "median_us": round(statistics.median(per_call) * 1e6, 2),
+        "mean_us": round(statistics.mean(per_call) * 1e6, 2),
+        "stdev_us": round(statistics.stdev(per_call) * 1e6, 2) if repeat > 1 else 0.0,
+        "ops_per_second": round(1 / statistics.median(per_call), 1),
+    }
+
+
+def run(args):
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="microbench-") as workdir:
+        for tickets in args.tickets:
+            # The in-process caches are keyed by showtime, not by database
+            seat_index.invalidate_layout()
+            principal_cache.clear()
+            dataset = Dataset(workdir, tickets, args.rows, args.seats_per_row)
+            try:
+                results[tickets] = {
+                    name: measure(fn, number, args.repeat, args.min_time)
+                    for name, fn, number in build_cases(dataset, args.repeat)
+                    if not args.only or args.only in name
+                }
+            finally:
+                dataset.close()
+    return results
+
+
+def print_report(results: dict):
+    sizes = list(results)
+    names = list(results[sizes[0]])
+    width = max(len(name) for name in names)
+    print(f"{'median µs per call':<{width}} " + " ".join(f"{f'{size:,} tickets':>16}" for size in sizes))
+    for name in names:
+        print(f"{name:<{width}} " + " ".join(f"{results[size][name]['median_us']:>16.1f}" for size in sizes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, nargs="+", default=[1000, 10_000], help="dataset sizes, in sold tickets")
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--seats-per-row", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=5, help="timed rounds per case")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per round")
+    parser.add_argument("--only", help="run only the cases whose name contains this text")
+    parser.add_argument("--output", type=Path, help="JSON results file (default: benchmarks/results/<commit>-microbench.json)")
+    args = parser.parse_args()
+
+    results = run(args)
+    print_report(results)
+
+    output = args.output or RESULTS_DIR / f"{git_commit() or 'local'}-microbench.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "run": {"started_at": datetime.now().isoformat(timespec="seconds"), "commit": git_commit(),
+                "python": platform.python_version(), "platform": platform.platform()},
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "results": {str(size): cases for size, cases in results.items()},
+    }, indent=2))
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
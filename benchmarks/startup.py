@@ -0,0 +1,149 @@
+"""Measure application import time and time-to-first-request, optionally failing above a budget.
+
+Each measurement runs in a fresh interpreter against a database in a
+temporary directory:
+
+    import            ``import backend.main`` (also checks it doesn't create the database file)
+    first request     import, run the lifespan startup, answer GET / and GET /plays/ in-process
+    uvicorn           spawn uvicorn and wait for its first response to GET /plays/
+
+Usage:
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --max-import-ms 1500 --max-first-request-ms 2500
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from .load_test import REPO_ROOT, _free_port
+
+IMPORT_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import backend.main
+print(json.dumps({"import_ms": (time.perf_counter() - started) * 1000}))
+"""
+
+FIRST_REQUEST_SCRIPT = """
+import asyncio, json, time
+started = time.perf_counter()
+from backend.main import app
+imported = time.perf_counter()
+
+async def main():
+    import httpx
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+            assert (await client.get("/")).status_code == 200
+            first = time.perf_counter()
+            assert (await client.get("/plays/")).status_code == 200
+            database = time.perf_counter()
+    print(json.dumps({
+        "import_ms": (imported - started) * 1000,
+        "startup_ms": (ready - imported) * 1000,
+        "first_request_ms": (first - started) * 1000,
+        "first_db_request_ms": (database - started) * 1000,
+    }))
+
+asyncio.run(main())
+"""
+
+
+def _run_script(script: str, env: dict) -> dict:
+    result = subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _uvicorn_first_response_ms(env: dict) -> float:
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT, env=env,
+    )
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/plays/").status_code == 200:
+                    return (time.perf_counter() - started) * 1000
+            except httpx.TransportError:
+                time.sleep(0.01)
+    finally:
+        process.terminate()
+        process.wait(10)
+
+
+def _summary(values):
+    return {"median": round(statistics.median(values), 1), "min": round(min(values), 1), "max": round(max(values), 1)}
+
+
+def run(runs: int, migrate_on_startup: bool, uvicorn: bool) -> dict:
+    with tempfile.TemporaryDirectory(prefix="startup-") as workdir:
+        database_path = Path(workdir) / "startup.db"
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{database_path}", "MIGRATE_ON_STARTUP": "0"}
+        env.pop("ASYNC_DATABASE_URL", None)
+
+        imports = [_run_script(IMPORT_SCRIPT, env)["import_ms"] for _ in range(runs)]
+        # Importing the app must not create (or open) the database
+        import_touches_disk = database_path.exists()
+
+        # Migrated ahead of time, the way a multi-worker deployment runs
+        subprocess.run([sys.executable, "-m", "backend.migrate"], cwd=REPO_ROOT, env=env, check=True)
+        env["MIGRATE_ON_STARTUP"] = "1" if migrate_on_startup else "0"
+        first_requests = [_run_script(FIRST_REQUEST_SCRIPT, env) for _ in range(runs)]
+
+        results = {
+            "runs": runs,
+            "migrate_on_startup": migrate_on_startup,
+            "import_touches_disk": import_touches_disk,
+            "import_ms": _summary(imports),
+            **{key: _summary([run[key] for run in first_requests]) for key in ("startup_ms", "first_request_ms", "first_db_request_ms")},
+        }
+        if uvicorn:
+            results["uvicorn_first_response_ms"] = _summary([_uvicorn_first_response_ms(env) for _ in range(runs)])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--migrate-on-startup", action="store_true", help="run the (no-op) migration check in the lifespan too")
+    parser.add_argument("--uvicorn", action="store_true", help="also time a real uvicorn process to its first response")
+    parser.add_argument("--max-import-ms", type=float, help="fail if the median import time is above this")
+    parser.add_argument("--max-first-request-ms", type=float, help="fail if the median time to the first DB-backed response is above this")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.runs, args.migrate_on_startup, args.uvicorn)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+    failures = []
+    if results["import_touches_disk"]:
+        failures.append("importing backend.main created the database file")
+    if args.max_import_ms is not None and results["import_ms"]["median"] > args.max_import_ms:
+        failures.append(f"import took {results['import_ms']['median']} ms (budget {args.max_import_ms} ms)")
+    if args.max_first_request_ms is not None and results["first_db_request_ms"]["median"] > args.max_first_request_ms:
+        failures.append(f"first request took {results['first_db_request_ms']['median']} ms (budget {args.max_first_request_ms} ms)")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
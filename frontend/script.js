@@ -530,41 +530,11 @@ async function fetchSeats() {
 async function createSeat(seatData) {
   const response = await makeRequest("POST", `${apiUrl}/seats/`, seatData);
   if (response) {
-    // Don't show success message for bulk operations
-    if (!window.isBulkOperation) {
     showSuccess("Seat created successfully!");
-    }
     fetchSeats();
   }
 }
 
-// Silent seat creation for bulk operations
-async function createSeatSilent(seatData) {
-  try {
-    const response = await fetch(`${apiUrl}/seats/`, {
-      method: 'POST',
-      headers: getHeaders(),
-      body: JSON.stringify(seatData)
-    });
-    
-    if (response.status === 401) {
-      showError("Your session has expired. Please log in again.");
-      window.location.href = "login.html";
-      return null;
-    }
-    
-    if (response.ok) {
-      return await response.json();
-    }
-    
-    // For seat creation, don't show errors - just return null
-    return null;
-  } catch (error) {
-    console.log(`Seat creation failed for ${seatData.row_no}-${seatData.seat_no}:`, error);
-    return null;
-  }
-}
-
 async function deleteSeat(rowNo, seatNo) {
   if (!confirm("Are you sure you want to delete this seat?")) return;
   
@@ -1345,17 +1315,11 @@ async function fetchShowtimes(playId) {
     container.innerHTML = '<div class="loading-seats"><i class="fas fa-spinner fa-spin"></i> Loading showtimes...</div>';
 
     try {
-        let showtimes = [];
-        
-        // Always fetch all showtimes and filter by playId if provided
-        const res = await fetch(`${apiUrl}/showtimes/`);
+        // Filtering by play happens on the server
+        const query = playId ? `?play_id=${encodeURIComponent(playId)}` : '';
+        const res = await fetch(`${apiUrl}/showtimes/${query}`);
         if (!res.ok) throw new Error('Failed to fetch showtimes');
-        let allShowtimes = await res.json();
-        
-        // Filter by playId if provided
-        showtimes = playId 
-            ? allShowtimes.filter(st => st.play_id == playId)
-            : allShowtimes;
+        const showtimes = await res.json();
 
         if (showtimes.length === 0) {
             container.innerHTML = '<div class="empty-state"><i class="fas fa-calendar-alt"></i><p>No showtimes available.</p></div>';
@@ -2040,34 +2004,18 @@ async function generateTheaterLayout(size) {
 }
 
 async function createBulkSeats(startRow, endRow, seatsPerRow) {
-    const seats = [];
-    for (let row = startRow; row <= endRow; row++) {
-        for (let seat = 1; seat <= seatsPerRow; seat++) {
-            seats.push({ row_no: row, seat_no: seat });
-        }
-    }
-    
-    // Set bulk operation flag to suppress individual success messages
-    window.isBulkOperation = true;
-    
-    // Show progress
-    const totalSeats = seats.length;
-    let created = 0;
-    let existing = 0;
-    
-    for (const seat of seats) {
-        const response = await createSeatSilent(seat);
-        if (response) {
-            created++;
-        } else {
-            // Seat already exists or failed to create
-            existing++;
-        }
-    }
-    
-    // Clear bulk operation flag
-    window.isBulkOperation = false;
-    
+    const layout = {
+        row_ranges: [{ start_row: startRow, end_row: endRow, seats_per_row: seatsPerRow }]
+    };
+    const totalSeats = (endRow - startRow + 1) * seatsPerRow;
+
+    // The whole layout is created in a single request and transaction
+    const response = await makeRequest("POST", `${apiUrl}/seats/bulk`, layout);
+    if (!response) return;
+
+    const created = response.created;
+    const existing = response.skipped;
+
     // Show summary message
     if (created === totalSeats) {
         showSuccess(`Successfully created ${created} seats!`);
@@ -2094,7 +2042,7 @@ async function handleBulkSeatFormSubmit(e) {
     
     const totalSeats = (endRow - startRow + 1) * seatsPerRow;
     if (totalSeats > 200) {
-        if (!confirm(`This will create ${totalSeats} seats. This might take a while. Continue?`)) {
+        if (!confirm(`This will create ${totalSeats} seats. Continue?`)) {
             return;
         }
     }
@@ -2225,6 +2173,52 @@ function showTicketModal(ticket) {
 let selectedSeat = null;
 let bookingPlayId = null;
 let bookingShowtime = null;
+let seatEventSource = null;
+
+function closeSeatEvents() {
+    if (seatEventSource) {
+        seatEventSource.close();
+        seatEventSource = null;
+    }
+}
+
+// Keep the open seat map current: the server pushes bookings and holds
+// for this showtime as they happen instead of the page polling for them
+function subscribeToSeatEvents(playId, showtimeDateTime) {
+    closeSeatEvents();
+    const source = new EventSource(`${apiUrl}/showtimes/${playId}/${encodeURIComponent(showtimeDateTime)}/seat-events`);
+    const seatState = {};
+
+    const updateSeat = (rowNo, seatNo, changes) => {
+        const key = `${rowNo}-${seatNo}`;
+        const state = seatState[key] = { ...(seatState[key] || { booked: false, held: false }), ...changes };
+        const btn = document.querySelector(`#seat-list-container .seat-btn[data-row="${rowNo}"][data-seat="${seatNo}"]`);
+        if (!btn) return;
+        const isUnavailable = state.booked || state.held;
+        btn.classList.toggle('booked', isUnavailable);
+        // Someone else just took the seat this user had selected
+        if (isUnavailable && btn.classList.contains('selected')) {
+            btn.classList.remove('selected');
+            selectedSeat = null;
+            document.getElementById('confirm-booking-btn').disabled = true;
+            document.getElementById('selected-seat-text').textContent = 'No seat selected';
+        }
+    };
+    const applyDelta = changes => event => {
+        JSON.parse(event.data).seats.forEach(([rowNo, seatNo]) => updateSeat(rowNo, seatNo, changes));
+    };
+
+    source.addEventListener('snapshot', event => {
+        JSON.parse(event.data).seats.forEach(seat => updateSeat(seat.row_no, seat.seat_no, { booked: seat.is_booked, held: seat.is_held }));
+    });
+    source.addEventListener('booked', applyDelta({ booked: true }));
+    source.addEventListener('released', applyDelta({ booked: false }));
+    source.addEventListener('held', applyDelta({ held: true }));
+    source.addEventListener('unheld', applyDelta({ held: false }));
+    // The seat layout or the showtime itself changed: start over
+    source.addEventListener('resync', () => bookTickets(playId, showtimeDateTime));
+    seatEventSource = source;
+}
 
 async function bookTickets(playId, showtimeDateTime) {
     bookingPlayId = playId;
@@ -2286,9 +2280,14 @@ async function bookTickets(playId, showtimeDateTime) {
             rowSeats.forEach(seat => {
                 const btn = document.createElement('button');
                 btn.className = 'seat-btn';
+                btn.dataset.row = seat.row_no;
+                btn.dataset.seat = seat.seat_no;
                 
+                // Seats held by someone else are just as unavailable as booked ones
+                const isUnavailable = seat.is_booked || seat.is_held;
+
                 // Add booked class if seat is booked
-                if (seat.is_booked) {
+                if (isUnavailable) {
                     btn.classList.add('booked');
                 }
                 
@@ -2296,24 +2295,25 @@ async function bookTickets(playId, showtimeDateTime) {
                     <span class="seat-number">${seat.seat_no}</span>
                 `;
                 
-                // Only add click handler if seat is not booked
-                if (!seat.is_booked) {
-                    btn.onclick = () => {
-                        selectedSeat = seat;
-                        // Update selected seat text
-                        selectedSeatText.textContent = `Row ${seat.row_no}, Seat ${seat.seat_no}`;
-                        // Highlight selected
-                        seatListContainer.querySelectorAll('.seat-btn').forEach(b => b.classList.remove('selected'));
-                        btn.classList.add('selected');
-                        confirmBtn.disabled = false;
-                    };
-                }
+                // Availability can change while the modal is open, so the
+                // handler checks the seat's current state on every click
+                btn.onclick = () => {
+                    if (btn.classList.contains('booked')) return;
+                    selectedSeat = seat;
+                    // Update selected seat text
+                    selectedSeatText.textContent = `Row ${seat.row_no}, Seat ${seat.seat_no}`;
+                    // Highlight selected
+                    seatListContainer.querySelectorAll('.seat-btn').forEach(b => b.classList.remove('selected'));
+                    btn.classList.add('selected');
+                    confirmBtn.disabled = false;
+                };
                 
                 rowDiv.appendChild(btn);
             });
             
             seatListContainer.appendChild(rowDiv);
         });
+        subscribeToSeatEvents(playId, showtimeDateTime);
     } catch (err) {
         seatListContainer.innerHTML = '<div class="error-seats"><i class="fas fa-exclamation-circle"></i><p>Error loading seats. Please try again.</p></div>';
     }
@@ -2325,6 +2325,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const seatModal = document.getElementById('seat-booking-modal');
     if (seatModal) {
         const closeModal = () => {
+            closeSeatEvents();
             seatModal.classList.remove('show');
             setTimeout(() => seatModal.style.display = 'none', 300);
         };
@@ -2365,6 +2366,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 }
                 const result = await res.json();
                 alert('Ticket booked successfully!');
+                closeSeatEvents();
                 seatModal.classList.remove('show');
                 setTimeout(() => seatModal.style.display = 'none', 300);
                 // Optionally refresh tickets or showtimes
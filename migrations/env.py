@@ -0,0 +1,63 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from backend.database import Base, DATABASE_URL, create_db_engine
+from backend import models  # noqa: F401  (registers the tables on Base.metadata)
+from backend.search_index import SEARCH_TABLE
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logging", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # The FTS5 search table and its shadow tables are managed by
+    # backend/search_index.py, not by the models
+    if type_ == "table" and name.startswith(SEARCH_TABLE):
+        return False
+    return True
+
+
+def _configure(**kwargs):
+    context.configure(
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # SQLite can't ALTER most things in place; batch mode copies the table
+        render_as_batch=True,
+        **kwargs,
+    )
+
+
+def run_migrations_offline() -> None:
+    _configure(url=config.get_main_option("sqlalchemy.url") or DATABASE_URL, literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    # backend.migrate passes its open connection in; the alembic CLI doesn't
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = create_db_engine(config.get_main_option("sqlalchemy.url") or DATABASE_URL)
+    try:
+        with engine.connect() as connection:
+            _configure(connection=connection)
+            with context.begin_transaction():
+                context.run_migrations()
+    finally:
+        engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
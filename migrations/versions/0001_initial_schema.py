@@ -0,0 +1,125 @@
+"""Initial schema, matching backend/models.py
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 17:23:09.756425
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('actors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=True),
+    sa.Column('gender', sa.CHAR(length=1), nullable=True),
+    sa.Column('date_of_birth', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('customers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=100), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('telephone_no', sa.String(length=100), nullable=True),
+    sa.Column('role', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_customers_email', 'customers', ['email'], unique=True)
+
+    op.create_table('directors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=True),
+    sa.Column('date_of_birth', sa.Integer(), nullable=True),
+    sa.Column('citizenship', sa.String(length=100), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('plays',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=100), nullable=True),
+    sa.Column('duration', sa.Integer(), nullable=True),
+    sa.Column('price', sa.DECIMAL(precision=10, scale=2), nullable=True),
+    sa.Column('genre', sa.String(length=20), nullable=True),
+    sa.Column('synopsis', sa.String(length=2000), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('seats',
+    sa.Column('row_no', sa.Integer(), nullable=False),
+    sa.Column('seat_no', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('row_no', 'seat_no')
+    )
+    op.create_table('actor_play',
+    sa.Column('actor_id', sa.Integer(), nullable=False),
+    sa.Column('play_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['actor_id'], ['actors.id'], ),
+    sa.ForeignKeyConstraint(['play_id'], ['plays.id'], ),
+    sa.PrimaryKeyConstraint('actor_id', 'play_id')
+    )
+    op.create_table('director_play',
+    sa.Column('director_id', sa.Integer(), nullable=False),
+    sa.Column('play_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['director_id'], ['directors.id'], ),
+    sa.ForeignKeyConstraint(['play_id'], ['plays.id'], ),
+    sa.PrimaryKeyConstraint('director_id', 'play_id')
+    )
+    op.create_table('showtimes',
+    sa.Column('date_and_time', sa.DateTime(), nullable=False),
+    sa.Column('play_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['play_id'], ['plays.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('date_and_time', 'play_id')
+    )
+    op.create_index('ix_showtimes_play_id_date_and_time', 'showtimes', ['play_id', 'date_and_time'], unique=False)
+
+    op.create_table('showtime_prices',
+    sa.Column('row_no', sa.Integer(), nullable=False),
+    sa.Column('seat_no', sa.Integer(), nullable=False),
+    sa.Column('showtime_date_and_time', sa.DateTime(), nullable=False),
+    sa.Column('showtime_play_id', sa.Integer(), nullable=False),
+    sa.Column('price', sa.DECIMAL(precision=10, scale=2), nullable=True),
+    sa.ForeignKeyConstraint(['row_no'], ['seats.row_no'], ),
+    sa.ForeignKeyConstraint(['seat_no'], ['seats.seat_no'], ),
+    sa.ForeignKeyConstraint(['showtime_date_and_time', 'showtime_play_id'], ['showtimes.date_and_time', 'showtimes.play_id'], ),
+    sa.PrimaryKeyConstraint('row_no', 'seat_no', 'showtime_date_and_time', 'showtime_play_id')
+    )
+    op.create_table('tickets',
+    sa.Column('row_no', sa.Integer(), nullable=False),
+    sa.Column('seat_no', sa.Integer(), nullable=False),
+    sa.Column('showtime_date_and_time', sa.DateTime(), nullable=False),
+    sa.Column('showtime_play_id', sa.Integer(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('ticket_no', sa.String(length=10), nullable=True),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.ForeignKeyConstraint(['row_no'], ['seats.row_no'], ),
+    sa.ForeignKeyConstraint(['seat_no'], ['seats.seat_no'], ),
+    sa.ForeignKeyConstraint(['showtime_date_and_time', 'showtime_play_id'], ['showtimes.date_and_time', 'showtimes.play_id'], ),
+    sa.PrimaryKeyConstraint('row_no', 'seat_no', 'showtime_date_and_time', 'showtime_play_id', 'customer_id')
+    )
+    op.create_index('ux_tickets_showtime_seat', 'tickets', ['showtime_play_id', 'showtime_date_and_time', 'row_no', 'seat_no'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ux_tickets_showtime_seat', table_name='tickets')
+
+    op.drop_table('tickets')
+    op.drop_table('showtime_prices')
+    op.drop_index('ix_showtimes_play_id_date_and_time', table_name='showtimes')
+
+    op.drop_table('showtimes')
+    op.drop_table('director_play')
+    op.drop_table('actor_play')
+    op.drop_table('seats')
+    op.drop_table('plays')
+    op.drop_table('directors')
+    op.drop_index('ix_customers_email', table_name='customers')
+
+    op.drop_table('customers')
+    op.drop_table('actors')
@@ -0,0 +1,57 @@
+"""Secondary indexes for the filters used in backend/crud/
+
+Query plans were taken with EXPLAIN QUERY PLAN on SQLite 3.40. The "before"
+column is revision 0001 and the "after" column is this revision.
+
+tickets by customer (crud.tickets.get_tickets_by_customer, ordered by showtime, row, seat)
+    before: SCAN tickets USING INDEX ux_tickets_showtime_seat
+    after:  SEARCH tickets USING INDEX ix_tickets_customer_id (customer_id=?)
+            (ordered by the index, so there is no sort step)
+
+tickets per showtime (booked counts, seat map, batch conflict check)
+    before: SEARCH tickets USING COVERING INDEX ux_tickets_showtime_seat
+            (showtime_play_id=? AND showtime_date_and_time=?)
+    after:  unchanged. The unique seat index from revision 0001 already leads
+            with (showtime_play_id, showtime_date_and_time), so there is no
+            separate index for it.
+
+prices per showtime (crud.showtime_prices.get_prices_for_showtime, copy_prices)
+    before: SCAN showtime_prices
+    after:  SEARCH showtime_prices USING INDEX ix_showtime_prices_showtime
+            (showtime_play_id=? AND showtime_date_and_time=?)
+
+Play.actors / Play.directors, and the cleanup of links in delete_play
+    before: SCAN actor_play / SCAN director_play
+    after:  SEARCH actor_play USING INDEX ix_actor_play_play_id (play_id=?)
+            SEARCH director_play USING INDEX ix_director_play_play_id (play_id=?)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 17:23:26.325644
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Databases created with create_all before migrations existed may already
+# have these indexes, so they are created with IF NOT EXISTS
+def upgrade() -> None:
+    op.create_index('ix_actor_play_play_id', 'actor_play', ['play_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_director_play_play_id', 'director_play', ['play_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_showtime_prices_showtime', 'showtime_prices', ['showtime_play_id', 'showtime_date_and_time'], unique=False, if_not_exists=True)
+    op.create_index('ix_tickets_customer_id', 'tickets', ['customer_id', 'showtime_play_id', 'showtime_date_and_time', 'row_no', 'seat_no'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tickets_customer_id', table_name='tickets')
+    op.drop_index('ix_showtime_prices_showtime', table_name='showtime_prices')
+    op.drop_index('ix_director_play_play_id', table_name='director_play')
+    op.drop_index('ix_actor_play_play_id', table_name='actor_play')
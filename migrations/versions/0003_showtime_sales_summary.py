@@ -0,0 +1,47 @@
+"""Per-showtime sales summary table, backfilled from existing tickets
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 17:27:44.882831
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('showtime_sales',
+    sa.Column('showtime_play_id', sa.Integer(), nullable=False),
+    sa.Column('showtime_date_and_time', sa.DateTime(), nullable=False),
+    sa.Column('tickets_sold', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['showtime_date_and_time', 'showtime_play_id'], ['showtimes.date_and_time', 'showtimes.play_id'], ),
+    sa.PrimaryKeyConstraint('showtime_play_id', 'showtime_date_and_time')
+    )
+    # Seats without a showtime-specific price sold at the play's base price
+    op.execute(
+        """
+        INSERT INTO showtime_sales (showtime_play_id, showtime_date_and_time, tickets_sold, revenue)
+        SELECT t.showtime_play_id, t.showtime_date_and_time, count(*), coalesce(sum(coalesce(sp.price, p.price)), 0)
+        FROM tickets t
+        JOIN plays p ON p.id = t.showtime_play_id
+        LEFT JOIN showtime_prices sp
+            ON sp.showtime_play_id = t.showtime_play_id
+            AND sp.showtime_date_and_time = t.showtime_date_and_time
+            AND sp.row_no = t.row_no
+            AND sp.seat_no = t.seat_no
+        GROUP BY t.showtime_play_id, t.showtime_date_and_time
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('showtime_sales')
@@ -0,0 +1,67 @@
+"""Create the indexes from revision 0001 on databases adopted at that revision
+
+Databases that predate migrations are stamped at 0001 without running it
+(see backend/migrate.py), so they never got the two indexes 0001 creates:
+the unique seat index on tickets and the per-play index on showtimes.
+Without the unique index nothing stops a seat from being sold twice.
+
+A database where some seat was already sold more than once can't get the
+unique index. The upgrade stops and lists those seats rather than choosing
+which customers lose their tickets: `python -m backend.duplicate_tickets`
+shows them, and with --keep-earliest removes the later sales, after which
+the upgrade can be run again.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 09:12:40.731052
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Seats listed in the error before it is cut short
+MAX_LISTED_SEATS = 20
+
+
+def _duplicate_seats():
+    return op.get_bind().exec_driver_sql(
+        """
+        SELECT showtime_play_id, showtime_date_and_time, row_no, seat_no,
+               group_concat(coalesce(ticket_no, '?') || ' (customer ' || customer_id || ')', ', ')
+        FROM tickets
+        GROUP BY showtime_play_id, showtime_date_and_time, row_no, seat_no
+        HAVING count(*) > 1
+        ORDER BY showtime_play_id, showtime_date_and_time, row_no, seat_no
+        """
+    ).all()
+
+
+def upgrade() -> None:
+    duplicates = _duplicate_seats()
+    if duplicates:
+        listed = "\n".join(
+            f"  play {play_id}, {date_and_time}, row {row_no} seat {seat_no}: tickets {tickets}"
+            for play_id, date_and_time, row_no, seat_no, tickets in duplicates[:MAX_LISTED_SEATS]
+        )
+        if len(duplicates) > MAX_LISTED_SEATS:
+            listed += f"\n  ... and {len(duplicates) - MAX_LISTED_SEATS} more"
+        raise RuntimeError(
+            f"Seats sold more than once ({len(duplicates)}), so tickets can't get its unique seat index:\n"
+            f"{listed}\n"
+            "List them with `python -m backend.duplicate_tickets`, resolve them (--keep-earliest keeps "
+            "each seat's first sale) and upgrade again."
+        )
+    op.create_index('ix_showtimes_play_id_date_and_time', 'showtimes', ['play_id', 'date_and_time'], unique=False, if_not_exists=True)
+    op.create_index('ux_tickets_showtime_seat', 'tickets', ['showtime_play_id', 'showtime_date_and_time', 'row_no', 'seat_no'], unique=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    # The indexes belong to revision 0001
+    pass
@@ -0,0 +1,38 @@
+from fastapi.testclient import TestClient
+
+from backend.auth.dependencies import get_current_admin_user
+from backend.main import app
+from backend.routes import metrics as metrics_routes
+
+
+def test_routes_are_mounted_at_import():
+    # Clients and tools that never run the lifespan still see the whole API
+    paths = app.openapi()["paths"]
+
+    assert "/plays/" in paths
+    assert "/tickets/batch" in paths
+
+
+def test_role_change_rejects_roles_the_app_does_not_have():
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+    try:
+        response = TestClient(app).put("/users/1/role", json={"role": "staff"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 422
+
+
+def test_metrics_are_off_without_a_token(monkeypatch):
+    monkeypatch.setattr(metrics_routes, "METRICS_TOKEN", None)
+
+    assert TestClient(app).get("/metrics").status_code == 404
+
+
+def test_metrics_need_the_configured_token(monkeypatch):
+    monkeypatch.setattr(metrics_routes, "METRICS_TOKEN", "scrape-token")
+    client = TestClient(app)
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-token"}).status_code == 200
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend import models
+from backend.crud import showtimes as showtime_crud
+from backend.crud import tickets as ticket_crud
+from backend.database import create_db_engine
+from backend.migrate import upgrade_database
+from backend.schemas.seats import SeatBase
+from backend.schemas.tickets import TicketBatchCreate, TicketCreate
+from backend.seat_availability import seat_index
+
+SHOWTIME = datetime(2030, 1, 1, 19, 0)
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'booking.db'}")
+    upgrade_database(engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with Session() as session:
+        session.add_all([models.Seat(row_no=1, seat_no=seat_no) for seat_no in range(1, 4)])
+        session.add(models.Play(id=1, title="Booking Test", duration=120, price=25, genre="Drama"))
+        session.add(models.ShowTime(play_id=1, date_and_time=SHOWTIME))
+        session.add_all([
+            models.Customer(id=number, name=f"Customer {number}", email=f"customer{number}@example.com",
+                            hashed_password="x", role="customer")
+            for number in (1, 2)
+        ])
+        session.commit()
+    # The seat index is process-wide and keyed by showtime, not by database
+    seat_index.clear()
+    with Session() as session:
+        yield session
+    engine.dispose()
+
+
+def ticket(seat_no):
+    return TicketCreate(showtime_play_id=1, showtime_date_and_time=SHOWTIME, row_no=1, seat_no=seat_no)
+
+
+def batch(*seat_nos):
+    return TicketBatchCreate(showtime_play_id=1, showtime_date_and_time=SHOWTIME,
+                             seats=[SeatBase(row_no=1, seat_no=seat_no) for seat_no in seat_nos])
+
+
+def tickets_sold(db):
+    return db.query(models.Ticket).count()
+
+
+def test_seat_cannot_be_booked_twice(db):
+    ticket_crud.create_ticket(db, ticket(1), customer_id=1)
+
+    with pytest.raises(ticket_crud.SeatsUnavailableError) as error:
+        ticket_crud.create_ticket(db, ticket(1), customer_id=2)
+
+    assert error.value.seats == [(1, 1)]
+    assert tickets_sold(db) == 1
+
+
+def test_overlapping_batch_is_rejected_whole(db):
+    ticket_crud.create_tickets(db, batch(1, 2), customer_id=1)
+
+    with pytest.raises(ticket_crud.SeatsUnavailableError) as error:
+        ticket_crud.create_tickets(db, batch(2, 3), customer_id=2)
+
+    assert error.value.seats == [(1, 2)]
+    # Seat 3 was free, but the batch is all or nothing
+    assert tickets_sold(db) == 2
+
+
+def test_single_booking_of_a_seat_taken_by_a_batch_is_rejected(db):
+    ticket_crud.create_tickets(db, batch(1, 2), customer_id=1)
+
+    with pytest.raises(ticket_crud.SeatsUnavailableError):
+        ticket_crud.create_ticket(db, ticket(2), customer_id=2)
+
+    assert tickets_sold(db) == 2
+
+
+def test_showtime_listing_counts_booked_seats(db):
+    ticket_crud.create_tickets(db, batch(1, 2), customer_id=1)
+    ticket_crud.delete_ticket(db, 1, 2, SHOWTIME, 1, customer_id=1)
+    ticket_crud.create_ticket(db, ticket(3), customer_id=2)
+
+    [showtime] = showtime_crud.get_all_showtimes(db)
+    assert showtime.available_seats == 1
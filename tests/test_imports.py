@@ -0,0 +1,46 @@
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from sqlalchemy.orm import sessionmaker
+
+from backend import models
+from backend.database import create_db_engine
+from backend.migrate import upgrade_database
+from backend.routes.imports import import_entity
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'imports.db'}")
+    upgrade_database(engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with Session() as session:
+        yield session
+    engine.dispose()
+
+
+def upload(content: bytes):
+    return UploadFile(file=io.BytesIO(content), filename="plays.csv")
+
+
+def plays_csv(titles):
+    return ("title,duration,price,genre\n" + "".join(f"{title},120,25,Drama\n" for title in titles)).encode()
+
+
+def test_import_reads_plays_in_chunks(db):
+    result = import_entity("plays", upload(plays_csv(["First", "Second", "Third"])), chunk_size=1, db=db)
+
+    assert result.inserted == 3
+    assert db.query(models.Play).count() == 3
+
+
+def test_bad_encoding_after_the_first_chunk_imports_nothing(db):
+    # Enough good rows that the decoder doesn't reach the bad byte at once
+    content = plays_csv([f"Play {number}" for number in range(1000)]) + "Café,120,25,Drama\n".encode("latin-1")
+
+    with pytest.raises(HTTPException) as error:
+        import_entity("plays", upload(content), chunk_size=10, db=db)
+
+    assert error.value.status_code == 400
+    assert db.query(models.Play).count() == 0
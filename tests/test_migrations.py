@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from backend.database import create_db_engine
+from backend.duplicate_tickets import remove_later_sales
+from backend.migrate import upgrade_database
+
+SHOWTIME = "2030-01-01 19:00:00.000000"
+
+
+@pytest.fixture
+def adopted(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'adopted.db'}")
+    # What a database created before migrations existed looks like: the
+    # initial tables, without the indexes added to them later
+    upgrade_database(engine, "0001")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ux_tickets_showtime_seat")
+        conn.exec_driver_sql("DROP INDEX ix_showtimes_play_id_date_and_time")
+        conn.exec_driver_sql("DROP TABLE alembic_version")
+        conn.exec_driver_sql("INSERT INTO plays (id, title, duration, price) VALUES (1, 'Adopted', 120, 25)")
+        conn.exec_driver_sql("INSERT INTO seats (row_no, seat_no) VALUES (1, 1)")
+        conn.exec_driver_sql(f"INSERT INTO showtimes (play_id, date_and_time) VALUES (1, '{SHOWTIME}')")
+        conn.exec_driver_sql(
+            "INSERT INTO customers (id, name, email, hashed_password, role) VALUES "
+            "(1, 'First', 'first@example.com', 'x', 'customer'), (2, 'Second', 'second@example.com', 'x', 'customer')"
+        )
+        conn.exec_driver_sql(f"INSERT INTO tickets VALUES (1, 1, '{SHOWTIME}', 1, 1, 'T1')")
+    yield engine
+    engine.dispose()
+
+
+def sell_seat_again(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"INSERT INTO tickets VALUES (1, 1, '{SHOWTIME}', 1, 2, 'T2')")
+
+
+def ticket_numbers(engine):
+    with engine.connect() as conn:
+        return [number for number, in conn.exec_driver_sql("SELECT ticket_no FROM tickets ORDER BY rowid")]
+
+
+def test_adopted_database_gets_the_seat_index(adopted):
+    upgrade_database(adopted)
+
+    inspector = inspect(adopted)
+    ticket_indexes = {index["name"]: index for index in inspector.get_indexes("tickets")}
+    assert ticket_indexes["ux_tickets_showtime_seat"]["unique"]
+    assert "ix_showtimes_play_id_date_and_time" in {index["name"] for index in inspector.get_indexes("showtimes")}
+
+
+def test_seat_sold_twice_stops_the_upgrade_and_keeps_both_tickets(adopted):
+    sell_seat_again(adopted)
+
+    with pytest.raises(RuntimeError) as error:
+        upgrade_database(adopted)
+
+    assert "play 1, 2030-01-01 19:00:00.000000, row 1 seat 1: tickets T1 (customer 1), T2 (customer 2)" in str(error.value)
+    assert ticket_numbers(adopted) == ["T1", "T2"]
+
+
+def test_upgrade_succeeds_once_the_later_sale_is_removed(adopted):
+    sell_seat_again(adopted)
+    with pytest.raises(RuntimeError):
+        upgrade_database(adopted)
+
+    with Session(adopted) as db:
+        assert remove_later_sales(db) == 1
+    upgrade_database(adopted)
+
+    assert ticket_numbers(adopted) == ["T1"]
@@ -0,0 +1,80 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend import models
+from backend.crud import analytics
+from backend.crud import plays as play_crud
+from backend.crud import showtime_prices as showtime_price_crud
+from backend.crud import tickets as ticket_crud
+from backend.database import create_db_engine
+from backend.migrate import upgrade_database
+from backend.schemas.plays import PlayUpdate
+from backend.schemas.reports import PlayReport, ShowTimeReport
+from backend.schemas.seats import SeatBase
+from backend.schemas.showtime_prices import ShowTimePriceCreate, ShowTimePriceUpdate
+from backend.schemas.tickets import TicketBatchCreate
+from backend.seat_availability import seat_index
+
+SHOWTIME = datetime(2030, 1, 1, 19, 0)
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'sales.db'}")
+    upgrade_database(engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with Session() as session:
+        session.add_all([models.Seat(row_no=1, seat_no=seat_no) for seat_no in range(1, 4)])
+        session.add(models.Play(id=1, title="Sales Test", duration=120, price=25, genre="Drama"))
+        session.add(models.ShowTime(play_id=1, date_and_time=SHOWTIME))
+        session.add(models.Customer(id=1, name="Customer", email="customer@example.com", hashed_password="x", role="customer"))
+        session.commit()
+    seat_index.clear()
+    with Session() as session:
+        ticket_crud.create_tickets(session, TicketBatchCreate(
+            showtime_play_id=1, showtime_date_and_time=SHOWTIME,
+            seats=[SeatBase(row_no=1, seat_no=seat_no) for seat_no in (1, 2)],
+        ), customer_id=1)
+        yield session
+    engine.dispose()
+
+
+def sales(db):
+    db.expire_all()
+    return [(row.tickets_sold, row.revenue) for row in db.query(models.ShowTimeSales).all()]
+
+
+def assert_matches_rebuild(db):
+    incremental = sales(db)
+    analytics.rebuild_sales(db)
+    assert incremental == sales(db)
+
+
+def test_showtime_price_changes_refresh_the_summary(db):
+    seat_price = ShowTimePriceCreate(row_no=1, seat_no=1, showtime_date_and_time=SHOWTIME, showtime_play_id=1, price=40)
+    showtime_price_crud.create_showtime_price(db, seat_price)
+    assert sales(db) == [(2, Decimal("65.00"))]
+    assert_matches_rebuild(db)
+
+    showtime_price_crud.update_showtime_price(db, 1, 1, SHOWTIME, 1, ShowTimePriceUpdate(price=10))
+    assert_matches_rebuild(db)
+
+    showtime_price_crud.delete_showtime_price(db, 1, 1, SHOWTIME, 1)
+    assert sales(db) == [(2, Decimal("50.00"))]
+
+
+def test_play_price_change_refreshes_the_summary(db):
+    play_crud.update_play(db, 1, PlayUpdate(price=30))
+
+    assert sales(db) == [(2, Decimal("60.00"))]
+    assert_matches_rebuild(db)
+
+
+def test_reports_allow_an_untitled_play(db):
+    play_crud.update_play(db, 1, PlayUpdate(title=None))
+
+    assert ShowTimeReport.model_validate(analytics.showtime_report(db)[0]).play_title is None
+    assert PlayReport.model_validate(analytics.play_report(db)[0]).play_title is None
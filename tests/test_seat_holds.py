@@ -0,0 +1,107 @@
+from datetime import datetime
+
+import pytest
+
+from backend import seat_holds as seat_holds_module
+from backend.seat_holds import SeatHoldManager
+
+SHOWTIME = datetime(2030, 1, 1, 19, 0)
+
+
+class Clock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def relayed(monkeypatch):
+    """Changes published by the managers under test, as the cache sync bus would carry them."""
+    events = []
+    monkeypatch.setattr(seat_holds_module.cache_sync, "publish", lambda topic, payload: events.append(payload))
+    return events
+
+
+def deliver(events, worker):
+    for change in events:
+        worker.apply_remote(change)
+    events.clear()
+
+
+def test_hold_made_on_one_worker_is_seen_and_released_on_another(relayed):
+    first, second = SeatHoldManager(), SeatHoldManager()
+    hold = first.create_hold(customer_id=1, play_id=1, date_and_time=SHOWTIME, seats=[(1, 1), (1, 2)])
+    deliver(relayed, second)
+
+    assert second.held_seats(1, SHOWTIME) == {(1, 1), (1, 2)}
+    assert second.conflicts(1, SHOWTIME, [(1, 1)], customer_id=2) == {(1, 1)}
+    assert second.get_hold(hold.hold_id).customer_id == 1
+
+    # Confirming or deleting the hold can land on any worker
+    second.release_hold(hold.hold_id)
+    deliver(relayed, first)
+
+    assert first.get_hold(hold.hold_id) is None
+    assert first.held_seats(1, SHOWTIME) == set()
+
+
+def test_relayed_hold_expires_on_the_receiving_worker(relayed):
+    clock, wall_clock = Clock(), Clock(1000.0)
+    first, second = SeatHoldManager(wall_clock=wall_clock), SeatHoldManager(clock=clock, wall_clock=wall_clock)
+    first.create_hold(customer_id=1, play_id=1, date_and_time=SHOWTIME, seats=[(1, 1)], ttl_seconds=60)
+    deliver(relayed, second)
+
+    clock.now += 61
+
+    assert second.held_seats(1, SHOWTIME) == set()
+
+
+def grant_overlapping_holds(relayed, first, second):
+    """Both workers hold seat (1, 1) for different customers before hearing of each other."""
+    from_first_hold = first.create_hold(customer_id=1, play_id=1, date_and_time=SHOWTIME, seats=[(1, 1)])
+    from_first = list(relayed)
+    relayed.clear()
+    from_second_hold = second.create_hold(customer_id=2, play_id=1, date_and_time=SHOWTIME, seats=[(1, 1), (1, 2)])
+    from_second = list(relayed)
+    relayed.clear()
+
+    deliver(from_second, first)
+    deliver(from_first, second)
+    return from_first_hold, from_second_hold
+
+
+def assert_only_hold_left(workers, kept, dropped):
+    for worker in workers:
+        assert worker.get_hold(kept.hold_id) is not None
+        assert worker.get_hold(dropped.hold_id) is None
+        assert worker.held_seats(1, SHOWTIME) == set(kept.seats)
+
+
+def test_overlapping_holds_from_two_workers_settle_on_the_older_one(relayed):
+    # The second worker's hold is the older one, although it was relayed last
+    first, second = SeatHoldManager(wall_clock=Clock(1000.5)), SeatHoldManager(wall_clock=Clock(1000.0))
+    newer, older = grant_overlapping_holds(relayed, first, second)
+
+    assert_only_hold_left((first, second), kept=older, dropped=newer)
+
+
+def test_overlapping_holds_created_at_the_same_time_settle_on_the_lower_id(relayed):
+    first, second = SeatHoldManager(wall_clock=Clock(1000.0)), SeatHoldManager(wall_clock=Clock(1000.0))
+    holds = grant_overlapping_holds(relayed, first, second)
+
+    kept, dropped = sorted(holds, key=lambda hold: hold.hold_id)
+    assert_only_hold_left((first, second), kept=kept, dropped=dropped)
+
+
+def test_dropping_remote_holds_keeps_local_ones(relayed):
+    first, second = SeatHoldManager(), SeatHoldManager()
+    remote = first.create_hold(customer_id=1, play_id=1, date_and_time=SHOWTIME, seats=[(1, 1)])
+    deliver(relayed, second)
+    local = second.create_hold(customer_id=2, play_id=1, date_and_time=SHOWTIME, seats=[(1, 2)])
+
+    second.drop_remote()
+
+    assert second.get_hold(remote.hold_id) is None
+    assert second.get_hold(local.hold_id) is not None
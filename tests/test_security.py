@@ -0,0 +1,15 @@
+import asyncio
+
+from backend.auth import security
+
+
+def test_password_hashing_round_trips_through_the_process_pool():
+    async def hash_and_verify():
+        hashed = await security.get_password_hash_async("correct horse")
+        return (await security.verify_password_async("correct horse", hashed),
+                await security.verify_password_async("wrong horse", hashed))
+
+    try:
+        assert asyncio.run(hash_and_verify()) == (True, False)
+    finally:
+        security.shutdown_hash_executor()
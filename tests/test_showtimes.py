@@ -0,0 +1,46 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from backend import models
+from backend.crud import showtimes as showtime_crud
+from backend.database import create_db_engine
+from backend.main import app
+from backend.migrate import upgrade_database
+from backend.routes import showtimes as showtime_routes
+
+SHOWTIME = datetime(2030, 1, 1, 19, 0)
+MOVED = datetime(2030, 1, 2, 19, 0)
+
+
+@pytest.fixture
+def Session(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'showtimes.db'}")
+    upgrade_database(engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with Session() as session:
+        session.add(models.Play(id=1, title="Showtime Test", duration=120, price=25, genre="Drama"))
+        session.add(models.ShowTime(play_id=1, date_and_time=SHOWTIME))
+        session.commit()
+    yield Session
+    engine.dispose()
+
+
+def test_moving_a_showtime_resyncs_both_seat_maps(Session, monkeypatch):
+    resynced = []
+    monkeypatch.setattr(showtime_crud.seat_events, "resync", lambda *showtime: resynced.append(showtime))
+
+    with Session() as db:
+        showtime_crud.update_showtime(db, 1, SHOWTIME, {"date_and_time": MOVED})
+
+    assert resynced == [(1, SHOWTIME), (1, MOVED)]
+
+
+def test_seat_events_for_a_missing_showtime_is_404(Session, monkeypatch):
+    monkeypatch.setattr(showtime_routes, "ReadSessionLocal", Session)
+
+    response = TestClient(app).get(f"/showtimes/1/{MOVED.isoformat()}/seat-events")
+
+    assert response.status_code == 404